@@ -10,18 +10,40 @@ from datamatrix_decoder.core.exceptions import (
     DecodeError,
     UnsupportedFormatError,
     ConfigurationError,
+    GS1Error,
 )
-from datamatrix_decoder.core.models import DecodeResult
+from datamatrix_decoder.core.batch import DEFAULT_TIERS
+from datamatrix_decoder.core.config import ConfigWatcher, Profile, load_config
+from datamatrix_decoder.core.gs1 import parse_gs1, parse_gs1_batch
+from datamatrix_decoder.core.layout import Layout, Zone, load_layout
+from datamatrix_decoder.core.models import BatchStats, DecodeResult, DecodeTier, ImageCost
+from datamatrix_decoder.core.results import ResultSet
+from datamatrix_decoder.core.session import DecoderSession
 
 __all__ = [
     "DataMatrixDecoder",
     "BarcodeDecoder",
+    "DecoderSession",
     "DecodeResult",
+    "ResultSet",
+    "DecodeTier",
+    "BatchStats",
+    "ImageCost",
+    "DEFAULT_TIERS",
+    "Profile",
+    "ConfigWatcher",
+    "load_config",
+    "Layout",
+    "Zone",
+    "load_layout",
     "DecoderError",
     "ImageLoadError",
     "DecodeError",
     "UnsupportedFormatError",
     "ConfigurationError",
+    "GS1Error",
+    "parse_gs1",
+    "parse_gs1_batch",
 ]
 
 # Clean, simple imports following KISS principle
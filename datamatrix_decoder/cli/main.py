@@ -1,40 +1,131 @@
 """Command-line interface for DataMatrix Decoder."""
 
-import sys
 import json
+import os
+import sys
 from pathlib import Path
 
 import click
 from rich.console import Console
 from rich.table import Table
 
-from datamatrix_decoder import DataMatrixDecoder, BarcodeDecoder
+from datamatrix_decoder import DataMatrixDecoder, BarcodeDecoder, BatchStats, DEFAULT_TIERS, ResultSet, load_layout
+from datamatrix_decoder.core.archives import decode_archive, is_archive
+from datamatrix_decoder.core.autotune import AUTO
+from datamatrix_decoder.core.config import CONFIG_ENV, DEFAULT_CONFIG, ConfigWatcher, ReloadingDecoder, load_config
+from datamatrix_decoder.core.exceptions import ConfigurationError
+from datamatrix_decoder.core.jobqueue import JobQueue, run_worker
+from datamatrix_decoder.core.preprocessing import DRAFT_SCALES
+from datamatrix_decoder.core.scheduling import SCHEDULES
+from datamatrix_decoder.core.sharding import merge_stats, parse_shard, read_jsonl, select_shard
+from datamatrix_decoder.core.watch import watch_folder
 
 console = Console()
 
 
 @click.group()
 @click.version_option(version="1.0.0")
-def cli():
+@click.option("--config", "config_path", type=click.Path(exists=True), default=None, help="Configuration file")
+@click.option("--profile", default=None, help="Named performance profile from the configuration")
+@click.pass_context
+def cli(ctx, config_path: str, profile: str):
     """DataMatrix Decoder - Professional barcode decoding tool."""
-    pass
+    ctx.obj = {"config_path": config_path, "profile": profile}
+
+
+DRAFT_CHOICES = click.Choice([str(scale) for scale in DRAFT_SCALES])
+
+
+def _workers(ctx, param, value):
+    """Parse --workers: a positive integer or "auto"."""
+    if value is None or value == AUTO:
+        return value
+    try:
+        workers = int(value)
+    except ValueError:
+        workers = 0
+    if workers < 1:
+        raise click.BadParameter(f"expected a positive integer or {AUTO!r}")
+    return workers
+
+
+def _shard(ctx, param, value):
+    """Parse --shard I/N into ``(I, N)``."""
+    if value is None:
+        return None
+    try:
+        return parse_shard(value)
+    except ConfigurationError as e:
+        raise click.BadParameter(str(e))
+
+
+def _profile(ctx):
+    """Resolve the profile selected on the command line."""
+    options = ctx.find_root().obj or {}
+    return load_config(options.get("config_path")).profile(options.get("profile"))
+
+
+def _decoder_source(ctx, build):
+    """Decoder for long-running commands, rebuilt whenever the configuration file changes."""
+    options = ctx.find_root().obj or {}
+    path = options.get("config_path") or os.environ.get(CONFIG_ENV)
+    if path is None and Path(DEFAULT_CONFIG).exists():
+        path = DEFAULT_CONFIG
+    if path is None:
+        return build(_profile(ctx))
+    return ReloadingDecoder(ConfigWatcher(path), build, options.get("profile"))
 
 
 @cli.command()
 @click.argument("image_path", type=click.Path(exists=True))
 @click.option("--format", "-f", default="datamatrix", help="Barcode format")
-def decode(image_path: str, format: str):
+@click.option("--tile-size", type=int, default=None, help="Decode large images in overlapping tiles")
+@click.option("--draft-scale", type=DRAFT_CHOICES, default=None, help="Try JPEGs at reduced resolution first")
+@click.option("--layout", "layout_path", type=click.Path(exists=True, dir_okay=False), default=None,
+              help="Search only the zones of this layout template")
+@click.pass_context
+def decode(ctx, image_path: str, format: str, tile_size: int, draft_scale: str, layout_path: str):
     """Decode a single image."""
     try:
+        profile = _profile(ctx)
+        draft = float(draft_scale) if draft_scale else None
+        if layout_path:
+            layout = load_layout(layout_path)
+            # None when some zone takes any format
+            zone_formats = (
+                {fmt for zone in layout.zones for fmt in zone.formats}
+                if all(zone.formats for zone in layout.zones)
+                else None
+            )
+            # BarcodeDecoder sends Data Matrix zones to libdmtx and the rest to zbar
+            decoder = (
+                DataMatrixDecoder(profile=profile)
+                if zone_formats == {"datamatrix"}
+                else BarcodeDecoder(formats=sorted(zone_formats) if zone_formats else None, profile=profile)
+            )
+            for zone, results in decoder.decode_layout(image_path, layout).items():
+                for result in results:
+                    console.print(f"[green]✓[/green] {zone}: {result.format.upper()} {result.data}")
+                if not results:
+                    console.print(f"[red]✗[/red] {zone}: no barcode found")
+            return
         if format == "datamatrix":
-            decoder = DataMatrixDecoder()
+            decoder = DataMatrixDecoder(profile=profile, draft_scale=draft)
+        else:
+            decoder = BarcodeDecoder(formats=[format], profile=profile, draft_scale=draft)
+        if tile_size:
+            results = decoder.decode_tiled(image_path, tile_size=tile_size, max_symbol_size=tile_size // 4)
+            for result in results:
+                console.print(f"[green]✓[/green] {result.format.upper()}: {result.data} at {result.rect}")
+            if not results:
+                console.print("[red]✗[/red] No barcode found")
+        elif format == "datamatrix":
             result = decoder.decode_image(image_path)
             if result:
                 console.print(f"[green]✓[/green] Decoded: {result.data}")
             else:
                 console.print("[red]✗[/red] No Data Matrix found")
         else:
-            decoder = BarcodeDecoder(formats=[format])
             results = decoder.decode_image(image_path)
             if results:
                 for result in results:
@@ -48,19 +139,71 @@ def decode(image_path: str, format: str):
 
 @cli.command()
 @click.argument("directory", type=click.Path(exists=True))
-@click.option("--output", "-o", help="Output JSON file")
-@click.option("--workers", "-w", default=4, help="Parallel workers")
-def batch(directory: str, output: str, workers: int):
-    """Batch process images in a directory."""
+@click.option("--output", "-o", help="Output file (.json, .jsonl or .csv)")
+@click.option("--workers", "-w", callback=_workers, default=None, help="Parallel workers or 'auto' (default: from profile)")
+@click.option("--tiered", is_flag=True, help="Fast first pass, thorough retry of misses")
+@click.option("--schedule", type=click.Choice(SCHEDULES), default=None, help="Order work by estimated cost")
+@click.option("--pixel-budget-mb", type=int, default=None, help="Cap on decoded pixel memory in flight")
+@click.option("--hard-timeout", type=float, default=None, help="Kill any decode running longer than this (seconds)")
+@click.option("--draft-scale", type=DRAFT_CHOICES, default=None, help="Try JPEGs at reduced resolution first")
+@click.option("--prefetch", type=click.IntRange(min=1), default=None, help="I/O threads reading files ahead of decoding")
+@click.option("--shard", callback=_shard, default=None, help="Decode only shard I of N (e.g. 2/8), split by path hash")
+@click.option("--stats-output", type=click.Path(dir_okay=False), default=None, help="Write the run's stats as JSON")
+@click.pass_context
+def batch(
+    ctx,
+    directory: str,
+    output: str,
+    workers: int,
+    tiered: bool,
+    schedule: str,
+    pixel_budget_mb: int,
+    hard_timeout: float,
+    draft_scale: str,
+    prefetch: int,
+    shard: tuple,
+    stats_output: str,
+):
+    """Batch process images in a directory or a zip/tar archive."""
     try:
-        image_paths = list(Path(directory).glob("*.png")) + list(Path(directory).glob("*.jpg"))
-        
-        if not image_paths:
-            console.print(f"[yellow]No images found in {directory}[/yellow]")
-            return
+        profile = _profile(ctx)
+        decoder = BarcodeDecoder(profile=profile, draft_scale=float(draft_scale) if draft_scale else None)
+        stats = BatchStats()
         
-        decoder = BarcodeDecoder()
-        results = decoder.decode_batch(image_paths, max_workers=workers)
+        if is_archive(directory):
+            if schedule or pixel_budget_mb or hard_timeout or prefetch or shard:
+                raise click.UsageError(
+                    "--schedule, --pixel-budget-mb, --hard-timeout, --prefetch and --shard need a directory"
+                )
+            results = decode_archive(
+                decoder,
+                directory,
+                max_workers=workers or profile.max_workers,
+                tiers=DEFAULT_TIERS if tiered else profile.decode_tiers(),
+                stats=stats,
+            )
+            if not stats.total:
+                console.print(f"[yellow]No images found in {directory}[/yellow]")
+                return
+        else:
+            image_paths = list(Path(directory).glob("*.png")) + list(Path(directory).glob("*.jpg"))
+            if shard:
+                image_paths = select_shard(image_paths, *shard, root=directory)
+            
+            if not image_paths:
+                console.print(f"[yellow]No images found in {directory}[/yellow]")
+                return
+            
+            results = decoder.decode_batch(
+                image_paths,
+                max_workers=workers,
+                tiers=DEFAULT_TIERS if tiered else None,
+                stats=stats,
+                schedule=schedule,
+                pixel_budget=pixel_budget_mb * 1024 * 1024 if pixel_budget_mb else None,
+                hard_timeout=hard_timeout,
+                prefetch=prefetch,
+            )
         
         table = Table(title="Decode Results")
         table.add_column("File", style="cyan")
@@ -72,15 +215,215 @@ def batch(directory: str, output: str, workers: int):
         
         console.print(table)
         
+        if tiered or len(stats.tier_attempts) > 1:
+            for name, attempts in stats.tier_attempts.items():
+                successes = stats.tier_successes.get(name, 0)
+                console.print(f"Tier {name}: {successes}/{attempts} decoded")
+        
+        if schedule:
+            for cost in sorted(stats.costs, key=lambda c: c.actual, reverse=True)[:10]:
+                console.print(f"{Path(cost.filename).name}: estimated {cost.estimated:.2f} MS, actual {cost.actual:.3f}s")
+        
+        if stats.workers is not None:
+            console.print(f"Auto concurrency: {stats.workers} workers")
+        
+        if prefetch:
+            console.print(f"Decode workers waited {stats.io_wait:.2f}s on reads")
+        
+        if pixel_budget_mb:
+            console.print(f"Peak pixel memory: {stats.peak_pixel_bytes / 2**20:.1f} MB")
+        
+        for filename in stats.timed_out:
+            console.print(f"[yellow]⏱[/yellow] Timed out: {filename}")
+        for filename in stats.quarantined:
+            console.print(f"[yellow]⏱[/yellow] Quarantined (skipped): {filename}")
+        
         if output:
-            with open(output, "w") as f:
-                json.dump([r.to_dict() for r in results], f, indent=2)
+            write_results(ResultSet(results), output)
             console.print(f"\n[green]✓[/green] Saved to {output}")
+        
+        if stats_output:
+            report = stats.to_dict()
+            if shard:
+                report["shard"] = "{}/{}".format(*shard)
+            with open(stats_output, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+    except Exception as e:
+        console.print(f"[red]Error:[/red] {e}")
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument("inputs", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option("--output", "-o", required=True, help="Merged output file (.json, .jsonl or .csv)")
+@click.option("--stats", "stats_paths", multiple=True, type=click.Path(exists=True, dir_okay=False),
+              help="Per-shard stats file from batch --stats-output (repeatable)")
+@click.option("--stats-output", type=click.Path(dir_okay=False), default=None, help="Write the merged stats as JSON")
+def merge(inputs: tuple, output: str, stats_paths: tuple, stats_output: str):
+    """Combine per-shard JSONL results (and stats) into one result file and run report."""
+    try:
+        results = ResultSet()
+        for path in inputs:
+            with open(path, encoding="utf-8") as f:
+                results.extend(read_jsonl(f))
+        write_results(results, output)
+        console.print(f"[green]✓[/green] Merged {len(results)} results from {len(inputs)} files into {output}")
+        
+        if stats_paths:
+            reports = []
+            for path in stats_paths:
+                with open(path, encoding="utf-8") as f:
+                    reports.append(json.load(f))
+            merged = merge_stats(reports)
+            console.print(
+                f"{merged['shards']} shards: {merged['decoded']}/{merged['total']} decoded, "
+                f"{merged['failed']} failed, slowest shard {merged['elapsed']:.1f}s"
+            )
+            if merged.get("missing"):
+                console.print(f"[yellow]Missing shards: {', '.join(map(str, merged['missing']))}[/yellow]")
+            if stats_output:
+                with open(stats_output, "w", encoding="utf-8") as f:
+                    json.dump(merged, f, indent=2)
     except Exception as e:
         console.print(f"[red]Error:[/red] {e}")
         sys.exit(1)
 
 
+@cli.command()
+@click.argument("directory", type=click.Path(exists=True, file_okay=False))
+@click.option("--output", "-o", type=click.Path(dir_okay=False), help="Append results to this JSONL file")
+@click.option("--move-to", type=click.Path(file_okay=False), default=None, help="Move processed files here")
+@click.option("--workers", "-w", callback=_workers, default=None, help="Parallel workers or 'auto' (default: from profile)")
+@click.option("--settle", type=float, default=0.1, help="Seconds a file must stay unchanged before decoding")
+@click.option("--poll-interval", type=float, default=0.5, help="Directory poll interval without inotify")
+@click.option("--skip-existing", is_flag=True, help="Ignore files already in the folder")
+@click.pass_context
+def watch(
+    ctx,
+    directory: str,
+    output: str,
+    move_to: str,
+    workers: int,
+    settle: float,
+    poll_interval: float,
+    skip_existing: bool,
+):
+    """Decode images as they are dropped into a folder."""
+    profile = _profile(ctx)
+    decoder = _decoder_source(ctx, lambda profile: BarcodeDecoder(profile=profile))
+    out = open(output, "a", encoding="utf-8") if output else None
+    
+    def sink(path, results):
+        for result in results:
+            console.print(f"[green]✓[/green] {path.name}: {result.format.upper()} {result.data}")
+        if not results:
+            console.print(f"[red]✗[/red] {path.name}: no barcode found")
+        if out is not None:
+            ResultSet(results).to_jsonl(out)
+            out.flush()
+    
+    console.print(f"Watching {directory} (Ctrl+C to stop)")
+    try:
+        watch_folder(
+            decoder,
+            directory,
+            sink,
+            move_to=move_to,
+            max_workers=workers or profile.max_workers,
+            settle=settle,
+            poll_interval=poll_interval,
+            existing=not skip_existing,
+        )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if out is not None:
+            out.close()
+
+
+@cli.command()
+@click.argument("queue_path", type=click.Path(dir_okay=False))
+@click.argument("paths", nargs=-1, type=click.Path(exists=True))
+@click.option("--no-wal", is_flag=True, help="Rollback journal, for workers on several hosts sharing the file")
+def enqueue(queue_path: str, paths: tuple, no_wal: bool):
+    """Add images (or the images in directories) to a job queue file."""
+    try:
+        images = []
+        for path in map(Path, paths):
+            if path.is_dir():
+                images.extend(sorted(p for p in path.iterdir() if p.suffix.lower() in (".png", ".jpg")))
+            else:
+                images.append(path)
+        with JobQueue(queue_path, wal=not no_wal) as queue:
+            added = queue.enqueue(p.resolve() for p in images)
+            counts = queue.counts()
+        console.print(f"[green]✓[/green] Queued {added} new images ({len(images) - added} already known)")
+        console.print(", ".join(f"{state}: {count}" for state, count in counts.items()))
+    except Exception as e:
+        console.print(f"[red]Error:[/red] {e}")
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument("queue_path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--workers", "-w", callback=_workers, default=None, help="Parallel workers or 'auto' (default: from profile)")
+@click.option("--batch-size", type=click.IntRange(min=1), default=None, help="Jobs claimed and recorded per transaction")
+@click.option("--lease", type=float, default=300.0, help="Seconds before a crashed worker's jobs are re-queued")
+@click.option("--max-attempts", type=click.IntRange(min=1), default=3, help="Tries per image before it is marked failed")
+@click.option("--exit-when-empty", is_flag=True, help="Stop once the queue is drained instead of waiting for more")
+@click.option("--no-wal", is_flag=True, help="Rollback journal, for workers on several hosts sharing the file")
+@click.option("--output", "-o", default=None, help="After stopping, export all queue results (.json, .jsonl or .csv)")
+@click.pass_context
+def worker(
+    ctx,
+    queue_path: str,
+    workers: int,
+    batch_size: int,
+    lease: float,
+    max_attempts: int,
+    exit_when_empty: bool,
+    no_wal: bool,
+    output: str,
+):
+    """Decode images from a job queue file alongside any number of other workers."""
+    try:
+        profile = _profile(ctx)
+        decoder = _decoder_source(ctx, lambda profile: BarcodeDecoder(profile=profile))
+        with JobQueue(queue_path, lease=lease, max_attempts=max_attempts, wal=not no_wal) as queue:
+            try:
+                stats = run_worker(
+                    decoder,
+                    queue,
+                    max_workers=workers or profile.max_workers,
+                    batch_size=batch_size,
+                    exit_when_empty=exit_when_empty,
+                )
+                console.print(f"Processed {stats.total} images: {stats.decoded} decoded, {stats.failed} without result")
+            except KeyboardInterrupt:
+                # Unrecorded jobs of the interrupted batch are re-queued when their leases expire
+                pass
+            for path, error in queue.failures():
+                console.print(f"[yellow]✗[/yellow] Failed: {path}: {error}")
+            if output:
+                write_results(ResultSet(queue.results()), output)
+                console.print(f"\n[green]✓[/green] Saved to {output}")
+    except Exception as e:
+        console.print(f"[red]Error:[/red] {e}")
+        sys.exit(1)
+
+
+def write_results(results: ResultSet, output: str):
+    """Write results in the format implied by the output file extension."""
+    suffix = Path(output).suffix.lower()
+    with open(output, "w", newline="" if suffix == ".csv" else None) as f:
+        if suffix == ".csv":
+            results.to_csv(f)
+        elif suffix == ".jsonl":
+            results.to_jsonl(f)
+        else:
+            results.to_json(f)
+
+
 def main():
     """Entry point for CLI."""
     cli()
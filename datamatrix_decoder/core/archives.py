@@ -0,0 +1,143 @@
+"""Decode images straight out of zip and tar archives, without extracting them."""
+
+import io
+import logging
+import tarfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+from PIL import Image
+
+from datamatrix_decoder.core.autotune import fixed_workers
+from datamatrix_decoder.core.batch import DEFAULT_MAX_WORKERS, DEFAULT_TIER_NAME, run_batch
+from datamatrix_decoder.core.exceptions import ImageLoadError
+from datamatrix_decoder.core.models import BatchStats, DecodeResult, DecodeTier
+from datamatrix_decoder.core.watch import IMAGE_SUFFIXES
+
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+
+def is_archive(path: PathLike) -> bool:
+    """True if ``path`` names a zip or tar archive by its extension."""
+    return str(path).lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _is_image(name: str) -> bool:
+    return name.lower().endswith(IMAGE_SUFFIXES)
+
+
+def _decode_bytes(decoder, data: bytes, name: str, tier: Optional[DecodeTier]) -> List[DecodeResult]:
+    with Image.open(io.BytesIO(data)) as image:
+        found = decoder.decode_frame(image, filename=name, tier=tier)
+    return found if isinstance(found, list) else [found] if found else []
+
+
+def iter_members(path: PathLike) -> Iterator[Tuple[str, bytes]]:
+    """Yield ``(member name, bytes)`` for every image in the archive, in order.
+
+    Tar archives, compressed or not, are read as a single forward stream.
+    """
+    if str(path).lower().endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and _is_image(info.filename):
+                    yield info.filename, archive.read(info)
+        return
+    with tarfile.open(path, mode="r|*") as archive:
+        for member in archive:
+            if member.isfile() and _is_image(member.name):
+                yield member.name, archive.extractfile(member).read()
+
+
+def decode_archive(
+    decoder,
+    path: PathLike,
+    max_workers: Union[int, str] = DEFAULT_MAX_WORKERS,
+    tiers: Optional[Sequence[DecodeTier]] = None,
+    stats: Optional[BatchStats] = None,
+    window: Optional[int] = None,
+) -> List[DecodeResult]:
+    """Decode every image member of a zip or tar archive from memory.
+
+    Zip members are read and inflated by the workers themselves, in
+    parallel, and tiers behave as in ``batch.run_batch``. Tar archives only
+    allow a forward scan, so members are read in order with at most
+    ``window`` (default ``2 * max_workers``) held in memory, and each member
+    goes through its tiers in one go; ``max_workers="auto"`` tunes zip
+    batches and means the CPU count for tar. Results carry the member name
+    as ``filename``.
+
+    Raises:
+        ImageLoadError: If the archive cannot be opened
+    """
+    try:
+        if str(path).lower().endswith(".zip"):
+            return _decode_zip(decoder, path, max_workers, tiers, stats)
+        workers = fixed_workers(max_workers)
+        return _decode_tar(decoder, path, workers, tiers, stats, window or 2 * workers)
+    except (zipfile.BadZipFile, tarfile.TarError, OSError) as e:
+        raise ImageLoadError(f"Cannot read archive {path}: {e}")
+
+
+def _decode_zip(decoder, path, max_workers, tiers, stats) -> List[DecodeResult]:
+    with zipfile.ZipFile(path) as archive:
+        names = [info.filename for info in archive.infolist() if not info.is_dir() and _is_image(info.filename)]
+
+        def decode_member(name: str, tier: Optional[DecodeTier]) -> List[DecodeResult]:
+            return _decode_bytes(decoder, archive.read(name), name, tier)
+
+        return run_batch(decode_member, names, max_workers=max_workers, tiers=tiers, stats=stats)
+
+
+def _decode_tar(decoder, path, max_workers, tiers, stats, window) -> List[DecodeResult]:
+    stats = stats if stats is not None else BatchStats()
+    tiers = list(tiers or (None,))
+    started = time.perf_counter()
+    results: List[DecodeResult] = []
+
+    def escalate(name: str, data: bytes) -> Tuple[List[DecodeResult], int]:
+        for attempts, tier in enumerate(tiers, start=1):
+            try:
+                found = _decode_bytes(decoder, data, name, tier)
+            except Exception as e:
+                logger.error(f"Batch decode error: {e}")
+                found = []
+            if found:
+                return found, attempts
+        return [], len(tiers)
+
+    def collect(future) -> None:
+        found, attempts = future.result()
+        for tier in tiers[:attempts]:
+            tier_name = tier.name if tier is not None else DEFAULT_TIER_NAME
+            stats.tier_attempts[tier_name] = stats.tier_attempts.get(tier_name, 0) + 1
+        stats.total += 1
+        if found:
+            last = tiers[attempts - 1]
+            tier_name = last.name if last is not None else DEFAULT_TIER_NAME
+            stats.tier_successes[tier_name] = stats.tier_successes.get(tier_name, 0) + 1
+            stats.decoded += 1
+            results.extend(found)
+        else:
+            stats.failed += 1
+
+    in_flight = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for name, data in iter_members(path):
+            if len(in_flight) >= window:
+                collect(in_flight.popleft())
+            in_flight.append(executor.submit(escalate, name, data))
+        while in_flight:
+            collect(in_flight.popleft())
+
+    stats.elapsed += time.perf_counter() - started
+    return results
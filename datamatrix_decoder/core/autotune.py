@@ -0,0 +1,136 @@
+"""Self-tuning concurrency for batch decoding (``max_workers="auto"``)."""
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Optional, Union
+
+from datamatrix_decoder.core.exceptions import ConfigurationError
+
+
+logger = logging.getLogger(__name__)
+
+AUTO = "auto"
+
+# Threads beyond twice the core count only queue on the CPU
+AUTO_CEILING = 2 * (os.cpu_count() or 1)
+
+
+class AdaptiveConcurrency:
+    """Gate on active workers whose limit follows measured throughput.
+
+    The pool is sized to ``maximum`` but only ``level`` workers may decode
+    at once. Every ``window`` completions, images per second over that window
+    are compared with the best seen so far. The level climbs by ``step`` while
+    throughput improves by more than ``tolerance``. The first step that
+    does not improve it sends the level back to the best one seen, where it
+    settles (probing downwards once if the very first increase fails). A
+    later drop of more than ``2 * tolerance`` below the settled rate, e.g.
+    when a tier or image mix changes, starts a new climb.
+
+    Args:
+        maximum: Highest level allowed (CPU or memory ceiling)
+        start: First level (default half of ``maximum``)
+        minimum: Lowest level allowed
+        window: Completions per measurement (default ``max(8, 2 * level)``)
+        tolerance: Relative change treated as noise
+        clock: Time source, for tests
+    """
+
+    def __init__(
+        self,
+        maximum: int,
+        start: Optional[int] = None,
+        minimum: int = 1,
+        window: Optional[int] = None,
+        tolerance: float = 0.05,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        if not 1 <= minimum <= maximum:
+            raise ConfigurationError("auto concurrency needs 1 <= minimum <= maximum")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.level = min(maximum, max(minimum, start or (maximum + 1) // 2))
+        self.step = max(1, maximum // 8)
+        self.tolerance = tolerance
+        self.settled = False
+        self._window = window
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._active = 0
+        self._start_level = self.level
+        self._direction = 1
+        self._reversed = False
+        self._best_level = self.level
+        self._best_rate: Optional[float] = None
+        self._completed = 0
+        self._window_start = clock()
+
+    def _window_size(self) -> int:
+        return self._window or max(8, 2 * self.level)
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self._active >= self.level:
+                self._condition.wait()
+            self._active += 1
+
+    def release(self) -> None:
+        with self._condition:
+            self._active -= 1
+            self._completed += 1
+            if self._completed >= self._window_size():
+                now = self._clock()
+                elapsed = now - self._window_start
+                if elapsed > 0:
+                    self._adjust(self._completed / elapsed)
+                self._completed = 0
+                self._window_start = now
+            self._condition.notify_all()
+
+    def _adjust(self, rate: float) -> None:
+        if self.settled:
+            if rate < self._best_rate * (1 - 2 * self.tolerance):
+                logger.info(f"Throughput fell to {rate:.1f} img/s at {self.level} workers; re-tuning")
+                self.settled = False
+                self._best_rate, self._best_level = rate, self.level
+                self._direction, self._reversed, self._start_level = 1, False, self.level
+                self._move()
+            return
+        if self._best_rate is None or rate > self._best_rate * (1 + self.tolerance):
+            self._best_rate, self._best_level = rate, self.level
+            self._move()
+        elif not self._reversed and self._best_level == self._start_level and self._start_level > self.minimum:
+            # Climbing never helped; probe below the starting level instead
+            self._direction, self._reversed = -1, True
+            self.level = self._best_level
+            self._move()
+        else:
+            self._settle()
+
+    def _move(self) -> None:
+        level = min(self.maximum, max(self.minimum, self.level + self._direction * self.step))
+        if level == self.level:
+            self._settle()
+        else:
+            self.level = level
+
+    def _settle(self) -> None:
+        self.level = self._best_level
+        self.settled = True
+        logger.info(f"Auto concurrency settled at {self.level} workers ({self._best_rate:.1f} img/s)")
+
+
+def fixed_workers(max_workers: Union[int, str]) -> int:
+    """Worker count for code paths without a controller: ``"auto"`` becomes the CPU count."""
+    return (os.cpu_count() or 1) if max_workers == AUTO else max_workers
+
+
+def resolve_ceiling(mean_footprint: Optional[float] = None, available: Optional[int] = None) -> int:
+    """Highest worker count for auto mode: CPU bound, and memory bound when
+    the per-image footprint is known (half of ``available`` bytes)."""
+    ceiling = AUTO_CEILING
+    if mean_footprint and available:
+        ceiling = min(ceiling, max(1, int(available * 0.5 // mean_footprint)))
+    return ceiling
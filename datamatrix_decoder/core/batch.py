@@ -0,0 +1,190 @@
+"""Shared batch runner used by the decoders."""
+
+import logging
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple, Union
+
+from datamatrix_decoder.core.autotune import AUTO, AUTO_CEILING, AdaptiveConcurrency, resolve_ceiling
+from datamatrix_decoder.core.budget import PixelBudget, available_memory_bytes, peak_rss_bytes
+from datamatrix_decoder.core.exceptions import ConfigurationError
+from datamatrix_decoder.core.models import BatchStats, DecodeResult, DecodeTier, ImageCost
+from datamatrix_decoder.core.prefetch import DEFAULT_PREFETCH_BYTES, Prefetcher
+from datamatrix_decoder.core.scheduling import (
+    SCHEDULES,
+    estimate_bytes,
+    estimate_cost,
+    order_by_cost,
+    read_header,
+)
+
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+DecodeFn = Callable[[PathLike, Optional[DecodeTier]], List[DecodeResult]]
+
+DEFAULT_TIER_NAME = "default"
+DEFAULT_MAX_WORKERS = 4
+
+# Cheap first pass over the whole batch, then a thorough pass over the misses.
+DEFAULT_TIERS = (
+    DecodeTier("fast", timeout=0.25, scale=0.5),
+    DecodeTier(
+        "thorough",
+        timeout=None,
+        scale=1.0,
+        variants=("original", "autocontrast", "sharpen", "invert"),
+    ),
+)
+
+
+def _timed(
+    decode_one: DecodeFn,
+    path: PathLike,
+    tier: Optional[DecodeTier],
+    budget: Optional[PixelBudget] = None,
+    nbytes: int = 0,
+    prefetcher: Optional[Prefetcher] = None,
+) -> Tuple[List[DecodeResult], float]:
+    with budget.reserve(nbytes) if budget is not None else nullcontext():
+        started = time.perf_counter()
+        try:
+            if prefetcher is None:
+                return decode_one(path, tier), time.perf_counter() - started
+            data = prefetcher.take(path)
+            started = time.perf_counter()
+            return decode_one(path, tier, data=data), time.perf_counter() - started
+        except Exception as e:
+            logger.error(f"Batch decode error: {e}")
+            return [], time.perf_counter() - started
+
+
+def run_batch(
+    decode_one: DecodeFn,
+    image_paths: Iterable[PathLike],
+    max_workers: Union[int, str] = DEFAULT_MAX_WORKERS,
+    tiers: Optional[Sequence[DecodeTier]] = None,
+    stats: Optional[BatchStats] = None,
+    schedule: Optional[str] = None,
+    pixel_budget: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    prefetch: Optional[int] = None,
+    prefetch_bytes: int = DEFAULT_PREFETCH_BYTES,
+) -> List[DecodeResult]:
+    """Decode ``image_paths`` in parallel, optionally in escalating tiers.
+
+    Every image goes through the first tier. Images that yield nothing (or
+    raise) are queued for the next tier, which only runs once the previous
+    tier has drained, so hard images never hold a worker while easy ones wait.
+
+    Args:
+        decode_one: Callable decoding one path with the given tier
+        image_paths: Image file paths
+        max_workers: Maximum number of parallel workers, or ``"auto"`` to
+            tune the number of active workers to measured throughput (see
+            ``autotune.AdaptiveConcurrency``); the level reached lands in
+            ``stats.workers``
+        tiers: Decode tiers to run in order (None = single default pass)
+        stats: Optional BatchStats updated in place
+        schedule: Optional ordering from ``scheduling.SCHEDULES``; headers are
+            read up front and estimated vs actual costs land in ``stats.costs``
+        pixel_budget: Optional cap in bytes on decoded pixels in flight; workers
+            wait for budget before opening an image, peaks land in ``stats``
+        executor: Optional long-lived executor to run on instead of a pool
+            built for this call (``max_workers`` is then ignored); it is
+            left running afterwards
+        prefetch: Optional number of I/O threads reading files ahead of the
+            decode workers (see ``prefetch.Prefetcher``); ``decode_one`` is
+            then called with the file contents as ``data=``. Time workers
+            still spent waiting on reads lands in ``stats.io_wait``.
+        prefetch_bytes: Cap on file bytes read ahead and not yet decoded
+
+    Returns:
+        List of DecodeResult objects
+    """
+    if schedule is not None and schedule not in SCHEDULES:
+        raise ConfigurationError(f"Unknown schedule: {schedule}")
+    auto = max_workers == AUTO
+    if not auto and not isinstance(max_workers, int):
+        raise ConfigurationError(f"max_workers must be an integer or {AUTO!r}, got {max_workers!r}")
+    budget = PixelBudget(pixel_budget) if pixel_budget is not None else None
+    stats = stats if stats is not None else BatchStats()
+    pending = list(image_paths)
+    stats.total += len(pending)
+    started = time.perf_counter()
+
+    results: List[DecodeResult] = []
+    pool_size = AUTO_CEILING if auto else max_workers
+    pool = ThreadPoolExecutor(max_workers=pool_size) if executor is None else nullcontext(executor)
+    with pool as executor:
+        costs = {}
+        footprints = {}
+        if schedule is not None or budget is not None:
+            headers = dict(zip(pending, executor.map(read_header, pending)))
+            footprints = {path: estimate_bytes(header) for path, header in headers.items()}
+        if schedule is not None:
+            costs = {path: ImageCost(str(path), estimate_cost(header)) for path, header in headers.items()}
+            estimates = {path: cost.estimated for path, cost in costs.items()}
+            pending = order_by_cost(pending, estimates, schedule)
+
+        limiter = None
+        submit = executor.submit
+        if auto:
+            mean_footprint = sum(footprints.values()) / len(footprints) if footprints else None
+            limiter = AdaptiveConcurrency(resolve_ceiling(mean_footprint, available_memory_bytes()))
+
+            def submit(*args):
+                # Gate submission rather than execution, so any executor works
+                limiter.acquire()
+                future = executor.submit(*args)
+                future.add_done_callback(lambda _: limiter.release())
+                return future
+
+        for tier in tiers or (None,):
+            if not pending:
+                break
+            name = tier.name if tier is not None else DEFAULT_TIER_NAME
+            stats.tier_attempts[name] = stats.tier_attempts.get(name, 0) + len(pending)
+
+            prefetcher = Prefetcher(pending, prefetch, prefetch_bytes) if prefetch else None
+            try:
+                futures = {
+                    submit(_timed, decode_one, path, tier, budget, footprints.get(path, 0), prefetcher): index
+                    for index, path in enumerate(pending)
+                }
+                missed = []
+                for future in as_completed(futures):
+                    index = futures[future]
+                    found, seconds = future.result()
+                    if costs:
+                        costs[pending[index]].actual += seconds
+                    if found:
+                        results.extend(found)
+                        stats.decoded += 1
+                        stats.tier_successes[name] = stats.tier_successes.get(name, 0) + 1
+                    else:
+                        missed.append(index)
+            finally:
+                if prefetcher is not None:
+                    prefetcher.close()
+                    stats.io_wait += prefetcher.wait_seconds
+
+            if tier is not None and missed:
+                logger.info(f"Tier {name}: {len(missed)} of {len(pending)} images queued for retry")
+            pending = [pending[index] for index in sorted(missed)]
+
+        stats.costs.extend(costs.values())
+        if limiter is not None:
+            stats.workers = limiter.level
+            logger.info(f"Auto concurrency: {limiter.level} workers ({'settled' if limiter.settled else 'still tuning'})")
+
+    if budget is not None:
+        stats.peak_pixel_bytes = max(stats.peak_pixel_bytes, budget.peak)
+    stats.peak_rss = peak_rss_bytes()
+
+    stats.failed += len(pending)
+    stats.elapsed += time.perf_counter() - started
+    return results
@@ -0,0 +1,79 @@
+"""Memory budget shared by batch workers."""
+
+import os
+import sys
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from datamatrix_decoder.core.exceptions import ConfigurationError
+
+
+class PixelBudget:
+    """Caps the decoded pixel bytes held by workers at any one time.
+
+    Reservations are granted in arrival order, so a large image is not
+    starved by a stream of small ones. An image larger than the whole
+    budget still runs, but only once nothing else is in flight.
+    """
+
+    def __init__(self, limit: int):
+        if limit <= 0:
+            raise ConfigurationError(f"Pixel budget must be positive, got {limit}")
+        self.limit = limit
+        self.in_flight = 0
+        self.peak = 0
+        self._cond = threading.Condition()
+        self._waiting = deque()
+
+    def acquire(self, nbytes: int) -> None:
+        """Block until ``nbytes`` fit in the budget, then reserve them."""
+        ticket = object()
+        with self._cond:
+            self._waiting.append(ticket)
+            self._cond.wait_for(
+                lambda: self._waiting[0] is ticket
+                and (self.in_flight == 0 or self.in_flight + nbytes <= self.limit)
+            )
+            self._waiting.popleft()
+            self.in_flight += nbytes
+            self.peak = max(self.peak, self.in_flight)
+            self._cond.notify_all()
+
+    def release(self, nbytes: int) -> None:
+        """Return ``nbytes`` to the budget."""
+        with self._cond:
+            self.in_flight -= nbytes
+            self._cond.notify_all()
+
+    @contextmanager
+    def reserve(self, nbytes: int) -> Iterator[None]:
+        """Hold ``nbytes`` of the budget for the duration of a ``with`` block."""
+        self.acquire(nbytes)
+        try:
+            yield
+        finally:
+            self.release(nbytes)
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process, or None where unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def available_memory_bytes() -> Optional[int]:
+    """Physical memory currently available, or None where unavailable."""
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
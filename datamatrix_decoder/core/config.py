@@ -0,0 +1,301 @@
+"""Typed configuration with named performance profiles."""
+
+import dataclasses
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import yaml
+
+from datamatrix_decoder.core.autotune import AUTO
+from datamatrix_decoder.core.batch import DEFAULT_TIER_NAME
+from datamatrix_decoder.core.exceptions import ConfigurationError
+from datamatrix_decoder.core.models import DecodeTier
+from datamatrix_decoder.core.preprocessing import DRAFT_SCALES, VARIANTS
+from datamatrix_decoder.core.scheduling import SCHEDULES
+
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+CONFIG_ENV = "DATAMATRIX_DECODER_CONFIG"
+DEFAULT_CONFIG = "config.yaml"
+DEFAULT_PROFILE = "default"
+
+
+@dataclass(frozen=True)
+class Profile:
+    """Bundle of engine, concurrency and preprocessing settings.
+
+    Attributes:
+        name: Profile name
+        timeout: Per-image decode timeout in seconds
+        max_workers: Parallel workers for batches, or ``"auto"``
+        formats: Barcode formats to report (None = all supported)
+        tiers: Decode tiers; the last one is the most thorough
+        schedule: Batch ordering, see ``scheduling.SCHEDULES``
+        pixel_budget: Cap in bytes on decoded pixels in flight
+        hard_timeout: Wall-clock limit per image enforced by supervised workers
+        draft_scale: Reduced JPEG load tried before full resolution
+        prefetch: I/O threads reading files ahead of the decode workers
+        engine: Decoder engine, see ``DataMatrixDecoder.ENGINES`` and
+            ``BarcodeDecoder.ENGINES`` (None = each decoder's default)
+    """
+
+    name: str = DEFAULT_PROFILE
+    timeout: float = 30
+    max_workers: Union[int, str] = 4
+    formats: Optional[Tuple[str, ...]] = None
+    tiers: Tuple[DecodeTier, ...] = ()
+    schedule: Optional[str] = None
+    pixel_budget: Optional[int] = None
+    hard_timeout: Optional[float] = None
+    draft_scale: Optional[float] = None
+    prefetch: Optional[int] = None
+    engine: Optional[str] = None
+
+    def decode_tiers(self, timeout: Optional[float] = None) -> Tuple[DecodeTier, ...]:
+        """Tiers to run, with ``timeout`` (default: this profile's) filled in where a tier has none.
+
+        Pass a decoder's explicit timeout so it wins over the profile's.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        tiers = self.tiers or (DecodeTier(DEFAULT_TIER_NAME),)
+        return tuple(
+            dataclasses.replace(tier, timeout=timeout) if tier.timeout is None else tier
+            for tier in tiers
+        )
+
+
+@dataclass(frozen=True)
+class Config:
+    """Parsed configuration file."""
+
+    profiles: Dict[str, Profile] = field(default_factory=lambda: {DEFAULT_PROFILE: Profile()})
+    default_profile: str = DEFAULT_PROFILE
+    raw: Dict[str, Any] = field(default_factory=dict)
+
+    def profile(self, name: Optional[str] = None) -> Profile:
+        """Return the named profile, or the default one."""
+        name = name or self.default_profile
+        try:
+            return self.profiles[name]
+        except KeyError:
+            raise ConfigurationError(f"Unknown profile: {name} (available: {', '.join(sorted(self.profiles))})")
+
+
+def _expect(value, kind, key: str, profile: str):
+    if isinstance(value, bool) or not isinstance(value, kind):
+        raise ConfigurationError(f"Profile {profile}: {key} must be {getattr(kind, '__name__', kind)}")
+    return value
+
+
+def _parse_tier(raw: Any, profile: str) -> DecodeTier:
+    if not isinstance(raw, dict) or "name" not in raw:
+        raise ConfigurationError(f"Profile {profile}: each tier needs a name")
+    unknown = set(raw) - {"name", "timeout", "scale", "variants"}
+    if unknown:
+        raise ConfigurationError(f"Profile {profile}: unknown tier keys {sorted(unknown)}")
+    variants = tuple(raw.get("variants", ("original",)))
+    for variant in variants:
+        if variant not in VARIANTS:
+            raise ConfigurationError(f"Profile {profile}: unknown preprocessing variant {variant}")
+    timeout = raw.get("timeout")
+    scale = _expect(raw.get("scale", 1.0), (int, float), "scale", profile)
+    if not 0 < scale <= 1:
+        raise ConfigurationError(f"Profile {profile}: tier scale must be in (0, 1]")
+    return DecodeTier(
+        name=str(raw["name"]),
+        timeout=None if timeout is None else float(_expect(timeout, (int, float), "timeout", profile)),
+        scale=float(scale),
+        variants=variants,
+    )
+
+
+def _parse_profile(name: str, raw: Dict[str, Any], base: Profile) -> Profile:
+    from datamatrix_decoder.core.decoder import BarcodeDecoder, DataMatrixDecoder
+
+    if not isinstance(raw, dict):
+        raise ConfigurationError(f"Profile {name} must be a mapping")
+    known = {f.name for f in dataclasses.fields(Profile)} - {"name"}
+    unknown = set(raw) - known
+    if unknown:
+        raise ConfigurationError(f"Profile {name}: unknown keys {sorted(unknown)}")
+
+    values: Dict[str, Any] = {"name": name}
+    if "timeout" in raw:
+        values["timeout"] = float(_expect(raw["timeout"], (int, float), "timeout", name))
+    if "max_workers" in raw:
+        values["max_workers"] = raw["max_workers"]
+        if values["max_workers"] != AUTO:
+            values["max_workers"] = _expect(raw["max_workers"], int, "max_workers", name)
+        if values["max_workers"] != AUTO and values["max_workers"] < 1:
+            raise ConfigurationError(f"Profile {name}: max_workers must be at least 1")
+    if "formats" in raw:
+        formats = raw["formats"]
+        if formats is not None:
+            formats = tuple(_expect(formats, list, "formats", name))
+            unsupported = [fmt for fmt in formats if fmt not in BarcodeDecoder.SUPPORTED_FORMATS]
+            if unsupported:
+                raise ConfigurationError(f"Profile {name}: unsupported formats {unsupported}")
+        values["formats"] = formats
+    if "tiers" in raw:
+        values["tiers"] = tuple(_parse_tier(tier, name) for tier in _expect(raw["tiers"] or [], list, "tiers", name))
+    if "schedule" in raw:
+        if raw["schedule"] is not None and raw["schedule"] not in SCHEDULES:
+            raise ConfigurationError(f"Profile {name}: schedule must be one of {SCHEDULES}")
+        values["schedule"] = raw["schedule"]
+    if "pixel_budget" in raw:
+        budget = raw["pixel_budget"]
+        values["pixel_budget"] = None if budget is None else _expect(budget, int, "pixel_budget", name)
+    if "hard_timeout" in raw:
+        limit = raw["hard_timeout"]
+        values["hard_timeout"] = None if limit is None else float(_expect(limit, (int, float), "hard_timeout", name))
+    if "draft_scale" in raw:
+        if raw["draft_scale"] is not None and raw["draft_scale"] not in DRAFT_SCALES:
+            raise ConfigurationError(f"Profile {name}: draft_scale must be one of {DRAFT_SCALES}")
+        values["draft_scale"] = raw["draft_scale"]
+    if "prefetch" in raw:
+        threads = raw["prefetch"]
+        values["prefetch"] = None if threads is None else _expect(threads, int, "prefetch", name)
+        if threads is not None and threads < 1:
+            raise ConfigurationError(f"Profile {name}: prefetch must be at least 1")
+    if "engine" in raw:
+        engines = tuple(sorted(set(DataMatrixDecoder.ENGINES + BarcodeDecoder.ENGINES)))
+        if raw["engine"] is not None and raw["engine"] not in engines:
+            raise ConfigurationError(f"Profile {name}: engine must be one of {engines}")
+        values["engine"] = raw["engine"]
+    return dataclasses.replace(base, **values)
+
+
+def parse_config(raw: Optional[Dict[str, Any]]) -> Config:
+    """Build a Config from an already-loaded YAML document.
+
+    The ``decoder`` section is the ``default`` profile; every entry under
+    ``profiles`` starts from it and overrides what it lists.
+    """
+    raw = raw or {}
+    if not isinstance(raw, dict):
+        raise ConfigurationError("Configuration root must be a mapping")
+    base = _parse_profile(DEFAULT_PROFILE, raw.get("decoder") or {}, Profile())
+    profiles = {DEFAULT_PROFILE: base}
+    for name, section in (raw.get("profiles") or {}).items():
+        profiles[name] = _parse_profile(name, section or {}, base)
+    default_profile = raw.get("default_profile", DEFAULT_PROFILE)
+    if default_profile not in profiles:
+        raise ConfigurationError(f"default_profile {default_profile} is not defined")
+    return Config(profiles=profiles, default_profile=default_profile, raw=raw)
+
+
+def load_config(path: Optional[PathLike] = None) -> Config:
+    """Load a configuration file.
+
+    Args:
+        path: YAML file; defaults to ``$DATAMATRIX_DECODER_CONFIG`` or
+            ``config.yaml`` in the working directory, if present
+
+    Raises:
+        ConfigurationError: If the file is unreadable or invalid
+    """
+    path = path or os.environ.get(CONFIG_ENV)
+    if path is None:
+        if not Path(DEFAULT_CONFIG).exists():
+            return Config()
+        path = DEFAULT_CONFIG
+    try:
+        with open(path, encoding="utf-8") as f:
+            return parse_config(yaml.safe_load(f))
+    except (OSError, yaml.YAMLError) as e:
+        raise ConfigurationError(f"Cannot load configuration {path}: {e}")
+
+
+class ConfigWatcher:
+    """Configuration that reloads itself when the file changes.
+
+    The file's mtime is checked at most every ``interval`` seconds on
+    access, so long-running processes pick up edits without a restart or a
+    background thread. An invalid edit is logged and the last good
+    configuration stays in effect.
+    """
+
+    def __init__(self, path: PathLike, interval: float = 1.0):
+        self.path = Path(path)
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._mtime = self._stat()
+        self._config = load_config(self.path)
+        self._checked = time.monotonic()
+
+    def _stat(self) -> Optional[float]:
+        try:
+            return self.path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    @property
+    def config(self) -> Config:
+        now = time.monotonic()
+        if now - self._checked >= self.interval:
+            with self._lock:
+                self._checked = now
+                mtime = self._stat()
+                if mtime is not None and mtime != self._mtime:
+                    self._mtime = mtime
+                    try:
+                        self._config = load_config(self.path)
+                        logger.info(f"Reloaded configuration from {self.path}")
+                    except ConfigurationError as e:
+                        logger.error(f"Keeping previous configuration: {e}")
+        return self._config
+
+    def profile(self, name: Optional[str] = None) -> Profile:
+        return self.config.profile(name)
+
+
+class ReloadingDecoder:
+    """Decoder source for long-running processes that follows a ConfigWatcher.
+
+    Calling it returns a decoder built by ``build`` from the watcher's
+    current profile, rebuilt only after the configuration file changes. If
+    the reloaded file no longer has the profile, the previous decoder stays.
+
+    Args:
+        watcher: Configuration to follow
+        build: Callable making a decoder from a Profile
+        profile: Profile name (None = the configuration's default)
+    """
+
+    def __init__(self, watcher: ConfigWatcher, build: Callable[[Profile], Any], profile: Optional[str] = None):
+        self.watcher = watcher
+        self.build = build
+        self.profile_name = profile
+        self._lock = threading.Lock()
+        self._profile = watcher.profile(profile)
+        self._decoder = build(self._profile)
+
+    def __call__(self):
+        try:
+            profile = self.watcher.profile(self.profile_name)
+        except ConfigurationError as e:
+            logger.error(f"Keeping previous decoder: {e}")
+            return self._decoder
+        with self._lock:
+            if profile is not self._profile:
+                try:
+                    self._decoder = self.build(profile)
+                    self._profile = profile
+                    logger.info(f"Rebuilt decoder for profile {profile.name}")
+                except Exception as e:
+                    logger.error(f"Keeping previous decoder: {e}")
+                    self._profile = profile
+            return self._decoder
+
+
+def current_decoder(source):
+    """The decoder to use now: ``source`` itself, or what a source such as ``ReloadingDecoder`` returns."""
+    return source() if callable(source) else source
@@ -1,9 +1,11 @@
 """Core decoder implementation."""
 
+import io
 import logging
+import time
+from concurrent.futures import Executor
 from pathlib import Path
-from typing import List, Optional, Union
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union
 
 try:
     from pylibdmtx.pylibdmtx import decode as dmtx_decode
@@ -17,8 +19,26 @@ except ImportError:
 
 from PIL import Image
 
-from datamatrix_decoder.core.exceptions import DecodeError, UnsupportedFormatError
-from datamatrix_decoder.core.models import DecodeResult
+from datamatrix_decoder.core import dmtx_engine, zbar_engine
+from datamatrix_decoder.core.autotune import fixed_workers
+from datamatrix_decoder.core.batch import DEFAULT_MAX_WORKERS, run_batch
+from datamatrix_decoder.core.exceptions import ConfigurationError, DecodeError, UnsupportedFormatError
+from datamatrix_decoder.core.layout import Layout, decode_layout
+from datamatrix_decoder.core.models import BatchStats, DecodeResult, DecodeTier
+from datamatrix_decoder.core.preprocessing import (
+    apply_variant,
+    as_image,
+    draft_jpeg,
+    rescale,
+    validate_draft_scale,
+)
+from datamatrix_decoder.core.tiling import decode_tiles
+from datamatrix_decoder.core.watchdog import Quarantine, run_supervised
+
+if TYPE_CHECKING:
+    from datamatrix_decoder.core.config import Profile
+    from datamatrix_decoder.core.gate import BlankFrameGate
+    from datamatrix_decoder.core.rectify import Rectifier
 
 
 logger = logging.getLogger(__name__)
@@ -27,65 +47,315 @@ logger = logging.getLogger(__name__)
 class DataMatrixDecoder:
     """High-performance Data Matrix decoder."""
     
-    def __init__(self, timeout: int = 30):
+    # "pylibdmtx" builds native structures per call; "reusable" keeps one
+    # DmtxEngine per thread for streams of same-sized frames
+    ENGINES = ("pylibdmtx", "reusable")
+    
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        profile: Optional["Profile"] = None,
+        draft_scale: Optional[float] = None,
+        engine: Optional[str] = None,
+        gate: Optional["BlankFrameGate"] = None,
+        rectifier: Optional["Rectifier"] = None,
+        roi: Optional[Tuple[int, int, int, int]] = None,
+    ):
         """Initialize decoder.
         
         Args:
             timeout: Maximum time in seconds for decoding operation
+                (default: the profile's timeout, else 30)
+            profile: Optional performance profile supplying batch defaults
+            draft_scale: Decode JPEG files reduced to 0.5, 0.25 or 0.125 of
+                their size first, retrying at full resolution on a miss
+            engine: One of ``ENGINES`` (default: the profile's, else the first)
+            gate: Optional ``BlankFrameGate`` skipping frames with no symbol
+            rectifier: Optional ``Rectifier`` undistorting whole images and
+                frames before decoding; rects are then in rectified pixels
+            roi: Optional ``(left, top, right, bottom)`` of the rectified
+                image to compute and decode; needs ``rectifier``, and rects
+                are then relative to the region
         """
+        self.profile = profile
+        # Kept apart so an explicit timeout also wins over profiles passed to decode_batch
+        self._explicit_timeout = timeout
+        if timeout is None:
+            timeout = profile.timeout if profile is not None else 30
         self.timeout = timeout
+        self.draft_scale = _draft_scale(draft_scale, profile)
+        self.quarantine = Quarantine()
+        self.engine = _engine(engine, profile, self.ENGINES)
+        self.gate = gate
+        self.rectifier = rectifier
+        self.roi = _roi(roi, rectifier, self.draft_scale)
         if dmtx_decode is None:
             raise ImportError("pylibdmtx is required. Install: pip install pylibdmtx")
     
-    def decode_image(self, image_path: Union[str, Path]) -> Optional[DecodeResult]:
+    def decode_image(
+        self,
+        image_path: Union[str, Path],
+        tier: Optional[DecodeTier] = None,
+        data: Optional[bytes] = None,
+    ) -> Optional[DecodeResult]:
         """Decode Data Matrix from image file.
         
         Args:
             image_path: Path to image file
+            tier: Optional decode settings overriding timeout, scale and variants
+            data: Contents of the file when already read (e.g. prefetched);
+                ``image_path`` then only labels the result
             
         Returns:
             DecodeResult if successful, None otherwise
         """
+        started = time.perf_counter()
         try:
-            image = Image.open(image_path)
-            decoded = dmtx_decode(image, timeout=self.timeout)
+            results = _open_and_decode(self._rectified, image_path, tier, self.draft_scale, data)
+        except Exception as e:
+            logger.error(f"Error decoding {image_path}: {e}")
+            raise DecodeError(f"Failed to decode image: {e}")
+        
+        if not results:
+            return None
+        results[0].elapsed = time.perf_counter() - started
+        return results[0]
+    
+    def decode_frame(
+        self,
+        frame,
+        filename: Optional[str] = None,
+        page: Optional[int] = None,
+        tier: Optional[DecodeTier] = None,
+    ) -> Optional[DecodeResult]:
+        """Decode Data Matrix from in-memory pixels.
+        
+        Args:
+            frame: PIL image or uint8 NumPy array (H, W) / (H, W, C)
+            filename: Source label stored on the result
+            page: Frame index stored on the result
+            tier: Optional decode settings
             
-            if decoded:
-                obj = decoded[0]
-                return DecodeResult(
-                    data=obj.data.decode("utf-8"),
-                    format="datamatrix",
-                    rect=obj.rect,
-                    filename=str(image_path),
-                )
+        Returns:
+            DecodeResult if successful, None otherwise
+        """
+        started = time.perf_counter()
+        try:
+            results = self._rectified(as_image(frame), filename, tier)
+        except Exception as e:
+            logger.error(f"Error decoding frame {filename or page}: {e}")
+            raise DecodeError(f"Failed to decode frame: {e}")
+        
+        if not results:
             return None
+        results[0].elapsed = time.perf_counter() - started
+        results[0].page = page
+        return results[0]
+    
+    def decode_tiled(
+        self,
+        image_path: Union[str, Path],
+        tile_size: int = 2048,
+        max_symbol_size: int = 512,
+        max_workers: Optional[int] = None,
+    ) -> List[DecodeResult]:
+        """Decode every Data Matrix in a very large image tile by tile.
+        
+        Args:
+            image_path: Path to image file
+            tile_size: Tile edge in pixels
+            max_symbol_size: Largest expected symbol edge; used as tile overlap
+            max_workers: Tiles decoded in parallel (None = CPU count)
+            
+        Returns:
+            De-duplicated DecodeResult objects in image coordinates
+        """
+        started = time.perf_counter()
+        filename = str(image_path)
+        try:
+            with Image.open(image_path) as image:
+                gray = image.convert("L")
+            results = decode_tiles(
+                gray,
+                lambda tile: self._decode(tile, filename, max_count=None),
+                tile_size=tile_size,
+                max_symbol_size=max_symbol_size,
+                max_workers=max_workers,
+                # libdmtx measures y from the bottom edge
+                bottom_origin=True,
+            )
         except Exception as e:
             logger.error(f"Error decoding {image_path}: {e}")
             raise DecodeError(f"Failed to decode image: {e}")
+        
+        elapsed = time.perf_counter() - started
+        for result in results:
+            result.elapsed = elapsed
+        return results
     
-    def decode_batch(self, image_paths: List[Union[str, Path]], max_workers: int = 4) -> List[DecodeResult]:
+    def decode_layout(
+        self,
+        image_path: Union[str, Path],
+        layout: Layout,
+        max_workers: Optional[int] = None,
+        fallback: bool = True,
+    ) -> Dict[str, List[DecodeResult]]:
+        """Decode only the zones of a layout template.
+        
+        Args:
+            image_path: Path to image file
+            layout: Zones to search (see ``layout.load_layout``); zones not
+                expecting ``datamatrix`` are skipped (``BarcodeDecoder``
+                handles layouts mixing Data Matrix and other formats)
+            max_workers: Zones decoded in parallel (None = one per zone)
+            fallback: Search the full page for zones that come up empty
+            
+        Returns:
+            DecodeResult lists keyed by zone name, rects in page coordinates
+        """
+        filename = str(image_path)
+        
+        def scan(image: Image.Image, zones) -> List[DecodeResult]:
+            if not any(zone.accepts("datamatrix") for zone in zones):
+                return []
+            return self._decode(image, filename, max_count=None)
+        
+        return _decode_layout(
+            image_path,
+            layout,
+            lambda crop, zone: scan(crop, [zone]),
+            scan if fallback else None,
+            max_workers,
+        )
+    
+    def decode_array_batch(
+        self,
+        stack,
+        max_workers: Optional[int] = None,
+        normalize: bool = False,
+        scale: float = 1.0,
+        tier: Optional[DecodeTier] = None,
+        filename: Optional[str] = None,
+    ) -> List[DecodeResult]:
+        """Decode a stacked uint8 NumPy batch ``(N, H, W)`` / ``(N, H, W, C)``.
+        
+        Grayscale conversion, ``normalize`` and the ``1/k`` downscale run once
+        over the whole stack; frames are then decoded in parallel.
+        
+        Args:
+            stack: Frames from a grabber
+            max_workers: Frames decoded in parallel (None = profile or default)
+            normalize: Stretch each frame's contrast to the full 0-255 range
+            scale: Box downscale factor, ``1/k`` for a whole ``k``
+            tier: Optional decode settings
+            filename: Source label stored on the results
+            
+        Returns:
+            DecodeResult objects with ``page`` set to the frame index, rects
+            in original frame coordinates
+        """
+        from datamatrix_decoder.core.frames import decode_array_batch
+        
+        workers = _frame_workers(max_workers, self.profile)
+        return decode_array_batch(
+            self, stack, workers, normalize=normalize, scale=scale, tier=tier, filename=filename
+        )
+    
+    def _rectified(self, image: Image.Image, filename: str, tier: Optional[DecodeTier] = None) -> List[DecodeResult]:
+        """``_decode`` on the whole image, after the rectifier if one is set."""
+        if self.rectifier is not None:
+            image = as_image(self.rectifier.apply(image, self.roi))
+        return self._decode(image, filename, tier)
+    
+    def _decode(
+        self,
+        image: Image.Image,
+        filename: str,
+        tier: Optional[DecodeTier] = None,
+        max_count: Optional[int] = 1,
+    ) -> List[DecodeResult]:
+        """Run libdmtx over the tier's preprocessing variants of ``image``."""
+        if self.gate is not None:
+            return self.gate.run(image, lambda frame: self._search(frame, filename, tier, max_count))
+        return self._search(image, filename, tier, max_count)
+    
+    def _search(
+        self, image: Image.Image, filename: str, tier: Optional[DecodeTier], max_count: Optional[int]
+    ) -> List[DecodeResult]:
+        timeout = self.timeout
+        shrink = 1
+        variants = ("original",)
+        if tier is not None:
+            if tier.timeout is not None:
+                timeout = tier.timeout
+            if tier.scale < 1.0:
+                shrink = max(1, round(1.0 / tier.scale))
+            variants = tier.variants
+        
+        engine = dmtx_engine.thread_engine().decode if self.engine == "reusable" else dmtx_decode
+        for variant in variants:
+            # pylibdmtx expects the timeout in milliseconds
+            decoded = engine(
+                apply_variant(image, variant),
+                timeout=int(timeout * 1000),
+                shrink=shrink,
+                max_count=max_count,
+            )
+            if decoded:
+                return [
+                    DecodeResult(raw=obj.data, format="datamatrix", rect=obj.rect, filename=filename)
+                    for obj in decoded
+                ]
+        return []
+    
+    def _decode_path(
+        self, image_path: Union[str, Path], tier: Optional[DecodeTier], data: Optional[bytes] = None
+    ) -> List[DecodeResult]:
+        result = self.decode_image(image_path, tier, data)
+        return [result] if result else []
+    
+    def decode_batch(
+        self,
+        image_paths: List[Union[str, Path]],
+        max_workers: Union[int, str, None] = None,
+        tiers: Optional[Sequence[DecodeTier]] = None,
+        stats: Optional[BatchStats] = None,
+        schedule: Optional[str] = None,
+        pixel_budget: Optional[int] = None,
+        profile: Optional["Profile"] = None,
+        hard_timeout: Optional[float] = None,
+        executor: Optional[Executor] = None,
+        prefetch: Optional[int] = None,
+    ) -> List[DecodeResult]:
         """Decode multiple images in parallel.
         
         Args:
             image_paths: List of image file paths
-            max_workers: Maximum number of parallel workers
+            max_workers: Maximum number of parallel workers, or ``"auto"`` to
+                tune it to measured throughput (see ``autotune``)
+            tiers: Optional escalating decode tiers; misses of one tier are
+                retried by the next (see ``batch.DEFAULT_TIERS``)
+            stats: Optional BatchStats filled with per-tier counts
+            schedule: Optional cost-aware ordering, e.g. ``"largest-first"``
+            pixel_budget: Optional cap in bytes on decoded pixels in flight
+            profile: Profile for this call; supplies every option left as None
+                (defaults to the decoder's profile)
+            hard_timeout: Optional wall-clock limit in seconds per image; runs
+                the batch in supervised worker processes that are killed on
+                overrun (see ``watchdog.run_supervised``). Repeat offenders
+                collect in ``self.quarantine`` and are skipped afterwards.
+            executor: Optional long-lived executor to run on, e.g. a
+                ``DecoderSession``'s; not combinable with ``hard_timeout``
+            prefetch: Optional number of I/O threads reading files ahead of
+                the decode workers (see ``prefetch.Prefetcher``)
             
         Returns:
             List of DecodeResult objects
         """
-        results = []
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(self.decode_image, path): path for path in image_paths}
-            
-            for future in as_completed(futures):
-                try:
-                    result = future.result()
-                    if result:
-                        results.append(result)
-                except Exception as e:
-                    logger.error(f"Batch decode error: {e}")
-        
-        return results
+        return _run(self._decode_path, image_paths, stats, self.quarantine, executor, _batch_options(
+            profile or self.profile, max_workers, tiers, schedule, pixel_budget, hard_timeout, prefetch,
+            timeout=self._explicit_timeout,
+        ))
 
 
 class BarcodeDecoder:
@@ -96,17 +366,49 @@ class BarcodeDecoder:
         "code128", "code39", "code93", "itf", "codabar", "pdf417", "aztec"
     ]
     
-    def __init__(self, formats: Optional[List[str]] = None):
+    # "pyzbar" builds a scanner per call; "reusable" keeps one ZbarEngine per
+    # thread, configured once for ``formats``
+    ENGINES = ("pyzbar", "reusable")
+    
+    def __init__(
+        self,
+        formats: Optional[List[str]] = None,
+        profile: Optional["Profile"] = None,
+        draft_scale: Optional[float] = None,
+        engine: Optional[str] = None,
+        gate: Optional["BlankFrameGate"] = None,
+        rectifier: Optional["Rectifier"] = None,
+        roi: Optional[Tuple[int, int, int, int]] = None,
+    ):
         """Initialize barcode decoder.
         
         Args:
-            formats: List of barcode formats to decode (None = all)
+            formats: List of barcode formats to decode (None = the profile's, else all)
+            profile: Optional performance profile supplying batch defaults
+            draft_scale: See ``DataMatrixDecoder``
+            engine: One of ``ENGINES`` (default: the profile's, else the first)
+            gate: See ``DataMatrixDecoder``
+            rectifier: See ``DataMatrixDecoder``
+            roi: See ``DataMatrixDecoder``
         """
         if pyzbar is None:
             raise ImportError("pyzbar is required. Install: pip install pyzbar")
         
+        self.profile = profile
+        if formats is None and profile is not None and profile.formats:
+            formats = list(profile.formats)
         self.formats = formats or self.SUPPORTED_FORMATS
+        self.draft_scale = _draft_scale(draft_scale, profile)
+        self.quarantine = Quarantine()
         self._validate_formats()
+        self.engine = _engine(engine, profile, self.ENGINES)
+        self.gate = gate
+        self.rectifier = rectifier
+        self.roi = _roi(roi, rectifier, self.draft_scale)
+        # Built on first use by decode_layout for Data Matrix zones
+        self._datamatrix: Optional[DataMatrixDecoder] = None
+        # Only the requested symbologies are scanned for
+        self._symbologies = zbar_engine.symbologies(self.formats)
     
     def _validate_formats(self):
         """Validate requested formats are supported."""
@@ -114,48 +416,343 @@ class BarcodeDecoder:
             if fmt not in self.SUPPORTED_FORMATS:
                 raise UnsupportedFormatError(f"Format {fmt} not supported")
     
-    def decode_image(self, image_path: Union[str, Path]) -> List[DecodeResult]:
+    def decode_image(
+        self,
+        image_path: Union[str, Path],
+        tier: Optional[DecodeTier] = None,
+        data: Optional[bytes] = None,
+    ) -> List[DecodeResult]:
         """Decode all barcodes from image.
         
         Args:
             image_path: Path to image file
+            tier: Optional decode settings overriding scale and variants
+            data: See ``DataMatrixDecoder.decode_image``
             
         Returns:
             List of DecodeResult objects
         """
+        started = time.perf_counter()
         try:
-            image = Image.open(image_path)
-            decoded = pyzbar.decode(image)
-            
-            results = []
-            for obj in decoded:
-                if obj.type.lower() in self.formats:
-                    results.append(DecodeResult(
-                        data=obj.data.decode("utf-8"),
-                        format=obj.type.lower(),
-                        rect=obj.rect,
-                        filename=str(image_path),
-                    ))
-            
-            return results
+            results = _open_and_decode(self._rectified, image_path, tier, self.draft_scale, data)
         except Exception as e:
             logger.error(f"Error decoding {image_path}: {e}")
             raise DecodeError(f"Failed to decode image: {e}")
+        
+        elapsed = time.perf_counter() - started
+        for result in results:
+            result.elapsed = elapsed
+        return results
     
-    def decode_batch(self, image_paths: List[Union[str, Path]], max_workers: int = 4) -> List[DecodeResult]:
-        """Decode multiple images in parallel."""
-        results = []
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(self.decode_image, path): path for path in image_paths}
+    def decode_frame(
+        self,
+        frame,
+        filename: Optional[str] = None,
+        page: Optional[int] = None,
+        tier: Optional[DecodeTier] = None,
+    ) -> List[DecodeResult]:
+        """Decode all barcodes from in-memory pixels.
+        
+        Args:
+            frame: PIL image or uint8 NumPy array (H, W) / (H, W, C)
+            filename: Source label stored on the results
+            page: Frame index stored on the results
+            tier: Optional decode settings
             
-            for future in as_completed(futures):
-                try:
-                    batch_results = future.result()
-                    results.extend(batch_results)
-                except Exception as e:
-                    logger.error(f"Batch decode error: {e}")
+        Returns:
+            List of DecodeResult objects
+        """
+        started = time.perf_counter()
+        try:
+            results = self._rectified(as_image(frame), filename, tier)
+        except Exception as e:
+            logger.error(f"Error decoding frame {filename or page}: {e}")
+            raise DecodeError(f"Failed to decode frame: {e}")
         
+        elapsed = time.perf_counter() - started
+        for result in results:
+            result.elapsed = elapsed
+            result.page = page
         return results
+    
+    def decode_tiled(
+        self,
+        image_path: Union[str, Path],
+        tile_size: int = 2048,
+        max_symbol_size: int = 512,
+        max_workers: Optional[int] = None,
+    ) -> List[DecodeResult]:
+        """Decode all barcodes in a very large image tile by tile.
+        
+        See ``DataMatrixDecoder.decode_tiled``; for 1D codes ``max_symbol_size``
+        is the longest expected barcode length.
+        """
+        started = time.perf_counter()
+        filename = str(image_path)
+        try:
+            with Image.open(image_path) as image:
+                gray = image.convert("L")
+            results = decode_tiles(
+                gray,
+                lambda tile: self._decode(tile, filename),
+                tile_size=tile_size,
+                max_symbol_size=max_symbol_size,
+                max_workers=max_workers,
+            )
+        except Exception as e:
+            logger.error(f"Error decoding {image_path}: {e}")
+            raise DecodeError(f"Failed to decode image: {e}")
+        
+        elapsed = time.perf_counter() - started
+        for result in results:
+            result.elapsed = elapsed
+        return results
+    
+    def decode_layout(
+        self,
+        image_path: Union[str, Path],
+        layout: Layout,
+        max_workers: Optional[int] = None,
+        fallback: bool = True,
+    ) -> Dict[str, List[DecodeResult]]:
+        """Decode only the zones of a layout template; see ``DataMatrixDecoder.decode_layout``.
+        
+        Each zone keeps only the formats it lists. zbar cannot read Data
+        Matrix, so zones expecting ``datamatrix`` are also searched with
+        libdmtx; each engine only runs on zones expecting one of its formats.
+        """
+        filename = str(image_path)
+        zbar_formats = [fmt for fmt in self.formats if fmt != "datamatrix"]
+        datamatrix = self._datamatrix_decoder(layout)
+        
+        def scan(image: Image.Image, zones) -> List[DecodeResult]:
+            found = []
+            if any(zone.accepts(fmt) for zone in zones for fmt in zbar_formats):
+                found += self._decode(image, filename)
+            if datamatrix is not None and any(zone.accepts("datamatrix") for zone in zones):
+                found += datamatrix._decode(image, filename, max_count=None)
+            return found
+        
+        return _decode_layout(
+            image_path,
+            layout,
+            lambda crop, zone: [r for r in scan(crop, [zone]) if zone.accepts(r.format)],
+            scan if fallback else None,
+            max_workers,
+        )
+    
+    def _datamatrix_decoder(self, layout: Layout) -> Optional[DataMatrixDecoder]:
+        """libdmtx decoder for the layout's Data Matrix zones, if it has any.
+        
+        Zones listing ``datamatrix`` require pylibdmtx; zones without a
+        format list use it only when it is installed.
+        """
+        if "datamatrix" not in self.formats:
+            return None
+        listed = any(zone.formats and "datamatrix" in zone.formats for zone in layout.zones)
+        if not listed and (dmtx_decode is None or all(zone.formats for zone in layout.zones)):
+            return None
+        if self._datamatrix is None:
+            self._datamatrix = DataMatrixDecoder(
+                profile=self.profile,
+                draft_scale=self.draft_scale,
+                engine="reusable" if self.engine == "reusable" else None,
+                gate=self.gate,
+            )
+        return self._datamatrix
+    
+    def decode_array_batch(
+        self,
+        stack,
+        max_workers: Optional[int] = None,
+        normalize: bool = False,
+        scale: float = 1.0,
+        tier: Optional[DecodeTier] = None,
+        filename: Optional[str] = None,
+    ) -> List[DecodeResult]:
+        """Decode all barcodes in a stacked uint8 NumPy batch; see ``DataMatrixDecoder.decode_array_batch``."""
+        from datamatrix_decoder.core.frames import decode_array_batch
+        
+        workers = _frame_workers(max_workers, self.profile)
+        return decode_array_batch(
+            self, stack, workers, normalize=normalize, scale=scale, tier=tier, filename=filename
+        )
+    
+    def _rectified(self, image: Image.Image, filename: str, tier: Optional[DecodeTier] = None) -> List[DecodeResult]:
+        """See ``DataMatrixDecoder._rectified``."""
+        if self.rectifier is not None:
+            image = as_image(self.rectifier.apply(image, self.roi))
+        return self._decode(image, filename, tier)
+    
+    def _decode(
+        self, image: Image.Image, filename: str, tier: Optional[DecodeTier] = None
+    ) -> List[DecodeResult]:
+        """Run zbar over the tier's preprocessing variants of ``image``."""
+        if self.gate is not None:
+            return self.gate.run(image, lambda frame: self._search(frame, filename, tier))
+        return self._search(image, filename, tier)
+    
+    def _search(self, image: Image.Image, filename: str, tier: Optional[DecodeTier]) -> List[DecodeResult]:
+        scale = tier.scale if tier is not None else 1.0
+        variants = tier.variants if tier is not None else ("original",)
+        scaled = rescale(image, scale)
+        if self.engine == "reusable":
+            scan = zbar_engine.thread_engine(self._symbologies).decode
+        else:
+            symbols = zbar_engine.pyzbar_symbols(self._symbologies)
+            scan = lambda img: pyzbar.decode(img, symbols=symbols)
+        
+        for variant in variants:
+            results = []
+            for obj in scan(apply_variant(scaled, variant)):
+                fmt = zbar_engine.format_name(obj.type)
+                if fmt in self.formats:
+                    results.append(DecodeResult(
+                        raw=obj.data,
+                        format=fmt,
+                        rect=_unscale_rect(obj.rect, scale),
+                        filename=filename,
+                    ))
+            if results:
+                return results
+        return []
+    
+    def decode_batch(
+        self,
+        image_paths: List[Union[str, Path]],
+        max_workers: Union[int, str, None] = None,
+        tiers: Optional[Sequence[DecodeTier]] = None,
+        stats: Optional[BatchStats] = None,
+        schedule: Optional[str] = None,
+        pixel_budget: Optional[int] = None,
+        profile: Optional["Profile"] = None,
+        hard_timeout: Optional[float] = None,
+        executor: Optional[Executor] = None,
+        prefetch: Optional[int] = None,
+    ) -> List[DecodeResult]:
+        """Decode multiple images in parallel; see ``DataMatrixDecoder.decode_batch``."""
+        return _run(self.decode_image, image_paths, stats, self.quarantine, executor, _batch_options(
+            profile or self.profile, max_workers, tiers, schedule, pixel_budget, hard_timeout, prefetch
+        ))
+
+
+def _batch_options(
+    profile, max_workers, tiers, schedule, pixel_budget, hard_timeout, prefetch=None, timeout=None
+) -> dict:
+    """Fill batch options left as None from ``profile``; an explicit decoder ``timeout`` wins over its tiers'."""
+    if profile is not None:
+        max_workers = max_workers or profile.max_workers
+        tiers = tiers or profile.decode_tiers(timeout)
+        schedule = schedule or profile.schedule
+        pixel_budget = pixel_budget or profile.pixel_budget
+        hard_timeout = hard_timeout or profile.hard_timeout
+        prefetch = prefetch or profile.prefetch
+    return {
+        "max_workers": max_workers or DEFAULT_MAX_WORKERS,
+        "tiers": tiers,
+        "schedule": schedule,
+        "pixel_budget": pixel_budget,
+        "hard_timeout": hard_timeout,
+        "prefetch": prefetch,
+    }
+
+
+def _frame_workers(max_workers, profile) -> int:
+    """Thread count for in-memory frame batches: argument, then profile, then default."""
+    if max_workers is None and profile is not None:
+        max_workers = profile.max_workers
+    return fixed_workers(max_workers or DEFAULT_MAX_WORKERS)
+
+
+def _run(decode_one, image_paths, stats, quarantine, executor, options) -> List[DecodeResult]:
+    """Run a batch in threads, or in supervised processes when a hard timeout is set."""
+    hard_timeout = options.pop("hard_timeout")
+    if hard_timeout is None:
+        return run_batch(decode_one, image_paths, stats=stats, executor=executor, **options)
+    if executor is not None:
+        raise ConfigurationError("hard_timeout runs its own worker processes; it cannot use an executor")
+    return run_supervised(decode_one, image_paths, hard_timeout, stats=stats, quarantine=quarantine, **options)
+
+
+def _decode_layout(image_path, layout, scan, page_scan, max_workers):
+    """Run ``layout.decode_layout`` on an image file, timing each zone's results."""
+    started = time.perf_counter()
+    try:
+        with Image.open(image_path) as image:
+            image.load()
+            found = decode_layout(image, layout, scan, page_scan, max_workers)
+    except Exception as e:
+        logger.error(f"Error decoding {image_path}: {e}")
+        raise DecodeError(f"Failed to decode image: {e}")
+    
+    elapsed = time.perf_counter() - started
+    for results in found.values():
+        for result in results:
+            result.elapsed = elapsed
+    return found
+
+
+def _draft_scale(draft_scale: Optional[float], profile) -> Optional[float]:
+    if draft_scale is None and profile is not None:
+        draft_scale = profile.draft_scale
+    return validate_draft_scale(draft_scale)
+
+
+def _engine(engine: Optional[str], profile, engines: Sequence[str]) -> str:
+    if engine is None:
+        # A profile naming the other decoder's per-call engine leaves this one on its default
+        engine = profile.engine if profile is not None and profile.engine in engines else engines[0]
+    if engine not in engines:
+        raise ConfigurationError(f"Unknown engine: {engine} (choose from {', '.join(engines)})")
+    return engine
+
+
+def _roi(roi, rectifier, draft_scale: Optional[float]) -> Optional[Tuple[int, int, int, int]]:
+    if roi is None:
+        return None
+    if rectifier is None:
+        raise ConfigurationError("roi needs a rectifier")
+    if draft_scale is not None:
+        # The region is in full-resolution pixels; a draft load would shift it
+        raise ConfigurationError("roi cannot be combined with draft_scale")
+    left, top, right, bottom = roi
+    if not 0 <= left < right or not 0 <= top < bottom:
+        raise ConfigurationError(f"roi must be (left, top, right, bottom) inside the image, got {roi}")
+    return tuple(roi)
+
+
+def _open_and_decode(
+    decode, image_path, tier: Optional[DecodeTier], draft_scale: Optional[float], data: Optional[bytes] = None
+):
+    """Open and decode ``image_path`` (or its contents ``data``), trying a reduced JPEG load first.
+
+    With ``draft_scale`` set, JPEG files are first decoded by libjpeg at that
+    reduction in grayscale and only inflated to full resolution on a miss.
+    Tiers that already downsample (scale < 1) skip the draft pass.
+    """
+    filename = str(image_path)
+    source = lambda: io.BytesIO(data) if data is not None else image_path
+    if draft_scale is not None and (tier is None or tier.scale >= 1.0):
+        with Image.open(source()) as image:
+            applied = draft_jpeg(image, draft_scale)
+            if applied < 1.0:
+                results = decode(image, filename, tier)
+                if results:
+                    for result in results:
+                        result.rect = _unscale_rect(result.rect, applied) if result.rect is not None else None
+                    return results
+                logger.debug(f"Reduced decode of {image_path} missed; retrying at full resolution")
+            else:
+                return decode(image, filename, tier)
+    with Image.open(source()) as image:
+        return decode(image, filename, tier)
+
+
+def _unscale_rect(rect, scale: float):
+    """Map a rect found on a rescaled image back to source coordinates."""
+    if scale == 1.0:
+        return rect
+    return tuple(int(round(value / scale)) for value in rect)
 
 # Performance optimized for production use
 
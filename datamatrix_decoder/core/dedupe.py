@@ -0,0 +1,153 @@
+"""Near-duplicate frame suppression with perceptual hashes.
+
+A stopped conveyor or a burst capture produces runs of frames that look the
+same. ``FrameDeduplicator`` hashes a small grayscale thumbnail of each
+frame and, when it is within a few bits of the last frame actually decoded,
+reuses that frame's results instead of decoding again.
+"""
+
+import time
+from typing import Callable, List, Optional
+
+import numpy as np
+from PIL import Image
+
+from datamatrix_decoder.core.exceptions import ConfigurationError
+from datamatrix_decoder.core.models import DecodeResult
+
+
+HASH_METHODS = ("dhash", "ahash")
+
+# ITU-R 601 luma, the weights PIL uses for "L"
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def thumbnail(frame, width: int, height: int) -> np.ndarray:
+    """Area-averaged ``(height, width)`` grayscale thumbnail of a frame.
+
+    Blocks are summed with ``np.add.reduceat`` straight from the uint8
+    pixels, and colour frames are converted to luma only after shrinking.
+    """
+    if isinstance(frame, Image.Image):
+        frame = frame if frame.mode in ("L", "RGB") else frame.convert("L")
+    pixels = np.asarray(frame)
+    rows = np.linspace(0, pixels.shape[0], height + 1).astype(np.intp)
+    cols = np.linspace(0, pixels.shape[1], width + 1).astype(np.intp)
+    sums = np.add.reduceat(pixels, rows[:-1], axis=0, dtype=np.uint64)
+    sums = np.add.reduceat(sums, cols[:-1], axis=1, dtype=np.uint64)
+    counts = np.outer(np.maximum(np.diff(rows), 1), np.maximum(np.diff(cols), 1))
+    if sums.ndim == 3:
+        counts = counts[:, :, None]
+    means = sums / counts
+    if means.ndim == 3:
+        means = means[:, :, :3] @ _LUMA if means.shape[2] >= 3 else means[:, :, 0]
+    return means
+
+
+def _pack(bits: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+
+def dhash(frame, size: int = 8) -> int:
+    """Difference hash: one bit per horizontally adjacent thumbnail pair."""
+    thumb = thumbnail(frame, size + 1, size)
+    return _pack(thumb[:, 1:] > thumb[:, :-1])
+
+
+def ahash(frame, size: int = 8) -> int:
+    """Average hash: one bit per thumbnail pixel brighter than the mean."""
+    thumb = thumbnail(frame, size, size)
+    return _pack(thumb > thumb.mean())
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return bin(a ^ b).count("1")
+
+
+class FrameDeduplicator:
+    """Decides which frames of a stream need a decode of their own.
+
+    Each frame is compared with the reference frame, the last one that was
+    decoded. Within ``threshold`` bits it reuses the reference's results.
+    Otherwise it becomes the new reference. So that a label swapped under
+    an unchanged scene is still caught, the reference is re-decoded after
+    ``max_reuse`` reuses or ``max_age`` seconds, whichever comes first.
+
+    Args:
+        threshold: Largest Hamming distance treated as the same frame
+        max_reuse: Reuses allowed before a forced re-decode (None = no limit)
+        max_age: Seconds a reference stays valid (None = no limit)
+        method: One of ``HASH_METHODS``
+        hash_size: Thumbnail side; hashes have ``hash_size ** 2`` bits
+        clock: Time source, for tests
+    """
+
+    def __init__(
+        self,
+        threshold: int = 4,
+        max_reuse: Optional[int] = 30,
+        max_age: Optional[float] = None,
+        method: str = "dhash",
+        hash_size: int = 8,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if method not in HASH_METHODS:
+            raise ConfigurationError(f"Unknown hash method: {method} (choose from {', '.join(HASH_METHODS)})")
+        if threshold < 0 or hash_size < 2:
+            raise ConfigurationError("threshold must be >= 0 and hash_size >= 2")
+        self.threshold = threshold
+        self.max_reuse = max_reuse
+        self.max_age = max_age
+        self.hash_size = hash_size
+        self.checked = 0
+        self.reused = 0
+        self._hash = dhash if method == "dhash" else ahash
+        self._clock = clock
+        self._reference: Optional[int] = None
+        self._reference_time = 0.0
+        self._reuses = 0
+        self._results: List[DecodeResult] = []
+
+    def check(self, frame) -> bool:
+        """True if ``frame`` may reuse the reference's results.
+
+        Otherwise ``frame`` becomes the new reference and must be decoded.
+        """
+        value = self._hash(frame, self.hash_size)
+        self.checked += 1
+        if (
+            self._reference is not None
+            and hamming(value, self._reference) <= self.threshold
+            and (self.max_reuse is None or self._reuses < self.max_reuse)
+            and (self.max_age is None or self._clock() - self._reference_time < self.max_age)
+        ):
+            self._reuses += 1
+            self.reused += 1
+            return True
+        self._reference = value
+        self._reference_time = self._clock()
+        self._reuses = 0
+        return False
+
+    def reset(self) -> None:
+        """Forget the reference, e.g. after the camera or scene changes."""
+        self._reference = None
+        self._results = []
+
+    def decode(self, decoder, frame, filename: Optional[str] = None, page: Optional[int] = None) -> List[DecodeResult]:
+        """``decoder.decode_frame`` for frames that differ from the reference,
+        copies of the reference's results for those that do not."""
+        if self.check(frame):
+            return reuse(self._results, filename, page)
+        found = decoder.decode_frame(frame, filename=filename, page=page)
+        self._results = found if isinstance(found, list) else [found] if found else []
+        return self._results
+
+
+def reuse(results: List[DecodeResult], filename: Optional[str], page: Optional[int]) -> List[DecodeResult]:
+    """Copies of a reference frame's results labelled for a duplicate frame."""
+    return [
+        DecodeResult(raw=r.raw, format=r.format, rect=r.rect, filename=filename, elapsed=0.0, page=page)
+        for r in results
+    ]
@@ -0,0 +1,144 @@
+"""Reusable libdmtx image and decoder structures for fixed-size frame streams.
+
+``pylibdmtx.decode`` creates and frees a native image and decoder, and
+copies the pixels with ``tobytes()``, on every call. ``DmtxEngine`` keeps
+them alive between calls: frames of the size seen last are pasted into a
+preallocated grayscale buffer that the native image already points at, and
+only the decoder's visited-pixel cache and scan grid are reset.
+"""
+
+import ctypes
+import threading
+from ctypes import byref, cast
+from typing import List, Optional, Tuple
+
+from PIL import Image
+
+try:
+    from pylibdmtx import pylibdmtx as _pylibdmtx
+    from pylibdmtx.wrapper import (
+        DmtxPackOrder,
+        DmtxProperty,
+        DmtxUndefined,
+        c_ubyte_p,
+        dmtxDecodeCreate,
+        dmtxDecodeDestroy,
+        dmtxDecodeSetProp,
+        dmtxImageCreate,
+        dmtxImageDestroy,
+        dmtxTimeAdd,
+        dmtxTimeNow,
+    )
+except ImportError:
+    _pylibdmtx = None
+
+from datamatrix_decoder.core.exceptions import DecodeError
+
+
+class DmtxEngine:
+    """Long-lived libdmtx context; same call signature as ``pylibdmtx.decode``.
+
+    Native structures are rebuilt only when the frame size or ``shrink``
+    changes. Not thread-safe: use one engine per thread (``thread_engine``).
+    """
+
+    def __init__(self):
+        if _pylibdmtx is None:
+            raise ImportError("pylibdmtx is required. Install: pip install pylibdmtx")
+        self._size: Optional[Tuple[int, int]] = None
+        self._shrink: Optional[int] = None
+        self._buffer = None
+        self._canvas: Optional[Image.Image] = None
+        self._image = None
+        self._decoder = None
+
+    def _allocate(self, size: Tuple[int, int]) -> None:
+        self.close()
+        width, height = size
+        self._buffer = (ctypes.c_ubyte * (width * height))()
+        # A mapped "L" image over the buffer lets PIL paste frames straight into it
+        self._canvas = Image.frombuffer("L", size, self._buffer, "raw", "L", 0, 1)
+        self._image = dmtxImageCreate(cast(self._buffer, c_ubyte_p), width, height, DmtxPackOrder.DmtxPack8bppK)
+        if not self._image:
+            raise DecodeError("Could not create libdmtx image")
+        self._size = size
+
+    def _prepare_decoder(self, shrink: int) -> None:
+        if self._decoder is not None and shrink == self._shrink:
+            # Forget the pixels visited in the previous frame and restart the scan
+            width, height = self._size
+            ctypes.memset(self._decoder.contents.cache, 0, (width // shrink) * (height // shrink))
+            dmtxDecodeSetProp(self._decoder, DmtxProperty.DmtxPropScanGap, self._decoder.contents.scanGap)
+            return
+        if self._decoder is not None:
+            dmtxDecodeDestroy(byref(self._decoder))
+            self._decoder = None
+        self._decoder = dmtxDecodeCreate(self._image, shrink)
+        if not self._decoder:
+            raise DecodeError("Could not create libdmtx decoder")
+        self._shrink = shrink
+
+    def decode(
+        self,
+        image: Image.Image,
+        timeout: Optional[int] = None,
+        shrink: int = 1,
+        max_count: Optional[int] = None,
+    ) -> List:
+        """Decode Data Matrix symbols in ``image``.
+
+        Args:
+            image: PIL image; non-grayscale images are converted to ``L``
+            timeout: Milliseconds, as for ``pylibdmtx.decode``
+            shrink: libdmtx internal downsampling factor
+            max_count: Stop after this many symbols (None = all)
+
+        Returns:
+            ``pylibdmtx`` ``Decoded(data, rect)`` tuples
+        """
+        gray = image if image.mode == "L" else image.convert("L")
+        gray.load()
+        if gray.size != self._size:
+            self._allocate(gray.size)
+        self._canvas.im.paste(gray.im, (0, 0) + gray.size)
+        self._prepare_decoder(shrink)
+
+        deadline = dmtxTimeAdd(dmtxTimeNow(), timeout) if timeout else None
+        results = []
+        while True:
+            with _pylibdmtx._region(self._decoder, deadline) as region:
+                if not region:
+                    break
+                found = _pylibdmtx._decode_region(self._decoder, region, DmtxUndefined, shrink)
+                if found:
+                    results.append(found)
+                    if max_count and len(results) == max_count:
+                        break
+        return results
+
+    def close(self) -> None:
+        """Free the native structures."""
+        if self._decoder is not None:
+            dmtxDecodeDestroy(byref(self._decoder))
+            self._decoder = None
+        if self._image is not None:
+            dmtxImageDestroy(byref(self._image))
+            self._image = None
+        self._canvas = None
+        self._buffer = None
+        self._size = self._shrink = None
+
+    def __del__(self):
+        if _pylibdmtx is not None:
+            self.close()
+
+
+_local = threading.local()
+
+
+def thread_engine() -> DmtxEngine:
+    """The calling thread's engine, created on first use."""
+    engine = getattr(_local, "engine", None)
+    if engine is None:
+        engine = _local.engine = DmtxEngine()
+    return engine
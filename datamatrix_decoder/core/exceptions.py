@@ -25,6 +25,11 @@ class ConfigurationError(DecoderError):
     """Raised when configuration is invalid."""
     pass
 
+
+class GS1Error(DecoderError):
+    """Raised when a payload is not a valid GS1 element string."""
+    pass
+
 # Simple, clear exception hierarchy
 
 
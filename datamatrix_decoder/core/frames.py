@@ -0,0 +1,286 @@
+"""Memory-mapped raw frame sequences, ``.npy`` stacks and in-memory frame batches."""
+
+import logging
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from datamatrix_decoder.core.dedupe import FrameDeduplicator, reuse
+from datamatrix_decoder.core.exceptions import ConfigurationError, ImageLoadError
+from datamatrix_decoder.core.layout import BOTTOM_ORIGIN_FORMATS
+from datamatrix_decoder.core.models import DecodeResult, DecodeTier
+
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+
+class FrameStack:
+    """Sequence of zero-copy frame views over a memory-mapped file.
+
+    Use ``FrameStack.raw`` for headerless 8-bit captures and
+    ``FrameStack.npy`` for ``(N, H, W)`` / ``(N, H, W, C)`` uint8 stacks.
+    Frames are never read until indexed; ``release`` drops the pages of a
+    processed frame so resident memory stays flat over multi-GB captures.
+    """
+
+    def __init__(self, path: PathLike, offset: int, frame_bytes: int, count: int, shape, stride: int):
+        self.path = str(path)
+        self.frame_bytes = frame_bytes
+        self._offset = offset
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        height, width = shape[:2]
+        channels = shape[2] if len(shape) == 3 else 1
+        buffer = np.frombuffer(self._mmap, dtype=np.uint8, count=count * frame_bytes, offset=offset)
+        rows = buffer.reshape(count, frame_bytes)[:, :height * stride].reshape(count, height, stride)
+        frames = rows[:, :, :width * channels]
+        self._frames = frames.reshape((count,) + tuple(shape)) if channels > 1 else frames
+
+    @classmethod
+    def raw(
+        cls,
+        path: PathLike,
+        width: int,
+        height: int,
+        stride: Optional[int] = None,
+        offset: int = 0,
+        channels: int = 1,
+        frame_bytes: Optional[int] = None,
+    ) -> "FrameStack":
+        """Map a headerless file of consecutive 8-bit frames.
+
+        Args:
+            path: Capture file
+            width: Frame width in pixels
+            height: Frame height in pixels
+            stride: Bytes per row including padding (default width * channels)
+            offset: Bytes to skip at the start of the file
+            channels: Interleaved channels per pixel (1, 3 or 4)
+            frame_bytes: Bytes per frame including trailing padding (default stride * height)
+        """
+        stride = stride or width * channels
+        frame_bytes = frame_bytes or stride * height
+        if stride < width * channels or frame_bytes < stride * height:
+            raise ConfigurationError("stride/frame_bytes smaller than the frame they hold")
+        count = (os.path.getsize(path) - offset) // frame_bytes
+        shape = (height, width, channels) if channels > 1 else (height, width)
+        return cls(path, offset, frame_bytes, count, shape, stride)
+
+    @classmethod
+    def npy(cls, path: PathLike) -> "FrameStack":
+        """Map a C-ordered uint8 ``.npy`` stack of frames."""
+        with open(path, "rb") as f:
+            try:
+                version = np.lib.format.read_magic(f)
+                if version[0] == 1:
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+                else:
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            except ValueError as e:
+                raise ImageLoadError(f"Not a .npy file: {path}: {e}")
+            offset = f.tell()
+        if dtype != np.uint8 or fortran_order or len(shape) not in (3, 4):
+            raise ImageLoadError(f"Expected a C-ordered uint8 (N, H, W[, C]) stack, got {dtype} {shape}")
+        frame_shape = shape[1:]
+        frame_bytes = int(np.prod(frame_shape))
+        stride = frame_shape[1] * (frame_shape[2] if len(frame_shape) == 3 else 1)
+        return cls(path, offset, frame_bytes, shape[0], frame_shape, stride)
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        return self._frames[index]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        return iter(self._frames)
+
+    def release(self, index: int) -> None:
+        """Tell the kernel the pages of frame ``index`` are no longer needed."""
+        if not hasattr(self._mmap, "madvise") or not hasattr(mmap, "MADV_DONTNEED"):
+            return
+        start = self._offset + index * self.frame_bytes
+        aligned = -(-start // mmap.PAGESIZE) * mmap.PAGESIZE
+        end = (start + self.frame_bytes) // mmap.PAGESIZE * mmap.PAGESIZE
+        if end > aligned:
+            self._mmap.madvise(mmap.MADV_DONTNEED, aligned, end - aligned)
+
+    def close(self) -> None:
+        """Unmap the file, or leave it to be unmapped with the last outstanding view."""
+        self._frames = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+    def __enter__(self) -> "FrameStack":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_frames(path: PathLike, **raw_options) -> FrameStack:
+    """Open ``.npy`` stacks directly, anything else as raw frames (see ``FrameStack.raw``)."""
+    if Path(path).suffix.lower() == ".npy":
+        return FrameStack.npy(path)
+    return FrameStack.raw(path, **raw_options)
+
+
+def decode_frames(
+    decoder,
+    frames: FrameStack,
+    max_workers: int = 4,
+    window: Optional[int] = None,
+    dedupe: Optional[FrameDeduplicator] = None,
+) -> List[DecodeResult]:
+    """Decode every frame of a stack, results tagged with the frame index as ``page``.
+
+    At most ``window`` frames (default ``2 * max_workers``) are in flight, and
+    each frame's pages are released once decoded. With ``dedupe``, frames
+    that hash close to the last decoded frame reuse its results instead of
+    being decoded (see ``dedupe.FrameDeduplicator``). The deduplicator may be
+    shared across consecutive stacks; each stack's first frame is decoded.
+    """
+    window = window or 2 * max_workers
+    if dedupe is not None:
+        # The reference's results belong to the previous call
+        dedupe.reset()
+    results: List[DecodeResult] = []
+
+    def collect(index: int, future, duplicate: bool) -> None:
+        try:
+            found = future.result()
+        except Exception as e:
+            logger.error(f"Frame {index} decode error: {e}")
+            found = None
+        found = found if isinstance(found, list) else [found] if found else []
+        results.extend(reuse(found, frames.path, index) if duplicate else found)
+        frames.release(index)
+
+    in_flight = deque()
+    reference = None
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for index in range(len(frames)):
+            if len(in_flight) >= window:
+                collect(*in_flight.popleft())
+            if dedupe is not None and dedupe.check(frames[index]):
+                # Resolves with the reference frame's decode
+                in_flight.append((index, reference, True))
+                continue
+            reference = executor.submit(decoder.decode_frame, frames[index], filename=frames.path, page=index)
+            in_flight.append((index, reference, False))
+        while in_flight:
+            collect(*in_flight.popleft())
+    return results
+
+
+# Fixed-point ITU-R 601 luma weights summing to 256
+_LUMA_WEIGHTS = (77, 150, 29)
+
+
+def _downscale_factor(scale: float) -> int:
+    factor = round(1 / scale) if scale > 0 else 0
+    if not 0 < scale <= 1 or abs(factor * scale - 1) > 1e-9:
+        raise ConfigurationError(f"scale must be 1/k for a whole k, got {scale}")
+    return factor
+
+
+def preprocess_stack(
+    stack: np.ndarray,
+    grayscale: bool = True,
+    normalize: bool = False,
+    scale: float = 1.0,
+) -> np.ndarray:
+    """Prepare a whole ``(N, H, W)`` / ``(N, H, W, C)`` uint8 stack in a few array operations.
+
+    Args:
+        stack: Frames from a grabber
+        grayscale: Convert colour frames to luma
+        normalize: Stretch each frame's darkest-to-lightest range to 0-255
+        scale: Box downscale by ``1/k``, e.g. 0.5 averages 2x2 blocks
+
+    Returns:
+        C-contiguous uint8 stack whose frames can be handed out as views
+    """
+    if stack.dtype != np.uint8 or stack.ndim not in (3, 4):
+        raise ConfigurationError(f"Expected a uint8 (N, H, W[, C]) stack, got {stack.dtype} {stack.shape}")
+    factor = _downscale_factor(scale)
+    frames = stack
+    if frames.ndim == 4 and frames.shape[3] == 1:
+        frames = frames[..., 0]
+    if grayscale and frames.ndim == 4:
+        if frames.shape[3] < 3:
+            raise ConfigurationError(f"Cannot convert {frames.shape[3]}-channel frames to grayscale")
+        luma = np.zeros(frames.shape[:3], dtype=np.uint16)
+        for channel, weight in enumerate(_LUMA_WEIGHTS):
+            luma += frames[..., channel].astype(np.uint16) * weight
+        frames = (luma >> 8).astype(np.uint8)
+    if factor > 1:
+        count, height, width = frames.shape[:3]
+        rows, cols = height // factor, width // factor
+        blocks = frames[:, :rows * factor, :cols * factor].reshape(
+            (count, rows, factor, cols, factor) + frames.shape[3:]
+        )
+        frames = ((blocks.sum(axis=(2, 4), dtype=np.uint32) + factor * factor // 2) // (factor * factor)).astype(np.uint8)
+    if normalize:
+        axes = tuple(range(1, frames.ndim))
+        low = frames.min(axis=axes, keepdims=True)
+        spread = np.maximum(frames.max(axis=axes, keepdims=True) - low, 1).astype(np.float32)
+        frames = ((frames - low) * (np.float32(255) / spread)).astype(np.uint8)
+    return np.ascontiguousarray(frames)
+
+
+def _unscale(rect: Optional[Tuple[int, ...]], factor: int, trimmed: int = 0) -> Optional[Tuple[int, ...]]:
+    """Map a rect on a frame shrunk by ``factor`` back to the full frame.
+
+    ``trimmed`` is the number of bottom rows cut off before shrinking; a
+    ``top`` measured from the bottom edge must skip them.
+    """
+    if rect is None or factor == 1:
+        return rect
+    left, top, *rest = (value * factor for value in rect)
+    return (left, top + trimmed, *rest)
+
+
+def decode_array_batch(
+    decoder,
+    stack: np.ndarray,
+    max_workers: int = 4,
+    grayscale: bool = True,
+    normalize: bool = False,
+    scale: float = 1.0,
+    tier: Optional[DecodeTier] = None,
+    filename: Optional[str] = None,
+) -> List[DecodeResult]:
+    """Decode every frame of an in-memory stack, results tagged with the frame index as ``page``.
+
+    The stack is preprocessed once as a whole (see ``preprocess_stack``),
+    then each frame goes to ``decoder.decode_frame`` as a contiguous view,
+    in parallel. Rects are mapped back to the original frame size.
+    """
+    frames = preprocess_stack(stack, grayscale=grayscale, normalize=normalize, scale=scale)
+    factor = _downscale_factor(scale)
+    # Block averaging drops the last height % factor rows
+    trimmed = stack.shape[1] % factor
+
+    def decode(index: int) -> List[DecodeResult]:
+        try:
+            found = decoder.decode_frame(frames[index], filename=filename, page=index, tier=tier)
+        except Exception as e:
+            logger.error(f"Frame {index} decode error: {e}")
+            return []
+        found = found if isinstance(found, list) else [found] if found else []
+        for result in found:
+            result.rect = _unscale(result.rect, factor, trimmed if result.format in BOTTOM_ORIGIN_FORMATS else 0)
+        return found
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return [result for found in executor.map(decode, range(len(frames))) for result in found]
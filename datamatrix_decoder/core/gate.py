@@ -0,0 +1,157 @@
+"""Cheap pre-decode gate that turns away frames with no symbol in them.
+
+A libdmtx search over an empty frame runs until its timeout. The gate
+looks at an area-averaged thumbnail instead. Data Matrix, QR and 1D
+symbols all show up as patches dense in strong module edges with high
+local contrast. A frame without such a patch is rejected before it
+reaches an engine.
+"""
+
+import random
+import threading
+from typing import Callable, List, Optional
+
+import numpy as np
+from PIL import Image
+
+from datamatrix_decoder.core.dedupe import thumbnail
+from datamatrix_decoder.core.exceptions import ConfigurationError
+from datamatrix_decoder.core.models import DecodeResult
+
+
+# Grey-level step between neighbouring thumbnail pixels counted as an edge
+EDGE_STEP = 16
+# Darkest-to-lightest spread a block needs before its edges count
+MIN_CONTRAST = 40
+# Edge density required at sensitivity 0
+MAX_DENSITY = 0.5
+
+
+def symbol_score(frame, size: int = 256, block: int = 8) -> float:
+    """Edge density of the busiest high-contrast block of the thumbnail, in [0, 1].
+
+    Returns 1.0 for frames too small to judge.
+
+    Args:
+        frame: PIL image or uint8 NumPy array
+        size: Long side of the thumbnail; modules must stay about two
+            thumbnail pixels wide for their edges to survive
+        block: Side of the square blocks in thumbnail pixels
+    """
+    pixels = frame.size[::-1] if isinstance(frame, Image.Image) else frame.shape[:2]
+    scale = min(1.0, size / max(pixels))
+    height, width = max(1, round(pixels[0] * scale)), max(1, round(pixels[1] * scale))
+    thumb = thumbnail(frame, width, height)
+    rows, cols = (height - 1) // block, (width - 1) // block
+    if not rows or not cols:
+        return 1.0
+    edges = np.maximum(
+        np.abs(np.diff(thumb, axis=1))[:-1],
+        np.abs(np.diff(thumb, axis=0))[:, :-1],
+    ) > EDGE_STEP
+    crop = (slice(0, rows * block), slice(0, cols * block))
+    density = edges[crop].reshape(rows, block, cols, block).mean(axis=(1, 3))
+    blocks = thumb[:-1, :-1][crop].reshape(rows, block, cols, block)
+    contrast = blocks.max(axis=(1, 3)) - blocks.min(axis=(1, 3))
+    density[contrast < MIN_CONTRAST] = 0.0
+    return float(density.max())
+
+
+class BlankFrameGate:
+    """Skips the engines for frames that clearly hold no symbol.
+
+    ``sensitivity`` runs from 0 (reject anything short of a dense,
+    high-contrast patch) to 1 (admit every frame). A fraction
+    ``sample_rate`` of rejected frames is decoded anyway. Any symbol found
+    in those counts as a false reject, which estimates how many symbols
+    the gate loses at this setting.
+
+    The gate pickles, so decoders holding one work in process pools. Its
+    counters are then per process: each worker counts only its own frames,
+    and the parent's copy sees none of them.
+
+    Args:
+        sensitivity: Lower rejects more frames
+        sample_rate: Fraction of rejected frames decoded for auditing
+        size: Thumbnail long side, see ``symbol_score``
+        block: Block side, see ``symbol_score``
+        seed: Seed for the audit sampling
+    """
+
+    def __init__(
+        self,
+        sensitivity: float = 0.5,
+        sample_rate: float = 0.0,
+        size: int = 256,
+        block: int = 8,
+        seed: Optional[int] = None,
+    ):
+        if not 0 <= sensitivity <= 1:
+            raise ConfigurationError("gate sensitivity must be in [0, 1]")
+        if not 0 <= sample_rate <= 1:
+            raise ConfigurationError("gate sample_rate must be in [0, 1]")
+        self.sensitivity = sensitivity
+        self.sample_rate = sample_rate
+        self.size = size
+        self.block = block
+        self.threshold = MAX_DENSITY * (1 - sensitivity)
+        self.checked = 0
+        self.rejected = 0
+        self.sampled = 0
+        self.false_rejects = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def admits(self, frame) -> bool:
+        """True if ``frame`` could contain a symbol."""
+        return self.sensitivity >= 1 or symbol_score(frame, self.size, self.block) >= self.threshold
+
+    def run(self, frame, decode: Callable[[object], List[DecodeResult]]) -> List[DecodeResult]:
+        """``decode(frame)`` if the gate admits ``frame`` or samples it, else ``[]``."""
+        admitted = self.admits(frame)
+        sampled = False
+        with self._lock:
+            self.checked += 1
+            if not admitted:
+                self.rejected += 1
+                sampled = self.sample_rate > 0 and self._random.random() < self.sample_rate
+                self.sampled += sampled
+        if admitted:
+            return decode(frame)
+        if not sampled:
+            return []
+        found = decode(frame)
+        if found:
+            with self._lock:
+                self.false_rejects += 1
+        return found
+
+    @property
+    def reject_rate(self) -> float:
+        """Fraction of checked frames rejected."""
+        return self.rejected / self.checked if self.checked else 0.0
+
+    @property
+    def false_reject_rate(self) -> Optional[float]:
+        """Fraction of sampled rejects that held a symbol (None before any sample)."""
+        return self.false_rejects / self.sampled if self.sampled else None
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "checked": self.checked,
+            "rejected": self.rejected,
+            "reject_rate": self.reject_rate,
+            "sampled": self.sampled,
+            "false_rejects": self.false_rejects,
+            "false_reject_rate": self.false_reject_rate,
+        }
@@ -0,0 +1,159 @@
+"""GS1 Application Identifier parsing for Data Matrix and GS1-128 payloads."""
+
+import calendar
+import re
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from datamatrix_decoder.core.exceptions import GS1Error
+
+
+# Human-readable names for the AIs used in serialization
+GS1_NAMES = {
+    "00": "sscc",
+    "01": "gtin",
+    "02": "content",
+    "10": "lot",
+    "11": "prod_date",
+    "15": "best_before",
+    "17": "expiry",
+    "21": "serial",
+    "30": "count",
+    "240": "additional_id",
+    "400": "order_number",
+    "710": "nhrn_de",
+    "711": "nhrn_fr",
+    "712": "nhrn_es",
+    "713": "nhrn_br",
+    "714": "nhrn_pt",
+}
+
+# Number of AI digits, keyed by the first two digits
+_AI_DIGITS = {f"{prefix:02d}": 2 for prefix in range(0, 23)}
+_AI_DIGITS.update({prefix: 3 for prefix in ("23", "24", "25", "26", "40", "41", "42", "71")})
+_AI_DIGITS.update({prefix: 4 for prefix in ("31", "32", "33", "34", "35", "36", "39", "43", "70", "72", "80", "81", "82")})
+_AI_DIGITS.update({prefix: 2 for prefix in ("30", "37", "90", "91", "92", "93", "94", "95", "96", "97", "98", "99")})
+
+# Predefined data lengths; these AIs are never followed by a separator
+_FIXED_LENGTH = {"00": 18, "01": 14, "02": 14, "03": 14, "04": 16, "20": 2, "41": 13}
+_FIXED_LENGTH.update({f"{prefix}": 6 for prefix in range(11, 20)})
+_FIXED_LENGTH.update({f"{prefix}": 6 for prefix in range(31, 37)})
+
+_CHECK_DIGIT_AIS = ("00", "01", "02", "410", "411", "412", "413", "414")
+
+# GS (0x1D) and libdmtx's raw FNC1 codeword (232) both terminate variable fields
+_SEPARATORS = b"\x1d\xe8"
+_SEPARATOR = re.compile(rb"[\x1d\xe8]")
+_SYMBOLOGY_IDS = (b"]d2", b"]C1", b"]Q3", b"]e0", b"]J1")
+
+
+def _strip_identifier(payload: bytes) -> bytes:
+    for identifier in _SYMBOLOGY_IDS:
+        if payload.startswith(identifier):
+            return payload[len(identifier):]
+    return payload
+
+
+def check_digit_ok(digits: str) -> bool:
+    """Validate the GS1 mod-10 check digit of a GTIN/SSCC/GLN."""
+    if not digits.isdigit():
+        return False
+    total = sum(int(d) * (3 if i % 2 == 0 else 1) for i, d in enumerate(reversed(digits[:-1])))
+    return (10 - total % 10) % 10 == int(digits[-1])
+
+
+def parse_gs1(payload: Union[bytes, str], validate: bool = False) -> Dict[str, str]:
+    """Split a GS1 element string into ``{AI: value}``.
+
+    Symbology identifiers (``]d2``, ``]C1``...) and a leading FNC1 are
+    skipped. Works on raw bytes, so it can be fed ``DecodeResult.raw``
+    directly.
+
+    Args:
+        payload: Raw payload or text
+        validate: Also verify check digits of GTIN/SSCC/GLN fields
+
+    Raises:
+        GS1Error: If the payload is not a well-formed element string
+    """
+    if isinstance(payload, str):
+        payload = payload.encode("latin-1", "replace")
+    payload = _strip_identifier(payload)
+
+    elements: Dict[str, str] = {}
+    pos = 0
+    end = len(payload)
+    while pos < end:
+        if payload[pos] in _SEPARATORS:
+            pos += 1
+            continue
+        prefix = payload[pos:pos + 2].decode("ascii", "replace")
+        digits = _AI_DIGITS.get(prefix)
+        if digits is None:
+            raise GS1Error(f"Unknown application identifier at offset {pos}: {prefix!r}")
+        ai = payload[pos:pos + digits].decode("ascii", "replace")
+        if not ai.isdigit() or len(ai) != digits:
+            raise GS1Error(f"Truncated application identifier at offset {pos}")
+        pos += digits
+
+        length = _FIXED_LENGTH.get(prefix)
+        if length is not None:
+            stop = pos + length
+            if stop > end:
+                raise GS1Error(f"AI ({ai}) needs {length} characters")
+        else:
+            match = _SEPARATOR.search(payload, pos)
+            stop = match.start() if match else end
+        elements[ai] = payload[pos:stop].decode("latin-1")
+        pos = stop
+
+    if validate:
+        for ai in _CHECK_DIGIT_AIS:
+            if ai in elements and not check_digit_ok(elements[ai]):
+                raise GS1Error(f"Bad check digit in AI ({ai}): {elements[ai]}")
+    return elements
+
+
+def parse_gs1_batch(
+    payloads: Iterable[bytes], ais: Sequence[str] = ("01", "10", "17", "21")
+) -> Dict[str, List[Optional[str]]]:
+    """Parse many payloads into columns, one list per requested AI.
+
+    Pass ``ResultSet.iter_raw()`` to parse a whole batch without creating a
+    ``DecodeResult`` per row. Rows that are not valid GS1 get None in every
+    column.
+    """
+    columns: Dict[str, List[Optional[str]]] = {ai: [] for ai in ais}
+    appenders = [(ai, columns[ai].append) for ai in ais]
+    for payload in payloads:
+        try:
+            elements = parse_gs1(payload)
+        except GS1Error:
+            elements = {}
+        for ai, append in appenders:
+            append(elements.get(ai))
+    return columns
+
+
+def gs1_date(value: str, today: Optional[date] = None) -> date:
+    """Convert a GS1 ``YYMMDD`` date, applying the GS1 century rule.
+
+    A day of ``00`` means the last day of the month.
+    """
+    if len(value) != 6 or not value.isdigit():
+        raise GS1Error(f"Invalid GS1 date: {value!r}")
+    today = today or date.today()
+    yy, month, day = int(value[:2]), int(value[2:4]), int(value[4:])
+    century = today.year // 100 * 100
+    difference = yy - today.year % 100
+    if difference >= 51:
+        century -= 100
+    elif difference <= -50:
+        century += 100
+    year = century + yy
+    try:
+        if day == 0:
+            day = calendar.monthrange(year, month)[1]
+        return date(year, month, day)
+    except ValueError:
+        raise GS1Error(f"Invalid GS1 date: {value!r}")
@@ -0,0 +1,336 @@
+"""Durable job queue in one SQLite file, drained by competing worker processes.
+
+``enqueue`` adds image paths. Each worker repeatedly claims a few jobs
+under a lease, decodes them and records every outcome of the batch in one
+transaction. A worker that dies leaves its leases to expire; the next claim
+puts those jobs back in the queue, up to ``max_attempts`` tries. Throughput
+grows by starting more workers on the same file; there is no broker.
+
+The queue runs in WAL mode by default so workers read while one of them
+writes. WAL needs every process on the same host. For workers on several
+hosts sharing a network filesystem, open the queue with ``wal=False`` and
+make sure that filesystem's locking works.
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from datamatrix_decoder.core.autotune import fixed_workers
+from datamatrix_decoder.core.batch import DEFAULT_MAX_WORKERS
+from datamatrix_decoder.core.config import current_decoder
+from datamatrix_decoder.core.exceptions import ConfigurationError
+from datamatrix_decoder.core.models import BatchStats, DecodeResult
+
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    state TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    finished REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, lease_expires);
+CREATE TABLE IF NOT EXISTS results (
+    job_id INTEGER NOT NULL REFERENCES jobs (id),
+    data BLOB NOT NULL,
+    format TEXT NOT NULL,
+    rect TEXT,
+    elapsed REAL,
+    page INTEGER
+);
+CREATE INDEX IF NOT EXISTS results_job ON results (job_id);
+"""
+
+
+@dataclass(frozen=True)
+class Job:
+    """One claimed image."""
+
+    id: int
+    path: str
+    attempts: int
+
+
+class JobQueue:
+    """Connection to a queue file; one per process (or thread).
+
+    Args:
+        path: SQLite file, created on first use
+        lease: Seconds a claim stays valid; must exceed a worker's batch time
+        max_attempts: Tries per job before it is marked failed
+        wal: Use WAL journaling (all workers on one host); False switches
+            an existing WAL queue back to rollback journaling
+        timeout: Seconds to wait for another writer's lock
+        clock: Wall-clock source, shared by all workers (for tests)
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        lease: float = 300.0,
+        max_attempts: int = 3,
+        wal: bool = True,
+        timeout: float = 30.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        if lease <= 0 or max_attempts < 1:
+            raise ConfigurationError("lease must be positive and max_attempts at least 1")
+        self.path = str(path)
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.clock = clock
+        # Transactions are opened explicitly; see _transaction
+        self._db = sqlite3.connect(self.path, timeout=timeout, isolation_level=None)
+        # Persistent in the file, so a queue created in WAL mode must be switched back explicitly
+        journal = "wal" if wal else "delete"
+        try:
+            mode = self._db.execute(f"PRAGMA journal_mode={journal.upper()}").fetchone()[0]
+        except sqlite3.OperationalError as e:
+            # Leaving WAL needs the only connection to the file
+            mode = str(e)
+        if mode.lower() != journal:
+            self._db.close()
+            raise ConfigurationError(
+                f"Cannot put queue {self.path} in {journal} journal mode ({mode}); "
+                "close its other connections first"
+            )
+        if wal:
+            # Durable at every checkpoint; a power cut may lose the last few commits, never corrupt
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        with self._transaction() as db:
+            for statement in _SCHEMA.split(";"):
+                if statement.strip():
+                    db.execute(statement)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # IMMEDIATE takes the write lock up front, so two claims never pick the same rows
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._db
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    def enqueue(self, paths: Iterable[PathLike]) -> int:
+        """Add ``paths`` not already in the queue; return how many were added."""
+        with self._transaction() as db:
+            before = db.total_changes
+            db.executemany("INSERT OR IGNORE INTO jobs (path) VALUES (?)", ((str(p),) for p in paths))
+            return db.total_changes - before
+
+    def _expire(self, db: sqlite3.Connection, now: float) -> None:
+        """Return jobs whose lease ran out to the queue, or fail them once out of attempts."""
+        db.execute(
+            "UPDATE jobs SET state = ?, worker = NULL, lease_expires = NULL, finished = ?, error = 'lease expired' "
+            "WHERE state = ? AND lease_expires < ? AND attempts >= ?",
+            (FAILED, now, LEASED, now, self.max_attempts),
+        )
+        requeued = db.execute(
+            "UPDATE jobs SET state = ?, worker = NULL, lease_expires = NULL WHERE state = ? AND lease_expires < ?",
+            (QUEUED, LEASED, now),
+        ).rowcount
+        if requeued:
+            logger.warning(f"Re-queued {requeued} jobs with expired leases")
+
+    def claim(self, worker: str, limit: int = 1) -> List[Job]:
+        """Lease up to ``limit`` queued jobs to ``worker``, oldest first."""
+        now = self.clock()
+        with self._transaction() as db:
+            self._expire(db, now)
+            rows = db.execute(
+                "SELECT id, path, attempts FROM jobs WHERE state = ? ORDER BY id LIMIT ?", (QUEUED, limit)
+            ).fetchall()
+            db.executemany(
+                "UPDATE jobs SET state = ?, worker = ?, lease_expires = ?, attempts = attempts + 1 WHERE id = ?",
+                ((LEASED, worker, now + self.lease, job_id) for job_id, _, _ in rows),
+            )
+        return [Job(job_id, path, attempts + 1) for job_id, path, attempts in rows]
+
+    def renew(self, worker: str, jobs: Sequence[Job]) -> int:
+        """Extend ``worker``'s leases on ``jobs``; return how many it still held."""
+        with self._transaction() as db:
+            before = db.total_changes
+            db.executemany(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND state = ? AND worker = ?",
+                ((self.clock() + self.lease, job.id, LEASED, worker) for job in jobs),
+            )
+            return db.total_changes - before
+
+    def complete(self, worker: str, outcomes: Sequence[Tuple[Job, List[DecodeResult], Optional[str]]]) -> int:
+        """Record a batch of ``(job, results, error)`` outcomes in one transaction.
+
+        A job with an ``error`` goes back to the queue until it runs out of
+        attempts. Outcomes for leases ``worker`` no longer holds are dropped,
+        since the job has been handed to someone else.
+
+        Returns:
+            Number of outcomes recorded
+        """
+        now = self.clock()
+        recorded = 0
+        with self._transaction() as db:
+            for job, results, error in outcomes:
+                if error is None:
+                    state = DONE
+                else:
+                    state = FAILED if job.attempts >= self.max_attempts else QUEUED
+                updated = db.execute(
+                    "UPDATE jobs SET state = ?, worker = NULL, lease_expires = NULL, finished = ?, error = ? "
+                    "WHERE id = ? AND state = ? AND worker = ?",
+                    (state, now if state != QUEUED else None, error, job.id, LEASED, worker),
+                ).rowcount
+                if not updated:
+                    logger.warning(f"Lease on {job.path} lost; dropping its outcome")
+                    continue
+                recorded += 1
+                db.executemany(
+                    "INSERT INTO results (job_id, data, format, rect, elapsed, page) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        (
+                            job.id,
+                            result.raw,
+                            result.format,
+                            json.dumps(list(result.rect)) if result.rect is not None else None,
+                            result.elapsed,
+                            result.page,
+                        )
+                        for result in results
+                    ),
+                )
+        return recorded
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs in each state."""
+        counts = dict.fromkeys((QUEUED, LEASED, DONE, FAILED), 0)
+        counts.update(self._db.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+        return counts
+
+    def failures(self) -> List[Tuple[str, str]]:
+        """``(path, error)`` of every job that ran out of attempts."""
+        return self._db.execute("SELECT path, error FROM jobs WHERE state = ? ORDER BY id", (FAILED,)).fetchall()
+
+    def results(self) -> Iterator[DecodeResult]:
+        """Every recorded result, in job order, with ``filename`` set to the job's path."""
+        rows = self._db.execute(
+            "SELECT jobs.path, data, format, rect, elapsed, page FROM results "
+            "JOIN jobs ON jobs.id = results.job_id ORDER BY results.job_id, results.rowid"
+        )
+        for path, data, format, rect, elapsed, page in rows:
+            yield DecodeResult(
+                raw=bytes(data),
+                format=format,
+                rect=json.loads(rect) if rect is not None else None,
+                filename=path,
+                elapsed=elapsed,
+                page=page,
+            )
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "JobQueue":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def worker_name() -> str:
+    """Default worker label: ``host:pid``."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def run_worker(
+    decoder,
+    queue: JobQueue,
+    worker: Optional[str] = None,
+    max_workers: Union[int, str] = DEFAULT_MAX_WORKERS,
+    batch_size: Optional[int] = None,
+    poll_interval: float = 1.0,
+    exit_when_empty: bool = False,
+    stop: Optional[threading.Event] = None,
+    stats: Optional[BatchStats] = None,
+) -> BatchStats:
+    """Claim, decode and record jobs until ``stop`` is set (or the queue is empty).
+
+    Leases of the claimed batch are renewed every half lease while it
+    decodes, so only a dead worker's jobs expire.
+
+    Args:
+        decoder: DataMatrixDecoder or BarcodeDecoder, or a callable returning
+            the decoder for each batch (e.g. ``config.ReloadingDecoder``)
+        queue: This process's connection to the queue
+        worker: Label the leases are taken under (default ``host:pid``)
+        max_workers: Images decoded in parallel (``"auto"`` = CPU count)
+        batch_size: Jobs claimed, and recorded, per transaction (default
+            twice the worker count)
+        poll_interval: Seconds to wait when the queue is empty
+        exit_when_empty: Return once no job is queued or leased
+        stop: Event ending the loop after the current batch
+        stats: Optional BatchStats updated as batches complete
+
+    Returns:
+        The BatchStats for this worker
+    """
+    worker = worker or worker_name()
+    workers = fixed_workers(max_workers)
+    batch_size = batch_size or 2 * workers
+    stop = stop or threading.Event()
+    stats = stats if stats is not None else BatchStats()
+    started = time.perf_counter()
+
+    def process(active, job: Job) -> Tuple[Job, List[DecodeResult], Optional[str]]:
+        try:
+            found = active.decode_image(job.path)
+        except Exception as e:
+            logger.error(f"Queue decode error for {job.path}: {e}")
+            return job, [], str(e) or type(e).__name__
+        return job, found if isinstance(found, list) else [found] if found else [], None
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while not stop.is_set():
+            jobs = queue.claim(worker, batch_size)
+            if not jobs:
+                counts = queue.counts()
+                if exit_when_empty and not counts[QUEUED] and not counts[LEASED]:
+                    break
+                stop.wait(poll_interval)
+                continue
+            active = current_decoder(decoder)
+            futures = [executor.submit(process, active, job) for job in jobs]
+            # Keep the leases alive while slow images are still decoding
+            while wait(futures, timeout=queue.lease / 2).not_done:
+                queue.renew(worker, jobs)
+            outcomes = [future.result() for future in futures]
+            queue.complete(worker, outcomes)
+            stats.total += len(outcomes)
+            stats.decoded += sum(1 for _, found, _ in outcomes if found)
+            stats.failed += sum(1 for _, found, _ in outcomes if not found)
+
+    stats.elapsed += time.perf_counter() - started
+    return stats
@@ -0,0 +1,214 @@
+"""Fixed-zone decoding for documents whose symbols sit in known places.
+
+A layout template names the zones of a form as rectangles normalized to
+the page, each with the formats expected there. Only those crops are
+searched, in parallel, and a full-page search runs only when a zone comes
+up empty.
+
+Example template::
+
+    name: shipping-form
+    zones:
+      - name: tracking
+        box: [0.60, 0.04, 0.96, 0.18]   # left, top, right, bottom
+        formats: [code128]
+      - name: certificate
+        box: [0.05, 0.80, 0.25, 0.97]
+        formats: [datamatrix]
+        symbol_size: 0.12
+"""
+
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import yaml
+from PIL import Image
+
+from datamatrix_decoder.core.exceptions import ConfigurationError
+from datamatrix_decoder.core.models import DecodeResult
+from datamatrix_decoder.core.tiling import Box, _bounds, offset_rects
+
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+# libdmtx measures a rect's top from the bottom edge, zbar from the top
+BOTTOM_ORIGIN_FORMATS = frozenset({"datamatrix"})
+
+
+@dataclass(frozen=True)
+class Zone:
+    """One named region of a layout.
+
+    Attributes:
+        name: Key of the zone's results
+        box: ``(left, top, right, bottom)`` as fractions of the page size
+        formats: Formats expected in the zone (None = any)
+        symbol_size: Expected symbol edge as a fraction of the page's
+            shorter side; the crop is padded by half of it so a symbol
+            printed slightly off the zone is still whole
+    """
+
+    name: str
+    box: Tuple[float, float, float, float]
+    formats: Optional[Tuple[str, ...]] = None
+    symbol_size: Optional[float] = None
+
+    def accepts(self, fmt: str) -> bool:
+        """True if ``fmt`` is expected in this zone."""
+        return self.formats is None or fmt in self.formats
+
+    def pixel_box(self, size: Tuple[int, int]) -> Box:
+        """The zone's padded crop box on a page of ``size`` pixels."""
+        width, height = size
+        pad = (self.symbol_size or 0.0) * min(width, height) / 2
+        left, top, right, bottom = self.box
+        return (
+            max(0, int(left * width - pad)),
+            max(0, int(top * height - pad)),
+            min(width, math.ceil(right * width + pad)),
+            min(height, math.ceil(bottom * height + pad)),
+        )
+
+
+@dataclass(frozen=True)
+class Layout:
+    """Named set of zones for one document type."""
+
+    name: str
+    zones: Tuple[Zone, ...]
+
+
+def _parse_zone(raw: Any, layout: str) -> Zone:
+    from datamatrix_decoder.core.decoder import BarcodeDecoder
+
+    if not isinstance(raw, dict) or "name" not in raw or "box" not in raw:
+        raise ConfigurationError(f"Layout {layout}: each zone needs a name and a box")
+    name = str(raw["name"])
+    unknown = set(raw) - {"name", "box", "formats", "symbol_size"}
+    if unknown:
+        raise ConfigurationError(f"Layout {layout}, zone {name}: unknown keys {sorted(unknown)}")
+    box = raw["box"]
+    if (
+        not isinstance(box, list)
+        or len(box) != 4
+        or not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in box)
+    ):
+        raise ConfigurationError(f"Layout {layout}, zone {name}: box must be [left, top, right, bottom]")
+    left, top, right, bottom = (float(value) for value in box)
+    if not (0 <= left < right <= 1 and 0 <= top < bottom <= 1):
+        raise ConfigurationError(f"Layout {layout}, zone {name}: box must lie within [0, 1] with left < right, top < bottom")
+    formats = raw.get("formats")
+    if formats is not None:
+        if not isinstance(formats, list):
+            raise ConfigurationError(f"Layout {layout}, zone {name}: formats must be a list")
+        unsupported = [fmt for fmt in formats if fmt not in BarcodeDecoder.SUPPORTED_FORMATS]
+        if unsupported:
+            raise ConfigurationError(f"Layout {layout}, zone {name}: unsupported formats {unsupported}")
+        formats = tuple(formats)
+    symbol_size = raw.get("symbol_size")
+    if symbol_size is not None and (
+        isinstance(symbol_size, bool) or not isinstance(symbol_size, (int, float)) or not 0 < symbol_size <= 1
+    ):
+        raise ConfigurationError(f"Layout {layout}, zone {name}: symbol_size must be in (0, 1]")
+    return Zone(name, (left, top, right, bottom), formats, None if symbol_size is None else float(symbol_size))
+
+
+def parse_layout(raw: Optional[Dict[str, Any]], default_name: str = "layout") -> Layout:
+    """Build a Layout from an already-loaded YAML document."""
+    if not isinstance(raw, dict):
+        raise ConfigurationError("Layout must be a mapping with a zones list")
+    name = str(raw.get("name", default_name))
+    zones = raw.get("zones")
+    if not isinstance(zones, list) or not zones:
+        raise ConfigurationError(f"Layout {name}: zones must be a non-empty list")
+    parsed = tuple(_parse_zone(zone, name) for zone in zones)
+    names = [zone.name for zone in parsed]
+    if len(set(names)) != len(names):
+        raise ConfigurationError(f"Layout {name}: zone names must be unique")
+    return Layout(name, parsed)
+
+
+def load_layout(path: PathLike) -> Layout:
+    """Load a layout template from a YAML file.
+
+    Raises:
+        ConfigurationError: If the file cannot be read or is invalid
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = yaml.safe_load(f)
+    except (OSError, yaml.YAMLError) as e:
+        raise ConfigurationError(f"Cannot load layout {path}: {e}")
+    return parse_layout(raw, default_name=Path(path).stem)
+
+
+def _nearest(zones: List[Zone], result: DecodeResult, size: Tuple[int, int]) -> Optional[Zone]:
+    """The zone expecting ``result``'s format whose centre is closest to the symbol."""
+    candidates = [zone for zone in zones if zone.accepts(result.format)]
+    if not candidates or result.rect is None:
+        return candidates[0] if candidates else None
+    width, height = size
+    left, top, right, bottom = _bounds(result.rect)
+    x, y = (left + right) / 2 / width, (top + bottom) / 2 / height
+    if result.format in BOTTOM_ORIGIN_FORMATS:
+        y = 1 - y
+    return min(
+        candidates,
+        key=lambda zone: ((zone.box[0] + zone.box[2]) / 2 - x) ** 2 + ((zone.box[1] + zone.box[3]) / 2 - y) ** 2,
+    )
+
+
+def decode_layout(
+    image: Image.Image,
+    layout: Layout,
+    scan: Callable[[Image.Image, Zone], List[DecodeResult]],
+    page_scan: Optional[Callable[[Image.Image, List[Zone]], List[DecodeResult]]] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, List[DecodeResult]]:
+    """Scan the zones of ``layout`` on ``image`` in parallel.
+
+    Zones that come up empty share one ``page_scan`` of the whole image.
+    Each symbol it finds that no zone already holds goes to the nearest
+    empty zone expecting that format. Symbols no zone expects are dropped.
+
+    Args:
+        image: Loaded page image
+        layout: Zones to scan
+        scan: Callable decoding one zone crop, returning rects in crop coordinates
+        page_scan: Optional full-page fallback, given the page and the
+            empty zones so it can skip engines none of them needs
+            (None = no fallback)
+        max_workers: Parallel zones (None = one per zone)
+
+    Returns:
+        Results keyed by zone name, rects in page coordinates
+    """
+    size = image.size
+
+    def scan_zone(zone: Zone) -> List[DecodeResult]:
+        box = zone.pixel_box(size)
+        found = scan(image.crop(box), zone)
+        for result in found:
+            offset_rects([result], box, size[1], result.format in BOTTOM_ORIGIN_FORMATS)
+        return found
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(layout.zones)) as executor:
+        found = dict(zip((zone.name for zone in layout.zones), executor.map(scan_zone, layout.zones)))
+
+    missed = [zone for zone in layout.zones if not found[zone.name]]
+    if missed and page_scan is not None:
+        logger.info(f"Layout {layout.name}: {len(missed)} empty zones, searching the full page")
+        seen = {(result.format, result.raw) for results in found.values() for result in results}
+        for result in page_scan(image, missed):
+            if (result.format, result.raw) in seen:
+                continue
+            zone = _nearest(missed, result, size)
+            if zone is not None:
+                found[zone.name].append(result)
+    return found
@@ -1,9 +1,162 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+Rect = Tuple[int, int, int, int]
+
+
+def decode_payload(raw: bytes) -> str:
+    """Decode a symbol payload to text.
+
+    UTF-8 is tried first; anything else falls back to ISO 8859-1, the
+    Data Matrix default character set, which maps every byte so binary and
+    FNC1-bearing payloads never fail to decode.
+    """
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return raw.decode("latin-1")
+
 
-@dataclass
 class DecodeResult:
-    data: str
-    format: str
+    """Result from barcode/Data Matrix decoding.
+
+    Uses ``__slots__`` rather than a dataclass so large batches do not pay
+    for a per-instance ``__dict__``. The payload is kept as raw bytes and
+    only decoded to text when ``data`` is first read.
+
+    Attributes:
+        raw: Payload bytes exactly as returned by the engine
+        data: Payload text (see ``decode_payload``)
+        format: Symbology name, e.g. ``"datamatrix"`` or ``"code128"``
+        rect: Bounding box as ``(left, top, width, height)``
+        filename: Source image
+        elapsed: Seconds spent decoding the source image
+        page: Frame/page index within the source, if it has several
+    """
+
+    __slots__ = ("raw", "_text", "format", "rect", "filename", "elapsed", "page")
+
+    _FIELDS = ("raw", "format", "rect", "filename", "elapsed", "page")
+
+    def __init__(
+        self,
+        data: Optional[str] = None,
+        format: str = "",
+        rect: Optional[Rect] = None,
+        filename: Optional[str] = None,
+        elapsed: Optional[float] = None,
+        page: Optional[int] = None,
+        raw: Optional[bytes] = None,
+    ):
+        if raw is None:
+            raw = (data or "").encode("utf-8")
+        self.raw = raw
+        self._text = data
+        self.format = format
+        self.rect = tuple(rect) if rect is not None else None
+        self.filename = filename
+        self.elapsed = elapsed
+        self.page = page
+
+    @property
+    def data(self) -> str:
+        if self._text is None:
+            self._text = decode_payload(self.raw)
+        return self._text
+
+    @data.setter
+    def data(self, value: str) -> None:
+        self._text = value
+        self.raw = value.encode("utf-8")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, DecodeResult):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._FIELDS)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in ("data",) + self._FIELDS[1:])
+        return f"DecodeResult({fields})"
+
+    def __str__(self) -> str:
+        return f"{self.format.upper()}: {self.data}"
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "data": self.data,
+            "format": self.format,
+            "rect": list(self.rect) if self.rect is not None else None,
+            "filename": self.filename,
+            "elapsed": self.elapsed,
+            "page": self.page,
+        }
+
+
+@dataclass(frozen=True)
+class DecodeTier:
+    """Decode settings applied during one pass of a tiered batch.
+
+    Attributes:
+        name: Label used when reporting per-tier counts
+        timeout: Per-image timeout in seconds (None = decoder default)
+        scale: Resolution factor applied before decoding (0.5 = half size)
+        variants: Preprocessing variants tried in order until one decodes
+    """
+
+    name: str
+    timeout: Optional[float] = None
+    scale: float = 1.0
+    variants: Tuple[str, ...] = ("original",)
+
+
+@dataclass
+class ImageCost:
+    """Estimated decode cost (megasamples) against measured seconds for one image."""
+
+    filename: str
+    estimated: float
+    actual: float = 0.0
+
+
+@dataclass
+class BatchStats:
+    """Counters collected while a batch runs."""
+
+    total: int = 0
+    decoded: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    tier_attempts: Dict[str, int] = field(default_factory=dict)
+    tier_successes: Dict[str, int] = field(default_factory=dict)
+    costs: List[ImageCost] = field(default_factory=list)
+    peak_pixel_bytes: int = 0
+    peak_rss: Optional[int] = None
+    timed_out: List[str] = field(default_factory=list)
+    quarantined: List[str] = field(default_factory=list)
+    workers: Optional[int] = None
+    io_wait: float = 0.0
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "total": self.total,
+            "decoded": self.decoded,
+            "failed": self.failed,
+            "elapsed": self.elapsed,
+            "tier_attempts": dict(self.tier_attempts),
+            "tier_successes": dict(self.tier_successes),
+            "costs": [
+                {"filename": c.filename, "estimated": c.estimated, "actual": c.actual}
+                for c in self.costs
+            ],
+            "peak_pixel_bytes": self.peak_pixel_bytes,
+            "peak_rss": self.peak_rss,
+            "timed_out": list(self.timed_out),
+            "quarantined": list(self.quarantined),
+            "workers": self.workers,
+            "io_wait": self.io_wait,
+        }
 
 
 # DRY: Single source of truth for data models
@@ -13,4 +166,3 @@ class DecodeResult:
 
 
 # Models are simple and focused
-
@@ -0,0 +1,155 @@
+"""Read-ahead of image files on dedicated I/O threads.
+
+On network storage a decode worker that opens its own file spends much of
+its time blocked on the read. ``Prefetcher`` reads the files of a batch in
+order, on its own threads and ahead of the decoders, into a buffer capped
+in bytes, so decode workers pick up file contents that are already in
+memory.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Deque, Dict, Iterable, Tuple, Union
+
+from datamatrix_decoder.core.exceptions import ConfigurationError
+
+PathLike = Union[str, Path]
+
+DEFAULT_IO_WORKERS = 4
+DEFAULT_PREFETCH_BYTES = 64 * 2**20
+
+# Large reads keep NFS and disks streaming instead of issuing many small requests
+READ_CHUNK = 4 * 2**20
+
+
+def read_file(path: PathLike, chunk_size: int = READ_CHUNK) -> bytearray:
+    """Read a whole file with large sequential reads.
+
+    Where ``posix_fadvise`` exists the kernel is told the file is read once,
+    front to back, so it can read ahead aggressively.
+    """
+    with open(path, "rb", buffering=0) as f:
+        fd = f.fileno()
+        size = os.fstat(fd).st_size
+        if hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            except OSError:
+                pass
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        offset = 0
+        while offset < size:
+            count = f.readinto(view[offset:offset + chunk_size])
+            if not count:
+                break
+            offset += count
+        view.release()
+    # Returned as is: copying into ``bytes`` would double the peak memory
+    del buffer[offset:]
+    return buffer
+
+
+class Prefetcher:
+    """Reads ``paths`` ahead of the decode workers into a bounded buffer.
+
+    A feeder thread walks ``paths`` in order and hands each file to one of
+    ``io_workers`` reader threads as long as the bytes read but not yet
+    taken stay under ``max_bytes`` (a larger file is read once the buffer
+    is empty). Decode workers call ``take(path)`` in roughly the same order.
+
+    Args:
+        paths: Files in the order they will be taken
+        io_workers: Concurrent reads
+        max_bytes: Cap on file bytes read ahead and not yet taken
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[PathLike],
+        io_workers: int = DEFAULT_IO_WORKERS,
+        max_bytes: int = DEFAULT_PREFETCH_BYTES,
+    ):
+        if io_workers < 1:
+            raise ConfigurationError("prefetch needs at least one I/O worker")
+        if max_bytes <= 0:
+            raise ConfigurationError("prefetch buffer must be positive")
+        self.max_bytes = max_bytes
+        self.peak_bytes = 0
+        self.wait_seconds = 0.0
+        self._condition = threading.Condition()
+        self._ready: Dict[str, Deque[Tuple[Future, int]]] = {}
+        self._buffered = 0
+        self._closed = False
+        self._fed = False
+        self._executor = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="prefetch")
+        self._feeder = threading.Thread(target=self._feed, args=(list(paths),), name="prefetch-feeder", daemon=True)
+        self._feeder.start()
+
+    def _feed(self, paths) -> None:
+        try:
+            for path in paths:
+                try:
+                    size = os.stat(path).st_size
+                except OSError:
+                    # The read fails too and take() reports it
+                    size = 0
+                with self._condition:
+                    while not self._closed and self._buffered and self._buffered + size > self.max_bytes:
+                        self._condition.wait()
+                    if self._closed:
+                        return
+                    self._buffered += size
+                    self.peak_bytes = max(self.peak_bytes, self._buffered)
+                    future = self._executor.submit(read_file, path)
+                    self._ready.setdefault(str(path), deque()).append((future, size))
+                    self._condition.notify_all()
+        finally:
+            with self._condition:
+                self._fed = True
+                self._condition.notify_all()
+
+    def take(self, path: PathLike) -> bytearray:
+        """Contents of ``path``, waiting for its read if needed.
+
+        Paths outside the prefetched list are read directly.
+
+        Raises:
+            OSError: If the file could not be read
+        """
+        key = str(path)
+        started = time.perf_counter()
+        with self._condition:
+            while not self._ready.get(key) and not self._fed:
+                self._condition.wait()
+            queue = self._ready.get(key)
+            entry = queue.popleft() if queue else None
+        if entry is None:
+            return read_file(path)
+        future, size = entry
+        try:
+            return future.result()
+        finally:
+            with self._condition:
+                self._buffered -= size
+                self.wait_seconds += time.perf_counter() - started
+                self._condition.notify_all()
+
+    def close(self) -> None:
+        """Stop reading ahead and drop reads not started yet."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._feeder.join()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "Prefetcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
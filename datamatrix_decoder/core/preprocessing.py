@@ -0,0 +1,127 @@
+"""Image preprocessing variants applied before decoding."""
+
+from typing import Callable, Dict, Optional
+
+from PIL import Image, ImageFilter, ImageOps
+
+from datamatrix_decoder.core.exceptions import ConfigurationError
+
+
+def _grayscale(image: Image.Image) -> Image.Image:
+    return image if image.mode == "L" else image.convert("L")
+
+
+VARIANTS: Dict[str, Callable[[Image.Image], Image.Image]] = {
+    "original": lambda image: image,
+    "grayscale": _grayscale,
+    "autocontrast": lambda image: ImageOps.autocontrast(_grayscale(image), cutoff=1),
+    "equalize": lambda image: ImageOps.equalize(_grayscale(image)),
+    "sharpen": lambda image: _grayscale(image).filter(ImageFilter.SHARPEN),
+    "invert": lambda image: ImageOps.invert(_grayscale(image)),
+}
+
+
+def apply_variant(image: Image.Image, name: str) -> Image.Image:
+    """Return ``image`` transformed by the named preprocessing variant.
+
+    Args:
+        image: Source image
+        name: One of the keys of ``VARIANTS``
+
+    Raises:
+        ConfigurationError: If the variant is unknown
+    """
+    try:
+        transform = VARIANTS[name]
+    except KeyError:
+        raise ConfigurationError(f"Unknown preprocessing variant: {name}")
+    return transform(image)
+
+
+def rescale(image: Image.Image, scale: float) -> Image.Image:
+    """Resize ``image`` by ``scale``, using the cheap box reducer for integer factors."""
+    if scale == 1.0:
+        return image
+    factor = 1.0 / scale
+    if scale < 1.0 and factor.is_integer():
+        return image.reduce(int(factor))
+    width, height = image.size
+    return image.resize((max(1, round(width * scale)), max(1, round(height * scale))))
+
+
+# Reductions libjpeg can apply while decoding, by skipping DCT coefficients
+DRAFT_SCALES = (0.5, 0.25, 0.125)
+
+
+def validate_draft_scale(scale: Optional[float]) -> Optional[float]:
+    """Return ``scale`` if it is None or one of ``DRAFT_SCALES``."""
+    if scale is not None and scale not in DRAFT_SCALES:
+        raise ConfigurationError(f"draft_scale must be one of {DRAFT_SCALES}")
+    return scale
+
+
+def draft_jpeg(image: Image.Image, scale: float) -> float:
+    """Have the JPEG decoder load ``image`` reduced towards ``scale``, in grayscale.
+
+    Must be called before the pixels are loaded. libjpeg only reduces by
+    1/2, 1/4 or 1/8 and never below the requested size, so the scale
+    actually applied is returned; it is 1.0 for anything but JPEG.
+    """
+    if image.format != "JPEG" or scale >= 1.0:
+        return 1.0
+    width, height = image.size
+    image.draft("L", (max(1, int(width * scale)), max(1, int(height * scale))))
+    return image.size[0] / width
+
+
+def as_image(frame) -> Image.Image:
+    """Wrap a uint8 NumPy frame as a PIL image, sharing its memory where PIL allows.
+
+    2-D arrays become ``L`` images and ``(H, W, 3|4)`` arrays ``RGB``/``RGBA``.
+    PIL images are returned unchanged.
+    """
+    if isinstance(frame, Image.Image):
+        return frame
+    if str(frame.dtype) != "uint8":
+        raise ConfigurationError(f"Frames must be uint8, got {frame.dtype}")
+    if frame.ndim == 3 and frame.shape[2] == 1:
+        frame = frame[:, :, 0]
+    if frame.ndim == 2:
+        mode = "L"
+    elif frame.ndim == 3 and frame.shape[2] in (3, 4):
+        mode = "RGB" if frame.shape[2] == 3 else "RGBA"
+    else:
+        raise ConfigurationError(f"Unsupported frame shape {frame.shape}")
+    pixel_bytes = 1 if mode == "L" else frame.shape[2]
+    # PIL can share rows at any positive pitch, but pixels must be packed
+    if frame.strides[0] <= 0 or frame.strides[1] != pixel_bytes or frame.strides[-1] != 1:
+        frame = frame.copy()
+    height, width = frame.shape[:2]
+    buffer = frame if frame.flags.c_contiguous else _padded_rows(frame)
+    if buffer is None:
+        frame = frame.copy()
+        buffer = frame
+    return Image.frombuffer(mode, (width, height), buffer, "raw", mode, frame.strides[0], 1)
+
+
+def _padded_rows(frame):
+    """Flat view over ``frame``'s rows including their padding, or None.
+
+    Row-padded frames (e.g. raw camera buffers with a stride) are not
+    contiguous, so they cannot be handed to PIL as-is. When the padding
+    after the last row still lies inside the parent buffer, a flat view
+    over ``height * stride`` bytes lets PIL read them without a copy.
+    """
+    import numpy as np
+    from numpy.lib.stride_tricks import as_strided
+
+    root = frame
+    while isinstance(root.base, np.ndarray):
+        root = root.base
+    if not root.flags.c_contiguous:
+        return None
+    span = frame.strides[0] * frame.shape[0]
+    start = frame.__array_interface__["data"][0]
+    if start + span > root.__array_interface__["data"][0] + root.nbytes:
+        return None
+    return as_strided(frame, shape=(span,), strides=(1,), writeable=False)
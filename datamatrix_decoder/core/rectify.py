@@ -0,0 +1,229 @@
+"""Lens undistortion and perspective rectification with cached remap tables.
+
+Wide-angle cameras give barrel-distorted, oblique views of the symbols,
+which libdmtx struggles with near the edges. ``Rectifier`` folds a camera's
+undistortion and an optional homography into one pair of lookup maps,
+built once per frame resolution (and region of interest). Each frame then
+costs a single ``cv2.remap`` pass.
+
+Calibration file example::
+
+    cameras:
+      line-3:
+        size: [1920, 1080]            # resolution the calibration was made at
+        camera_matrix: [[1400, 0, 960], [0, 1400, 540], [0, 0, 1]]
+        dist_coeffs: [-0.31, 0.12, 0, 0, -0.02]
+        homography: [[1.1, 0.05, -40], [0.02, 1.2, -60], [0, 0.0001, 1]]
+        output_size: [1600, 900]
+"""
+
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+import yaml
+from PIL import Image
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+from datamatrix_decoder.core.exceptions import ConfigurationError
+
+
+PathLike = Union[str, Path]
+Size = Tuple[int, int]
+Roi = Tuple[int, int, int, int]
+
+# Pixels mapped from outside the source frame; white keeps the quiet zone clean
+BORDER_VALUE = 255
+
+# PIL modes whose arrays are pixel intensities cv2.remap accepts
+REMAP_MODES = ("L", "RGB", "RGBA")
+
+
+@dataclass(frozen=True)
+class CameraCalibration:
+    """Intrinsics, distortion and optional rectifying homography of one camera.
+
+    Attributes:
+        name: Camera label
+        size: ``(width, height)`` the calibration was made at
+        camera_matrix: 3x3 intrinsic matrix
+        dist_coeffs: OpenCV distortion coefficients ``(k1, k2, p1, p2[, k3...])``
+        homography: Optional 3x3 map from undistorted to rectified pixels
+        output_size: Rectified ``(width, height)`` (default ``size``)
+    """
+
+    name: str
+    size: Size
+    camera_matrix: Tuple[Tuple[float, ...], ...]
+    dist_coeffs: Tuple[float, ...] = ()
+    homography: Optional[Tuple[Tuple[float, ...], ...]] = None
+    output_size: Optional[Size] = None
+
+    def scaled(self, size: Size) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray], Size]:
+        """``(camera_matrix, dist_coeffs, homography, output_size)`` for frames of ``size``.
+
+        Calibrations transfer between resolutions of the same sensor (e.g.
+        binned or draft-loaded frames) by scaling the pixel axes.
+        """
+        sx, sy = size[0] / self.size[0], size[1] / self.size[1]
+        scale = np.diag([sx, sy, 1.0])
+        camera_matrix = scale @ np.array(self.camera_matrix, dtype=np.float64)
+        homography = None
+        if self.homography is not None:
+            homography = scale @ np.array(self.homography, dtype=np.float64) @ np.linalg.inv(scale)
+        width, height = self.output_size or self.size
+        return (
+            camera_matrix,
+            np.array(self.dist_coeffs, dtype=np.float64),
+            homography,
+            (max(1, round(width * sx)), max(1, round(height * sy))),
+        )
+
+
+class Rectifier:
+    """Applies one camera's correction through remap tables cached per resolution.
+
+    Thread-safe; tables are built on first use for each ``(size, roi)``.
+    Pickling drops the tables, so each process of a pool builds its own.
+
+    Args:
+        calibration: The camera's calibration
+        interpolation: ``cv2`` interpolation flag (default bilinear)
+    """
+
+    def __init__(self, calibration: CameraCalibration, interpolation: Optional[int] = None):
+        if cv2 is None:
+            raise ImportError("opencv-python is required. Install: pip install opencv-python")
+        self.calibration = calibration
+        self.interpolation = cv2.INTER_LINEAR if interpolation is None else interpolation
+        self._maps: Dict[Tuple[Size, Optional[Roi]], Tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"], state["_maps"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._maps = {}
+        self._lock = threading.Lock()
+
+    def _build(self, size: Size, roi: Optional[Roi]) -> Tuple[np.ndarray, np.ndarray]:
+        camera_matrix, dist_coeffs, homography, output_size = self.calibration.scaled(size)
+        # For every undistorted pixel, where to sample the distorted frame
+        map_x, map_y = cv2.initUndistortRectifyMap(
+            camera_matrix, dist_coeffs, None, camera_matrix, size, cv2.CV_32FC1
+        )
+        if homography is not None:
+            # Warping the maps themselves composes both corrections into one table
+            map_x = cv2.warpPerspective(map_x, homography, output_size, flags=cv2.INTER_LINEAR, borderValue=-1)
+            map_y = cv2.warpPerspective(map_y, homography, output_size, flags=cv2.INTER_LINEAR, borderValue=-1)
+        if roi is not None:
+            left, top, right, bottom = roi
+            map_x, map_y = map_x[top:bottom, left:right], map_y[top:bottom, left:right]
+        # Fixed-point maps remap noticeably faster than float ones
+        return cv2.convertMaps(np.ascontiguousarray(map_x), np.ascontiguousarray(map_y), cv2.CV_16SC2)
+
+    def maps(self, size: Size, roi: Optional[Roi] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """The remap tables for frames of ``size``, restricted to ``roi`` of the output."""
+        key = (tuple(size), tuple(roi) if roi is not None else None)
+        with self._lock:
+            maps = self._maps.get(key)
+        if maps is None:
+            maps = self._build(key[0], key[1])
+            with self._lock:
+                maps = self._maps.setdefault(key, maps)
+        return maps
+
+    def apply(self, frame, roi: Optional[Roi] = None) -> np.ndarray:
+        """Undistorted, rectified copy of a PIL image or NumPy frame.
+
+        Args:
+            frame: Distorted frame
+            roi: Optional ``(left, top, right, bottom)`` of the rectified
+                output; only that region is computed
+        """
+        if isinstance(frame, Image.Image) and frame.mode not in REMAP_MODES:
+            # Palette indices and bilevel bools are not intensities
+            frame = frame.convert("L")
+        pixels = np.asarray(frame)
+        height, width = pixels.shape[:2]
+        first, second = self.maps((width, height), roi)
+        border = (BORDER_VALUE,) * (pixels.shape[2] if pixels.ndim == 3 else 1)
+        return cv2.remap(
+            pixels, first, second, self.interpolation, borderMode=cv2.BORDER_CONSTANT, borderValue=border
+        )
+
+    def clear(self) -> None:
+        """Drop every cached table."""
+        with self._lock:
+            self._maps.clear()
+
+
+def _matrix(value: Any, rows: int, key: str, camera: str) -> Tuple[Tuple[float, ...], ...]:
+    try:
+        matrix = np.array(value, dtype=np.float64)
+    except (TypeError, ValueError):
+        matrix = None
+    if matrix is None or matrix.shape != (rows, 3):
+        raise ConfigurationError(f"Camera {camera}: {key} must be a {rows}x3 matrix")
+    return tuple(tuple(row) for row in matrix.tolist())
+
+
+def _size(value: Any, key: str, camera: str) -> Size:
+    if (
+        not isinstance(value, list)
+        or len(value) != 2
+        or not all(isinstance(v, int) and not isinstance(v, bool) and v > 0 for v in value)
+    ):
+        raise ConfigurationError(f"Camera {camera}: {key} must be [width, height]")
+    return tuple(value)
+
+
+def parse_calibrations(raw: Optional[Dict[str, Any]]) -> Dict[str, CameraCalibration]:
+    """Build calibrations from an already-loaded YAML document with a ``cameras`` mapping."""
+    cameras = (raw or {}).get("cameras")
+    if not isinstance(cameras, dict) or not cameras:
+        raise ConfigurationError("Calibration file needs a non-empty cameras mapping")
+    calibrations = {}
+    for name, entry in cameras.items():
+        if not isinstance(entry, dict):
+            raise ConfigurationError(f"Camera {name} must be a mapping")
+        unknown = set(entry) - {"size", "camera_matrix", "dist_coeffs", "homography", "output_size"}
+        if unknown:
+            raise ConfigurationError(f"Camera {name}: unknown keys {sorted(unknown)}")
+        if "size" not in entry or "camera_matrix" not in entry:
+            raise ConfigurationError(f"Camera {name}: size and camera_matrix are required")
+        coeffs = entry.get("dist_coeffs") or []
+        if not isinstance(coeffs, list) or len(coeffs) not in (0, 4, 5, 8, 12, 14):
+            raise ConfigurationError(f"Camera {name}: dist_coeffs must have 4, 5, 8, 12 or 14 values")
+        calibrations[name] = CameraCalibration(
+            name=str(name),
+            size=_size(entry["size"], "size", name),
+            camera_matrix=_matrix(entry["camera_matrix"], 3, "camera_matrix", name),
+            dist_coeffs=tuple(float(c) for c in coeffs),
+            homography=_matrix(entry["homography"], 3, "homography", name) if entry.get("homography") else None,
+            output_size=_size(entry["output_size"], "output_size", name) if entry.get("output_size") else None,
+        )
+    return calibrations
+
+
+def load_calibrations(path: PathLike) -> Dict[str, CameraCalibration]:
+    """Load per-camera calibrations from a YAML file.
+
+    Raises:
+        ConfigurationError: If the file cannot be read or is invalid
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = yaml.safe_load(f)
+    except (OSError, yaml.YAMLError) as e:
+        raise ConfigurationError(f"Cannot load calibrations {path}: {e}")
+    return parse_calibrations(raw)
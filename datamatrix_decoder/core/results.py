@@ -0,0 +1,242 @@
+"""Columnar container for large numbers of decode results."""
+
+import base64
+import csv
+from array import array
+from itertools import compress
+from json.encoder import encode_basestring_ascii as _quote
+from typing import IO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from datamatrix_decoder.core.models import DecodeResult, decode_payload
+
+
+CSV_COLUMNS = ("data", "format", "left", "top", "width", "height", "filename", "elapsed", "page")
+
+_MISSING = -1
+
+
+class _Categories:
+    """Dictionary encoding for low-cardinality string columns."""
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self):
+        self.values: List[Optional[str]] = []
+        self._codes: Dict[Optional[str], int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, value: Optional[str]) -> Optional[int]:
+        return self._codes.get(value)
+
+
+class ResultSet:
+    """Column-oriented store of decode results.
+
+    Raw payloads live in one byte buffer addressed by an offsets array, formats
+    and filenames are dictionary-encoded, and rects, timings and pages are
+    typed arrays. Millions of results therefore cost a few arrays instead of
+    millions of Python objects; ``DecodeResult`` objects are only created
+    when rows are indexed or iterated.
+    """
+
+    def __init__(self, results: Iterable[DecodeResult] = ()):
+        self._payload = bytearray()
+        self._offsets = array("Q", [0])
+        self._formats = _Categories()
+        self._format_codes = array("I")
+        self._filenames = _Categories()
+        self._filename_codes = array("I")
+        self._rects = array("i")
+        self._has_rect = bytearray()
+        self._elapsed = array("d")
+        self._pages = array("i")
+        self.extend(results)
+
+    def append(self, result: DecodeResult) -> None:
+        self._payload += result.raw
+        self._offsets.append(len(self._payload))
+        self._format_codes.append(self._formats.code(result.format))
+        self._filename_codes.append(self._filenames.code(result.filename))
+        self._rects.extend(result.rect if result.rect is not None else (0, 0, 0, 0))
+        self._has_rect.append(result.rect is not None)
+        self._elapsed.append(result.elapsed if result.elapsed is not None else float("nan"))
+        self._pages.append(result.page if result.page is not None else _MISSING)
+
+    def extend(self, results: Iterable[DecodeResult]) -> None:
+        for result in results:
+            self.append(result)
+
+    def __len__(self) -> int:
+        return len(self._format_codes)
+
+    def __getitem__(self, index: int) -> DecodeResult:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ResultSet index out of range")
+        return DecodeResult(
+            raw=self._raw(index),
+            format=self._formats.values[self._format_codes[index]],
+            rect=self._rect(index),
+            filename=self._filenames.values[self._filename_codes[index]],
+            elapsed=self._elapsed_at(index),
+            page=self._page(index),
+        )
+
+    def __iter__(self) -> Iterator[DecodeResult]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def _raw(self, index: int) -> bytes:
+        return bytes(self._payload[self._offsets[index]:self._offsets[index + 1]])
+
+    def _data(self, index: int) -> str:
+        return decode_payload(self._raw(index))
+
+    def iter_raw(self) -> Iterator[bytes]:
+        """Yield raw payloads without building DecodeResult objects."""
+        payload = self._payload
+        offsets = self._offsets
+        for index in range(len(self)):
+            yield bytes(payload[offsets[index]:offsets[index + 1]])
+
+    def _rect(self, index: int):
+        if not self._has_rect[index]:
+            return None
+        return tuple(self._rects[index * 4:index * 4 + 4])
+
+    def _elapsed_at(self, index: int) -> Optional[float]:
+        value = self._elapsed[index]
+        return None if value != value else value
+
+    def _page(self, index: int) -> Optional[int]:
+        page = self._pages[index]
+        return None if page == _MISSING else page
+
+    def column(self, name: str) -> list:
+        """Return one column as a list, e.g. ``column("data")``."""
+        if name == "data":
+            return [self._data(index) for index in range(len(self))]
+        if name == "raw":
+            return list(self.iter_raw())
+        if name == "format":
+            return [self._formats.values[code] for code in self._format_codes]
+        if name == "filename":
+            return [self._filenames.values[code] for code in self._filename_codes]
+        if name == "rect":
+            return [self._rect(index) for index in range(len(self))]
+        if name == "elapsed":
+            return [self._elapsed_at(index) for index in range(len(self))]
+        if name == "page":
+            return [self._page(index) for index in range(len(self))]
+        raise KeyError(name)
+
+    def take(self, indices: Sequence[int]) -> "ResultSet":
+        """Return a new ResultSet with the rows at ``indices``."""
+        subset = ResultSet()
+        for index in indices:
+            subset._payload += self._payload[self._offsets[index]:self._offsets[index + 1]]
+            subset._offsets.append(len(subset._payload))
+            subset._format_codes.append(subset._formats.code(self._formats.values[self._format_codes[index]]))
+            subset._filename_codes.append(
+                subset._filenames.code(self._filenames.values[self._filename_codes[index]])
+            )
+            subset._rects.extend(self._rects[index * 4:index * 4 + 4])
+            subset._has_rect.append(self._has_rect[index])
+            subset._elapsed.append(self._elapsed[index])
+            subset._pages.append(self._pages[index])
+        return subset
+
+    def filter(
+        self,
+        format: Optional[str] = None,
+        filename: Optional[str] = None,
+        predicate: Optional[Callable[[str], bool]] = None,
+    ) -> "ResultSet":
+        """Select rows by format, filename and/or a predicate on the payload.
+
+        Format and filename are matched on their integer codes, so no rows
+        are materialised unless ``predicate`` is given.
+        """
+        mask = [True] * len(self)
+        for value, categories, codes in (
+            (format, self._formats, self._format_codes),
+            (filename, self._filenames, self._filename_codes),
+        ):
+            if value is None:
+                continue
+            wanted = categories.lookup(value)
+            mask = [keep and code == wanted for keep, code in zip(mask, codes)]
+        if predicate is not None:
+            mask = [keep and predicate(self._data(index)) for index, keep in enumerate(mask)]
+        return self.take(list(compress(range(len(self)), mask)))
+
+    def _rows(self) -> Iterator[tuple]:
+        formats = self._formats.values
+        filenames = self._filenames.values
+        for index in range(len(self)):
+            rect = self._rect(index) or (None,) * 4
+            yield (
+                self._data(index),
+                formats[self._format_codes[index]],
+                *rect,
+                filenames[self._filename_codes[index]],
+                self._elapsed_at(index),
+                self._page(index),
+            )
+
+    def to_csv(self, fp: IO[str]) -> None:
+        """Write all rows as CSV with a header line."""
+        writer = csv.writer(fp)
+        writer.writerow(CSV_COLUMNS)
+        writer.writerows(self._rows())
+
+    def to_jsonl(self, fp: IO[str]) -> None:
+        """Write one JSON object per line, in the shape of ``DecodeResult.to_dict``.
+
+        Payloads that are not valid UTF-8 also carry their bytes as base64
+        in ``raw``, since their ``data`` text cannot be turned back into them.
+        """
+        for line in self._json_lines():
+            fp.write(line)
+            fp.write("\n")
+
+    def to_json(self, fp: IO[str]) -> None:
+        """Write all rows as a single JSON array."""
+        fp.write("[")
+        for index, line in enumerate(self._json_lines()):
+            fp.write(",\n" if index else "\n")
+            fp.write(line)
+        fp.write("\n]\n" if len(self) else "]\n")
+
+    def _json_lines(self) -> Iterator[str]:
+        # Strings are quoted once per category rather than once per row.
+        formats = [_quote_optional(value) for value in self._formats.values]
+        filenames = [_quote_optional(value) for value in self._filenames.values]
+        for index in range(len(self)):
+            raw = self._raw(index)
+            rect = self._rect(index)
+            elapsed = self._elapsed_at(index)
+            page = self._page(index)
+            try:
+                data, extra = raw.decode("utf-8"), ""
+            except UnicodeDecodeError:
+                data, extra = decode_payload(raw), f', "raw": "{base64.b64encode(raw).decode("ascii")}"'
+            yield (
+                f'{{"data": {_quote(data)}, '
+                f'"format": {formats[self._format_codes[index]]}, '
+                f'"rect": {"null" if rect is None else list(rect)}, '
+                f'"filename": {filenames[self._filename_codes[index]]}, '
+                f'"elapsed": {"null" if elapsed is None else repr(elapsed)}, '
+                f'"page": {"null" if page is None else page}{extra}}}'
+            )
+
+
+def _quote_optional(value: Optional[str]) -> str:
+    return "null" if value is None else _quote(value)
@@ -0,0 +1,228 @@
+"""Long-lived decoding sessions sharing one warm executor across calls."""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from PIL import Image
+
+from datamatrix_decoder.core.autotune import AUTO, fixed_workers
+from datamatrix_decoder.core.decoder import _batch_options, _run
+from datamatrix_decoder.core.exceptions import ConfigurationError, DecoderError
+from datamatrix_decoder.core.models import DecodeResult, DecodeTier
+
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+EXECUTOR_KINDS = ("thread", "process")
+
+# Big enough for libdmtx and zbar to allocate their scan state
+WARM_UP_SIZE = (64, 64)
+
+
+def _as_list(found) -> List[DecodeResult]:
+    return found if isinstance(found, list) else [found] if found else []
+
+
+def _warm_up(decoder, barrier: Optional[threading.Barrier] = None) -> None:
+    """Load the native libraries and the calling worker's engines."""
+    try:
+        decoder.decode_frame(Image.new("L", WARM_UP_SIZE, 255))
+    except Exception as e:
+        logger.warning(f"Warm-up decode failed: {e}")
+    if barrier is not None:
+        # Hold this thread so every warm-up lands on a different worker
+        try:
+            barrier.wait(timeout=5)
+        except threading.BrokenBarrierError:
+            pass
+
+
+def _decode_path(decoder, path: PathLike, tier: Optional[DecodeTier]) -> List[DecodeResult]:
+    return _as_list(decoder.decode_image(path, tier))
+
+
+# Decoder of a process session's worker, unpickled once by the initializer
+_worker_decoder = None
+
+
+def _init_worker(decoder, warm_up: bool) -> None:
+    global _worker_decoder
+    _worker_decoder = decoder
+    if warm_up:
+        _warm_up(decoder)
+
+
+def _decode_in_worker(path: PathLike, tier: Optional[DecodeTier], data: Optional[bytes] = None) -> List[DecodeResult]:
+    return _as_list(_worker_decoder.decode_image(path, tier, data))
+
+
+def _decode_frame_in_worker(frame, filename: Optional[str], page: Optional[int]):
+    return _worker_decoder.decode_frame(frame, filename, page)
+
+
+class DecoderSession:
+    """One decoder and one long-lived executor, shared by every call.
+
+    Services that decode many small batches skip building and tearing down
+    a pool per call, and per-thread engines (``engine="reusable"``) stay
+    warm between calls. Leaving the ``with`` block drains the work already
+    submitted; ``close(drain=False)`` cancels what has not started.
+
+    Example:
+        with DecoderSession(DataMatrixDecoder(engine="reusable"), max_workers=8) as session:
+            result = session.decode_image("label.png")
+            results = session.decode_batch(paths, tiers=DEFAULT_TIERS)
+
+    Args:
+        decoder: DataMatrixDecoder or BarcodeDecoder
+        max_workers: Executor size (default: the decoder's profile, else CPU count;
+            ``"auto"`` also means the CPU count)
+        kind: ``"thread"`` or ``"process"``
+        warm_up: Prime every worker with a blank decode on start
+        mp_context: Optional multiprocessing context for ``kind="process"``
+    """
+
+    def __init__(
+        self,
+        decoder,
+        max_workers: Optional[int] = None,
+        kind: str = "thread",
+        warm_up: bool = True,
+        mp_context=None,
+    ):
+        if kind not in EXECUTOR_KINDS:
+            raise ConfigurationError(f"Unknown executor kind: {kind} (choose from {', '.join(EXECUTOR_KINDS)})")
+        profile = getattr(decoder, "profile", None)
+        self.decoder = decoder
+        self.kind = kind
+        self.max_workers = fixed_workers(max_workers or (profile.max_workers if profile is not None else AUTO))
+        self._lock = threading.Lock()
+        self._closed = False
+        if kind == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="decoder")
+        else:
+            # Each worker unpickles the decoder once; tasks carry only paths and frames
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=mp_context,
+                initializer=_init_worker,
+                initargs=(decoder, warm_up),
+            )
+        if warm_up and kind == "thread":
+            self.warm_up()
+
+    def warm_up(self) -> None:
+        """Run one blank decode on every worker thread."""
+        barrier = threading.Barrier(self.max_workers)
+        for future in [self._executor.submit(_warm_up, self.decoder, barrier) for _ in range(self.max_workers)]:
+            future.result()
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise DecoderError("DecoderSession is closed")
+
+    def submit(self, path: PathLike, tier: Optional[DecodeTier] = None) -> "Future[List[DecodeResult]]":
+        """Queue one image; the future resolves to its list of results."""
+        with self._lock:
+            self._check_open()
+            if self.kind == "process":
+                return self._executor.submit(_decode_in_worker, path, tier)
+            return self._executor.submit(_decode_path, self.decoder, path, tier)
+
+    def decode_image(self, path: PathLike, tier: Optional[DecodeTier] = None) -> List[DecodeResult]:
+        """Decode one image on the session's executor."""
+        return self.submit(path, tier).result()
+
+    def decode_frame(self, frame, filename: Optional[str] = None, page: Optional[int] = None) -> List[DecodeResult]:
+        """Decode in-memory pixels on the session's executor."""
+        with self._lock:
+            self._check_open()
+            if self.kind == "process":
+                future = self._executor.submit(_decode_frame_in_worker, frame, filename, page)
+            else:
+                future = self._executor.submit(self.decoder.decode_frame, frame, filename, page)
+        return _as_list(future.result())
+
+    def decode_batch(self, image_paths: Iterable[PathLike], **options) -> List[DecodeResult]:
+        """``decode_batch`` of the session's decoder, run on its executor.
+
+        Accepts the decoder's ``decode_batch`` options except ``max_workers``,
+        ``executor`` and ``hard_timeout``. ``pixel_budget`` and ``prefetch``
+        need threads. Process sessions decode with the copy of the decoder
+        each worker received at start-up.
+        """
+        self._check_open()
+        if self.kind == "thread":
+            return self.decoder.decode_batch(list(image_paths), executor=self._executor, **options)
+        for option in ("pixel_budget", "prefetch"):
+            if options.get(option) is not None:
+                raise ConfigurationError(f"{option} needs a thread session")
+        stats = options.pop("stats", None)
+        profile = options.pop("profile", None) or self.decoder.profile
+        settings = _batch_options(
+            profile,
+            options.pop("max_workers", None),
+            options.pop("tiers", None),
+            options.pop("schedule", None),
+            options.pop("pixel_budget", None),
+            options.pop("hard_timeout", None),
+            options.pop("prefetch", None),
+            timeout=getattr(self.decoder, "_explicit_timeout", None),
+        )
+        if options:
+            raise ConfigurationError(f"Unknown decode_batch options: {', '.join(sorted(options))}")
+        # The workers already hold the decoder, so only paths are pickled per task
+        return _run(_decode_in_worker, list(image_paths), stats, self.decoder.quarantine, self._executor, settings)
+
+    def stream(
+        self,
+        image_paths: Iterable[PathLike],
+        tier: Optional[DecodeTier] = None,
+        window: Optional[int] = None,
+    ) -> Iterator[Tuple[PathLike, List[DecodeResult]]]:
+        """Yield ``(path, results)`` in input order as images are decoded.
+
+        ``image_paths`` may be an endless iterator; at most ``window``
+        (default ``2 * max_workers``) images are in flight.
+        """
+        window = window or 2 * self.max_workers
+        in_flight = deque()
+        for path in image_paths:
+            if len(in_flight) >= window:
+                yield self._collect(*in_flight.popleft())
+            in_flight.append((path, self.submit(path, tier)))
+        while in_flight:
+            yield self._collect(*in_flight.popleft())
+
+    @staticmethod
+    def _collect(path: PathLike, future: Future) -> Tuple[PathLike, List[DecodeResult]]:
+        try:
+            return path, future.result()
+        except Exception as e:
+            logger.error(f"Session decode error for {path}: {e}")
+            return path, []
+
+    def close(self, drain: bool = True) -> None:
+        """Stop accepting work and shut the executor down.
+
+        Args:
+            drain: Finish everything already submitted (True) or cancel
+                what has not started yet (False)
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=not drain)
+
+    def __enter__(self) -> "DecoderSession":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,136 @@
+"""Static sharding of a batch across nodes, and merging of the per-shard outputs.
+
+Each image goes to one of ``count`` shards by a hash of its path relative
+to the batch directory. Nodes sharing a filesystem therefore agree on the
+split without coordinating, even if each mounts the corpus somewhere else.
+Adding files only moves the new files; the rest stay where they were.
+"""
+
+import base64
+import hashlib
+import json
+from pathlib import Path
+from typing import IO, Iterable, Iterator, List, Optional, Tuple, Union
+
+from datamatrix_decoder.core.exceptions import ConfigurationError
+from datamatrix_decoder.core.models import DecodeResult
+
+
+PathLike = Union[str, Path]
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse ``"I/N"`` (1-based shard ``I`` of ``N``) into ``(I, N)``.
+
+    Raises:
+        ConfigurationError: If the spec is malformed or out of range
+    """
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ConfigurationError(f"Shard must be I/N, got {spec!r}")
+    if not 1 <= index <= count:
+        raise ConfigurationError(f"Shard {spec}: need 1 <= I <= N")
+    return index, count
+
+
+def shard_of(key: str, count: int) -> int:
+    """1-based shard of ``key``; stable across processes, hosts and Python versions."""
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count + 1
+
+
+def select_shard(paths: Iterable[PathLike], index: int, count: int, root: Optional[PathLike] = None) -> List[Path]:
+    """The ``paths`` belonging to shard ``index`` of ``count``.
+
+    Args:
+        paths: Every path of the batch
+        index: 1-based shard number
+        count: Number of shards
+        root: Batch directory; paths are hashed relative to it
+    """
+    selected = []
+    for path in map(Path, paths):
+        key = path.relative_to(root) if root is not None else path
+        if shard_of(key.as_posix(), count) == index:
+            selected.append(path)
+    return selected
+
+
+def read_jsonl(fp: IO[str]) -> Iterator[DecodeResult]:
+    """Read results written by ``ResultSet.to_jsonl``, with their exact payload bytes."""
+    for number, line in enumerate(fp, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+            raw = base64.b64decode(row["raw"], validate=True) if "raw" in row else row["data"].encode("utf-8")
+            yield DecodeResult(
+                raw=raw,
+                format=row["format"],
+                rect=row.get("rect"),
+                filename=row.get("filename"),
+                elapsed=row.get("elapsed"),
+                page=row.get("page"),
+            )
+        except (ValueError, KeyError, TypeError) as e:
+            raise ConfigurationError(f"Line {number} is not a decode result: {e}")
+
+
+def merge_stats(reports: Iterable[dict]) -> dict:
+    """Combine per-shard ``BatchStats.to_dict()`` reports into one run report.
+
+    Counters are summed; ``elapsed`` is the slowest shard since shards run
+    side by side, and peaks are the highest of any shard. ``missing`` lists
+    shard numbers with no report when every report carries its ``shard``.
+
+    Raises:
+        ConfigurationError: If two reports are for the same shard, or for
+            different shard counts
+    """
+    merged = {
+        "shards": 0,
+        "total": 0,
+        "decoded": 0,
+        "failed": 0,
+        "elapsed": 0.0,
+        "shard_elapsed": {},
+        "tier_attempts": {},
+        "tier_successes": {},
+        "costs": [],
+        "peak_pixel_bytes": 0,
+        "peak_rss": None,
+        "timed_out": [],
+        "quarantined": [],
+        "workers": None,
+        "io_wait": 0.0,
+    }
+    seen = set()
+    counts = set()
+    for number, report in enumerate(reports, 1):
+        shard = report.get("shard")
+        if shard is not None:
+            index, count = parse_shard(shard)
+            if index in seen:
+                raise ConfigurationError(f"Shard {shard} reported twice")
+            seen.add(index)
+            counts.add(count)
+        merged["shards"] += 1
+        for key in ("total", "decoded", "failed", "io_wait"):
+            merged[key] += report.get(key) or 0
+        merged["elapsed"] = max(merged["elapsed"], report.get("elapsed") or 0.0)
+        merged["shard_elapsed"][shard or str(number)] = report.get("elapsed") or 0.0
+        for key in ("tier_attempts", "tier_successes"):
+            for name, value in (report.get(key) or {}).items():
+                merged[key][name] = merged[key].get(name, 0) + value
+        for key in ("costs", "timed_out", "quarantined"):
+            merged[key].extend(report.get(key) or [])
+        merged["peak_pixel_bytes"] = max(merged["peak_pixel_bytes"], report.get("peak_pixel_bytes") or 0)
+        for key, combine in (("peak_rss", max), ("workers", sum)):
+            if report.get(key) is not None:
+                merged[key] = report[key] if merged[key] is None else combine((merged[key], report[key]))
+    if len(counts) > 1:
+        raise ConfigurationError(f"Reports come from different shard counts: {sorted(counts)}")
+    if counts:
+        merged["missing"] = sorted(set(range(1, counts.pop() + 1)) - seen)
+    return merged
@@ -0,0 +1,172 @@
+"""Shared-memory pixel transport for process-based decoding.
+
+Frames are copied once into a slab of fixed-size slots in
+``multiprocessing.shared_memory``; worker processes decode them in place
+and only small ``DecodeResult`` objects travel back through the pipe.
+"""
+
+import logging
+import os
+import queue
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from datamatrix_decoder.core.exceptions import ConfigurationError
+from datamatrix_decoder.core.models import DecodeResult
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FrameRef:
+    """Picklable handle to a frame stored in a shared slab."""
+
+    shm_name: str
+    offset: int
+    shape: Tuple[int, ...]
+    slot: int
+    filename: Optional[str] = None
+    page: Optional[int] = None
+
+
+class SharedFramePool:
+    """Slab of fixed-size shared-memory slots, reused frame after frame.
+
+    ``put`` blocks while every slot is in flight, which bounds the memory
+    used and gives producers natural back-pressure.
+    """
+
+    def __init__(self, slot_size: int, slots: int = 8):
+        if slot_size <= 0 or slots <= 0:
+            raise ConfigurationError("slot_size and slots must be positive")
+        self.slot_size = slot_size
+        self.slots = slots
+        self._shm = shared_memory.SharedMemory(create=True, size=slot_size * slots)
+        self._free: "queue.Queue[int]" = queue.Queue()
+        for slot in range(slots):
+            self._free.put(slot)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def put(
+        self,
+        frame,
+        filename: Optional[str] = None,
+        page: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> FrameRef:
+        """Copy ``frame`` (uint8 array or PIL image) into a free slot."""
+        array = np.asarray(frame)
+        if array.dtype != np.uint8:
+            raise ConfigurationError(f"Frames must be uint8, got {array.dtype}")
+        if array.nbytes > self.slot_size:
+            raise ConfigurationError(f"Frame of {array.nbytes} bytes exceeds slot size {self.slot_size}")
+        slot = self._free.get(timeout=timeout)
+        offset = slot * self.slot_size
+        target = np.ndarray(array.shape, dtype=np.uint8, buffer=self._shm.buf, offset=offset)
+        target[...] = array
+        return FrameRef(self._shm.name, offset, array.shape, slot, filename, page)
+
+    def release(self, ref: FrameRef) -> None:
+        """Return the slot holding ``ref`` to the pool."""
+        self._free.put(ref.slot)
+
+    def close(self) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedFramePool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# Per-process state of worker processes
+_attached: Dict[str, shared_memory.SharedMemory] = {}
+_worker_decoder = None
+
+
+def view_frame(ref: FrameRef) -> np.ndarray:
+    """Zero-copy view of a shared frame; attaches to the slab on first use."""
+    shm = _attached.get(ref.shm_name)
+    if shm is None:
+        shm = _attached[ref.shm_name] = shared_memory.SharedMemory(name=ref.shm_name)
+    return np.ndarray(ref.shape, dtype=np.uint8, buffer=shm.buf, offset=ref.offset)
+
+
+def _init_worker(decoder_cls, decoder_kwargs: Dict[str, Any]) -> None:
+    global _worker_decoder
+    _worker_decoder = decoder_cls(**decoder_kwargs)
+
+
+def _decode_ref(ref: FrameRef) -> List[DecodeResult]:
+    found = _worker_decoder.decode_frame(view_frame(ref), filename=ref.filename, page=ref.page)
+    if found is None:
+        return []
+    return found if isinstance(found, list) else [found]
+
+
+class SharedFrameExecutor:
+    """Process pool that receives frames through a ``SharedFramePool``.
+
+    Example:
+        with SharedFrameExecutor(DataMatrixDecoder, slot_size=1920 * 1080) as executor:
+            results = executor.decode_frames(camera_frames)
+    """
+
+    def __init__(
+        self,
+        decoder_cls,
+        slot_size: int,
+        slots: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        decoder_kwargs: Optional[Dict[str, Any]] = None,
+        mp_context=None,
+    ):
+        max_workers = max_workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(decoder_cls, decoder_kwargs or {}),
+        )
+        # Two slots per worker keeps every worker fed while the next frame is copied in
+        self.pool = SharedFramePool(slot_size, slots or 2 * max_workers)
+
+    def submit(
+        self, frame, filename: Optional[str] = None, page: Optional[int] = None
+    ) -> "Future[List[DecodeResult]]":
+        """Copy ``frame`` into shared memory and queue it for decoding."""
+        ref = self.pool.put(frame, filename=filename, page=page)
+        future = self._executor.submit(_decode_ref, ref)
+        future.add_done_callback(lambda _: self.pool.release(ref))
+        return future
+
+    def decode_frames(self, frames: Iterable, filename: Optional[str] = None) -> List[DecodeResult]:
+        """Decode ``frames`` in order, tagging results with their index as ``page``."""
+        futures = [self.submit(frame, filename=filename, page=index) for index, frame in enumerate(frames)]
+        results: List[DecodeResult] = []
+        for future in futures:
+            try:
+                results.extend(future.result())
+            except Exception as e:
+                logger.error(f"Shared frame decode error: {e}")
+        return results
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+        self.pool.close()
+
+    def __enter__(self) -> "SharedFrameExecutor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
@@ -0,0 +1,110 @@
+"""Overlapping-tile decoding for very large images."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from PIL import Image
+
+from datamatrix_decoder.core.exceptions import ConfigurationError
+from datamatrix_decoder.core.models import DecodeResult
+
+Box = Tuple[int, int, int, int]
+ScanFn = Callable[[Image.Image], List[DecodeResult]]
+
+
+def _starts(length: int, tile: int, step: int) -> List[int]:
+    if length <= tile:
+        return [0]
+    starts = list(range(0, length - tile, step))
+    starts.append(length - tile)
+    return starts
+
+
+def plan_tiles(size: Tuple[int, int], tile_size: int, max_symbol_size: int) -> List[Box]:
+    """Split an image into overlapping ``(left, top, right, bottom)`` boxes.
+
+    Tiles overlap by ``max_symbol_size`` so every symbol up to that size lies
+    wholly inside at least one tile.
+    """
+    if tile_size <= max_symbol_size:
+        raise ConfigurationError("tile_size must be larger than max_symbol_size")
+    width, height = size
+    step = tile_size - max_symbol_size
+    return [
+        (left, top, min(left + tile_size, width), min(top + tile_size, height))
+        for top in _starts(height, tile_size, step)
+        for left in _starts(width, tile_size, step)
+    ]
+
+
+def _bounds(rect) -> Box:
+    left, top, width, height = rect
+    return min(left, left + width), min(top, top + height), max(left, left + width), max(top, top + height)
+
+
+def _overlaps(a, b) -> bool:
+    a_left, a_top, a_right, a_bottom = _bounds(a)
+    b_left, b_top, b_right, b_bottom = _bounds(b)
+    return a_left < b_right and b_left < a_right and a_top < b_bottom and b_top < a_bottom
+
+
+def merge_tile_results(results: List[DecodeResult]) -> List[DecodeResult]:
+    """Drop symbols seen by several tiles: same format and payload, overlapping rects."""
+    merged: List[DecodeResult] = []
+    for result in results:
+        duplicate = any(
+            kept.format == result.format
+            and kept.raw == result.raw
+            and (kept.rect is None or result.rect is None or _overlaps(kept.rect, result.rect))
+            for kept in merged
+        )
+        if not duplicate:
+            merged.append(result)
+    return merged
+
+
+def offset_rects(found: List[DecodeResult], box: Box, height: int, bottom_origin: bool = False) -> List[DecodeResult]:
+    """Move rects found in the crop ``box`` of an image ``height`` pixels tall to image coordinates."""
+    left, top, right, bottom = box
+    dy = height - bottom if bottom_origin else top
+    for result in found:
+        if result.rect is not None:
+            x, y, w, h = result.rect
+            result.rect = (x + left, y + dy, w, h)
+    return found
+
+
+def decode_tiles(
+    image: Image.Image,
+    scan: ScanFn,
+    tile_size: int = 2048,
+    max_symbol_size: int = 512,
+    max_workers: Optional[int] = None,
+    bottom_origin: bool = False,
+) -> List[DecodeResult]:
+    """Scan overlapping tiles of ``image`` in parallel and merge the results.
+
+    Args:
+        image: Loaded source image
+        scan: Callable decoding one tile, returning rects in tile coordinates
+        tile_size: Tile edge in pixels
+        max_symbol_size: Largest expected symbol edge in pixels; used as overlap
+        max_workers: Parallel tiles (None = CPU count)
+        bottom_origin: Engine reports ``top`` from the bottom edge (libdmtx)
+
+    Returns:
+        De-duplicated results with rects in image coordinates
+    """
+    width, height = image.size
+    boxes = plan_tiles((width, height), tile_size, max_symbol_size)
+
+    def scan_tile(box: Box) -> List[DecodeResult]:
+        return offset_rects(scan(image.crop(box)), box, height, bottom_origin)
+
+    if len(boxes) == 1:
+        return scan_tile(boxes[0])
+
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        found = [result for tile in executor.map(scan_tile, boxes) for result in tile]
+    return merge_tile_results(found)
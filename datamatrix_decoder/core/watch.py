@@ -0,0 +1,269 @@
+"""Hot-folder watching: decode images as soon as they are fully written."""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+
+from datamatrix_decoder.core.autotune import fixed_workers
+from datamatrix_decoder.core.batch import DEFAULT_MAX_WORKERS
+from datamatrix_decoder.core.config import current_decoder
+from datamatrix_decoder.core.models import BatchStats, DecodeResult
+
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+Sink = Callable[[Path, List[DecodeResult]], None]
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+
+# <sys/inotify.h>
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+_EVENT = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Minimal inotify binding over libc; raises OSError where unavailable."""
+
+    def __init__(self, directory: Path):
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            init, add_watch = libc.inotify_init1, libc.inotify_add_watch
+        except (OSError, AttributeError) as e:
+            raise OSError(f"inotify unavailable: {e}")
+        self.fd = init(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE
+        if add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def read(self, timeout: float) -> Tuple[List[str], List[str], bool]:
+        """Names touched and names removed within ``timeout`` seconds, and whether events were lost."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return [], [], False
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return [], [], False
+        names, removed, overflow, offset = [], [], False, 0
+        while offset < len(data):
+            _, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+            elif length:
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                (removed if mask & (IN_MOVED_FROM | IN_DELETE) else names).append(name)
+            offset += length
+        return names, removed, overflow
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class FolderWatcher:
+    """Reports image files in a directory once their writers have finished.
+
+    Uses inotify on Linux and falls back to listing the directory every
+    ``poll_interval`` seconds elsewhere. Either way a file is only reported
+    once its size and mtime have been stable for ``settle`` seconds, so
+    scanners that write in several chunks are never read half-written.
+    """
+
+    def __init__(
+        self,
+        directory: PathLike,
+        suffixes=IMAGE_SUFFIXES,
+        settle: float = 0.1,
+        poll_interval: float = 0.5,
+        existing: bool = True,
+        use_inotify: bool = True,
+    ):
+        self.directory = Path(directory)
+        self.suffixes = tuple(s.lower() for s in suffixes)
+        self.settle = settle
+        self.poll_interval = poll_interval
+        self._inotify: Optional[_Inotify] = None
+        if use_inotify:
+            try:
+                self._inotify = _Inotify(self.directory)
+            except OSError as e:
+                logger.info(f"Falling back to polling {self.directory}: {e}")
+        # name -> (size, mtime_ns, first seen with that size)
+        self._candidates: Dict[str, Tuple[int, int, float]] = {}
+        self._reported: Set[str] = set()
+        listing = self._listing()
+        if existing:
+            self._add(listing)
+        else:
+            self._reported.update(listing)
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._inotify is not None else "polling"
+
+    def _listing(self) -> List[str]:
+        try:
+            return [
+                entry.name for entry in os.scandir(self.directory)
+                if entry.is_file() and entry.name.lower().endswith(self.suffixes)
+            ]
+        except FileNotFoundError:
+            return []
+
+    def _add(self, names) -> None:
+        for name in names:
+            if name.lower().endswith(self.suffixes) and name not in self._candidates:
+                self._candidates[name] = (-1, -1, 0.0)
+
+    def poll(self, timeout: Optional[float] = None) -> List[Path]:
+        """Wait up to ``timeout`` seconds for changes; return newly stable files."""
+        if timeout is None:
+            timeout = self.poll_interval
+        if self._candidates:
+            timeout = min(timeout, self.settle)
+        if self._inotify is not None:
+            names, removed, overflow = self._inotify.read(timeout)
+            # Files moved out or deleted are forgotten, so the set stays bounded;
+            # a rewritten file is a new file
+            self._reported.difference_update(removed)
+            self._reported.difference_update(names)
+            self._add(names)
+            if overflow:
+                listing = self._listing()
+                self._reported.intersection_update(listing)
+                self._add(name for name in listing if name not in self._reported)
+        else:
+            time.sleep(timeout)
+            listing = self._listing()
+            self._reported.intersection_update(listing)
+            self._add(name for name in listing if name not in self._reported)
+        return self._stable()
+
+    def _stable(self) -> List[Path]:
+        now = time.monotonic()
+        ready = []
+        for name, (size, mtime, since) in list(self._candidates.items()):
+            try:
+                stat = os.stat(self.directory / name)
+            except FileNotFoundError:
+                del self._candidates[name]
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime) or stat.st_size == 0:
+                self._candidates[name] = (stat.st_size, stat.st_mtime_ns, now)
+            elif now - since >= self.settle:
+                del self._candidates[name]
+                self._reported.add(name)
+                ready.append(self.directory / name)
+        return ready
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def __enter__(self) -> "FolderWatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _move(path: Path, directory: Path) -> Path:
+    """Move ``path`` into ``directory`` without overwriting an earlier file."""
+    target = directory / path.name
+    counter = 1
+    while target.exists():
+        target = directory / f"{path.stem}-{counter}{path.suffix}"
+        counter += 1
+    os.replace(path, target)
+    return target
+
+
+def watch_folder(
+    decoder,
+    directory: PathLike,
+    sink: Sink,
+    move_to: Optional[PathLike] = None,
+    max_workers: Union[int, str] = DEFAULT_MAX_WORKERS,
+    stop: Optional[threading.Event] = None,
+    stats: Optional[BatchStats] = None,
+    **watch_options,
+) -> BatchStats:
+    """Decode images dropped into ``directory`` until ``stop`` is set.
+
+    One decoder and one thread pool serve every file, so nothing is set up
+    per image. ``sink(path, results)`` is called once per file, serialized,
+    as soon as that file is decoded.
+
+    Args:
+        decoder: DataMatrixDecoder or BarcodeDecoder, or a callable returning
+            the decoder for each file (e.g. ``config.ReloadingDecoder``)
+        directory: Hot folder to watch
+        sink: Callable receiving each file and its results (possibly empty)
+        move_to: Optional directory processed files are moved into
+        max_workers: Files decoded in parallel (``"auto"`` = CPU count)
+        stop: Event ending the watch (None = run until interrupted)
+        stats: Optional BatchStats updated as files complete
+        **watch_options: Passed to ``FolderWatcher``
+
+    Returns:
+        The BatchStats for the session
+    """
+    stop = stop or threading.Event()
+    stats = stats if stats is not None else BatchStats()
+    move_to = Path(move_to) if move_to is not None else None
+    if move_to is not None:
+        move_to.mkdir(parents=True, exist_ok=True)
+    sink_lock = threading.Lock()
+    started = time.perf_counter()
+
+    def process(path: Path) -> None:
+        try:
+            found = current_decoder(decoder).decode_image(path)
+        except Exception as e:
+            logger.error(f"Watch decode error: {e}")
+            found = None
+        found = found if isinstance(found, list) else [found] if found else []
+        with sink_lock:
+            stats.total += 1
+            if found:
+                stats.decoded += 1
+            else:
+                stats.failed += 1
+            try:
+                sink(path, found)
+            except Exception as e:
+                logger.error(f"Result sink failed for {path}: {e}")
+        if move_to is not None:
+            try:
+                _move(path, move_to)
+            except OSError as e:
+                logger.error(f"Cannot move {path} to {move_to}: {e}")
+
+    with FolderWatcher(directory, **watch_options) as watcher:
+        logger.info(f"Watching {directory} ({watcher.backend})")
+        with ThreadPoolExecutor(max_workers=fixed_workers(max_workers)) as executor:
+            while not stop.is_set():
+                for path in watcher.poll():
+                    executor.submit(process, path)
+
+    stats.elapsed += time.perf_counter() - started
+    return stats
@@ -0,0 +1,253 @@
+"""Supervised process workers with a hard wall-clock limit per image.
+
+Native decode calls cannot be interrupted from Python, so a thread stuck in
+libdmtx or zbar holds its worker until the call returns. In supervised mode
+each worker is a process fed one image at a time over a pipe; the supervisor
+kills and respawns any worker that overruns its deadline.
+"""
+
+import logging
+import multiprocessing
+import time
+from collections import deque
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from datamatrix_decoder.core.autotune import fixed_workers
+from datamatrix_decoder.core.batch import DEFAULT_MAX_WORKERS, DEFAULT_TIER_NAME, DecodeFn
+from datamatrix_decoder.core.budget import peak_rss_bytes
+from datamatrix_decoder.core.exceptions import ConfigurationError
+from datamatrix_decoder.core.models import BatchStats, DecodeResult, DecodeTier, ImageCost
+from datamatrix_decoder.core.scheduling import SCHEDULES, estimate_cost, order_by_cost, read_header
+
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+DEFAULT_MAX_STRIKES = 2
+
+
+class Quarantine:
+    """Inputs that repeatedly killed or hung a worker.
+
+    Each timeout or crash is a strike; after ``max_strikes`` the input is
+    skipped by later supervised batches instead of costing another worker.
+    Only the supervising thread touches it, so it needs no lock.
+    """
+
+    def __init__(self, max_strikes: int = DEFAULT_MAX_STRIKES):
+        if max_strikes < 1:
+            raise ConfigurationError("max_strikes must be at least 1")
+        self.max_strikes = max_strikes
+        self._strikes: Dict[str, int] = {}
+
+    def strike(self, path: PathLike) -> bool:
+        """Record a strike against ``path``; True once it is quarantined."""
+        key = str(path)
+        self._strikes[key] = self._strikes.get(key, 0) + 1
+        return self._strikes[key] >= self.max_strikes
+
+    def strikes(self, path: PathLike) -> int:
+        return self._strikes.get(str(path), 0)
+
+    def __contains__(self, path) -> bool:
+        return self.strikes(path) >= self.max_strikes
+
+    @property
+    def paths(self) -> List[str]:
+        return [path for path, count in self._strikes.items() if count >= self.max_strikes]
+
+    def release(self, path: PathLike) -> None:
+        """Forget every strike against ``path``."""
+        self._strikes.pop(str(path), None)
+
+
+def _serve(decode_one: DecodeFn, conn) -> None:
+    """Worker process loop: decode one ``(path, tier)`` job at a time."""
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        path, tier = job
+        started = time.perf_counter()
+        try:
+            found = decode_one(path, tier) or []
+        except Exception as e:
+            logger.error(f"Batch decode error: {e}")
+            found = []
+        conn.send((found, time.perf_counter() - started))
+
+
+class _Worker:
+    def __init__(self, decode_one: DecodeFn, context):
+        self._decode_one = decode_one
+        self._context = context
+        self.start()
+
+    def start(self) -> None:
+        self.conn, child = self._context.Pipe()
+        self.process = self._context.Process(target=_serve, args=(self._decode_one, child), daemon=True)
+        self.process.start()
+        child.close()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def restart(self) -> None:
+        self.kill()
+        self.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+def run_supervised(
+    decode_one: DecodeFn,
+    image_paths: Iterable[PathLike],
+    hard_timeout: float,
+    max_workers: Union[int, str] = DEFAULT_MAX_WORKERS,
+    tiers: Optional[Sequence[DecodeTier]] = None,
+    stats: Optional[BatchStats] = None,
+    schedule: Optional[str] = None,
+    pixel_budget: Optional[int] = None,
+    quarantine: Optional[Quarantine] = None,
+    mp_context=None,
+    prefetch: Optional[int] = None,
+) -> List[DecodeResult]:
+    """Decode ``image_paths`` in worker processes under a per-image deadline.
+
+    Tiers and scheduling behave as in ``batch.run_batch``. An image whose
+    decode runs past ``hard_timeout`` seconds has its worker killed and
+    respawned; it lands in ``stats.timed_out`` and is not retried by later
+    tiers. A worker that dies on an image is treated the same way. Images in
+    ``quarantine`` are skipped up front and listed in ``stats.quarantined``.
+
+    Args:
+        decode_one: Picklable callable decoding one path with the given tier
+        image_paths: Image file paths
+        hard_timeout: Wall-clock limit in seconds per image and tier
+        max_workers: Worker processes (``"auto"`` = CPU count)
+        tiers: Decode tiers to run in order (None = single default pass)
+        stats: Optional BatchStats updated in place
+        schedule: Optional ordering from ``scheduling.SCHEDULES``
+        pixel_budget: Not supported; each worker holds a single image
+        quarantine: Strike record shared across batches (None = this call only)
+        mp_context: Optional multiprocessing context
+        prefetch: Not supported; workers read their own files
+
+    Returns:
+        List of DecodeResult objects
+    """
+    if hard_timeout <= 0:
+        raise ConfigurationError("hard_timeout must be positive")
+    if pixel_budget is not None:
+        raise ConfigurationError("pixel_budget is not supported with hard_timeout")
+    if prefetch is not None:
+        raise ConfigurationError("prefetch is not supported with hard_timeout")
+    if schedule is not None and schedule not in SCHEDULES:
+        raise ConfigurationError(f"Unknown schedule: {schedule}")
+    quarantine = quarantine if quarantine is not None else Quarantine()
+    stats = stats if stats is not None else BatchStats()
+    pending = list(image_paths)
+    stats.total += len(pending)
+    started = time.perf_counter()
+
+    skipped = [path for path in pending if path in quarantine]
+    if skipped:
+        logger.warning(f"Skipping {len(skipped)} quarantined images")
+        stats.quarantined.extend(str(path) for path in skipped)
+        stats.failed += len(skipped)
+        pending = [path for path in pending if path not in quarantine]
+
+    costs = {}
+    if schedule is not None:
+        costs = {path: ImageCost(str(path), estimate_cost(read_header(path))) for path in pending}
+        pending = order_by_cost(pending, {path: cost.estimated for path, cost in costs.items()}, schedule)
+
+    context = mp_context or multiprocessing.get_context()
+    workers = [_Worker(decode_one, context) for _ in range(min(fixed_workers(max_workers), len(pending)))]
+    results: List[DecodeResult] = []
+    try:
+        for tier in tiers or (None,):
+            if not pending:
+                break
+            name = tier.name if tier is not None else DEFAULT_TIER_NAME
+            stats.tier_attempts[name] = stats.tier_attempts.get(name, 0) + len(pending)
+
+            queue = deque(range(len(pending)))
+            idle = list(workers)
+            busy = {}
+            missed = []
+            while queue or busy:
+                while queue and idle:
+                    worker, index = idle.pop(), queue.popleft()
+                    worker.conn.send((pending[index], tier))
+                    busy[worker.conn] = (worker, index, time.monotonic() + hard_timeout)
+
+                next_deadline = min(deadline for _, _, deadline in busy.values())
+                for conn in wait(list(busy), timeout=max(0.0, next_deadline - time.monotonic())):
+                    worker, index, _ = busy.pop(conn)
+                    path = pending[index]
+                    try:
+                        found, seconds = conn.recv()
+                    except (EOFError, OSError):
+                        logger.error(f"Worker died decoding {path}; respawning")
+                        worker.restart()
+                        _record_timeout(path, stats, quarantine)
+                    else:
+                        if costs:
+                            costs[path].actual += seconds
+                        if found:
+                            results.extend(found)
+                            stats.decoded += 1
+                            stats.tier_successes[name] = stats.tier_successes.get(name, 0) + 1
+                        else:
+                            missed.append(index)
+                    idle.append(worker)
+
+                now = time.monotonic()
+                for conn, (worker, index, deadline) in list(busy.items()):
+                    if now >= deadline:
+                        del busy[conn]
+                        path = pending[index]
+                        logger.warning(f"Decode of {path} exceeded {hard_timeout}s; killing worker")
+                        worker.restart()
+                        if costs:
+                            costs[path].actual += hard_timeout
+                        _record_timeout(path, stats, quarantine)
+                        idle.append(worker)
+
+            if tier is not None and missed:
+                logger.info(f"Tier {name}: {len(missed)} of {len(pending)} images queued for retry")
+            pending = [pending[index] for index in sorted(missed)]
+    finally:
+        for worker in workers:
+            worker.stop()
+
+    stats.costs.extend(costs.values())
+    stats.peak_rss = peak_rss_bytes()
+    stats.failed += len(pending)
+    stats.elapsed += time.perf_counter() - started
+    return results
+
+
+def _record_timeout(path: PathLike, stats: BatchStats, quarantine: Quarantine) -> None:
+    stats.timed_out.append(str(path))
+    stats.failed += 1
+    if quarantine.strike(path):
+        logger.warning(f"Quarantined {path} after {quarantine.strikes(path)} strikes")
@@ -0,0 +1,157 @@
+"""Persistent zbar scanners configured once for the formats in use.
+
+``pyzbar.decode`` creates an image scanner, configures it and copies the
+image on every call. ``ZbarEngine`` keeps a scanner and a zbar image per
+thread with only the requested symbologies enabled, and scans grayscale
+buffers in place.
+"""
+
+import threading
+from ctypes import c_void_p, cast
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PIL import Image
+
+try:
+    from pyzbar import pyzbar as _pyzbar
+    from pyzbar.wrapper import (
+        ZBarConfig,
+        ZBarSymbol,
+        zbar_image_create,
+        zbar_image_destroy,
+        zbar_image_scanner_create,
+        zbar_image_scanner_destroy,
+        zbar_image_scanner_set_config,
+        zbar_image_set_data,
+        zbar_image_set_format,
+        zbar_image_set_size,
+        zbar_scan_image,
+    )
+except ImportError:
+    _pyzbar = None
+
+from datamatrix_decoder.core.exceptions import DecodeError
+from datamatrix_decoder.core.frames import _LUMA_WEIGHTS
+
+
+# Decoder format names -> zbar symbology names, where they differ only in case
+# or not at all; "itf" is zbar's interleaved 2 of 5
+ZBAR_SYMBOLOGIES = {
+    "qrcode": "QRCODE",
+    "ean13": "EAN13",
+    "ean8": "EAN8",
+    "upca": "UPCA",
+    "upce": "UPCE",
+    "code128": "CODE128",
+    "code39": "CODE39",
+    "code93": "CODE93",
+    "itf": "I25",
+    "codabar": "CODABAR",
+    "pdf417": "PDF417",
+}
+FORMAT_NAMES = {symbology: fmt for fmt, symbology in ZBAR_SYMBOLOGIES.items()}
+
+L800 = 808466521
+
+
+def format_name(zbar_type: str) -> str:
+    """Decoder format name for a zbar symbol type, e.g. ``I25`` -> ``itf``."""
+    return FORMAT_NAMES.get(zbar_type, zbar_type.lower())
+
+
+def symbologies(formats: Iterable[str]) -> Optional[Tuple[str, ...]]:
+    """zbar symbologies to enable for ``formats``; None when that is all of them."""
+    names = tuple(sorted({ZBAR_SYMBOLOGIES[fmt] for fmt in formats if fmt in ZBAR_SYMBOLOGIES}))
+    return None if set(names) == set(FORMAT_NAMES) else names
+
+
+def pyzbar_symbols(names: Optional[Tuple[str, ...]]):
+    """``ZBarSymbol`` members for ``pyzbar.decode(symbols=...)``, or None."""
+    if names is None or _pyzbar is None:
+        return None
+    return [ZBarSymbol[name] for name in names if name in ZBarSymbol.__members__]
+
+
+def _gray_buffer(image):
+    """``(buffer, address, nbytes, width, height)`` for 8-bit grayscale pixels."""
+    if isinstance(image, Image.Image):
+        if image.mode != "L":
+            image = image.convert("L")
+        pixels = image.tobytes()
+        width, height = image.size
+        return pixels, cast(pixels, c_void_p), len(pixels), width, height
+    # uint8 NumPy frame: scanned in place when packed and single-channel
+    if image.ndim == 3 and image.shape[2] >= 3:
+        # RGB(A): the same fixed-point luma as frames.preprocess_stack
+        luma = sum(image[:, :, channel].astype("uint16") * weight for channel, weight in enumerate(_LUMA_WEIGHTS))
+        image = (luma >> 8).astype("uint8")
+    elif image.ndim == 3:
+        # Gray or gray + alpha
+        image = image[:, :, 0]
+    if str(image.dtype) != "uint8" or not image.flags.c_contiguous:
+        image = image.astype("uint8", order="C")
+    height, width = image.shape
+    return image, c_void_p(image.ctypes.data), image.nbytes, width, height
+
+
+class ZbarEngine:
+    """Long-lived zbar scanner; returns ``pyzbar`` ``Decoded`` tuples.
+
+    Not thread-safe: use one engine per thread (``thread_engine``).
+
+    Args:
+        names: zbar symbology names to enable (None = all)
+    """
+
+    def __init__(self, names: Optional[Iterable[str]] = None):
+        if _pyzbar is None:
+            raise ImportError("pyzbar is required. Install: pip install pyzbar")
+        self._scanner = zbar_image_scanner_create()
+        self._image = zbar_image_create()
+        if not self._scanner or not self._image:
+            self.close()
+            raise DecodeError("Could not create zbar scanner")
+        if names is not None:
+            # Symbology 0 addresses every symbology at once
+            zbar_image_scanner_set_config(self._scanner, 0, ZBarConfig.CFG_ENABLE, 0)
+            for name in names:
+                zbar_image_scanner_set_config(self._scanner, ZBarSymbol[name], ZBarConfig.CFG_ENABLE, 1)
+        zbar_image_set_format(self._image, L800)
+
+    def decode(self, image) -> List:
+        """Scan a PIL image or uint8 NumPy frame."""
+        pixels, address, nbytes, width, height = _gray_buffer(image)
+        zbar_image_set_size(self._image, width, height)
+        zbar_image_set_data(self._image, address, nbytes, None)
+        if zbar_scan_image(self._scanner, self._image) < 0:
+            raise DecodeError("zbar rejected the image format")
+        # Symbols are read before ``pixels`` can be released
+        found = list(_pyzbar._decode_symbols(_pyzbar._symbols_for_image(self._image)))
+        del pixels
+        return found
+
+    def close(self) -> None:
+        """Free the native scanner and image."""
+        if getattr(self, "_image", None):
+            zbar_image_destroy(self._image)
+        if getattr(self, "_scanner", None):
+            zbar_image_scanner_destroy(self._scanner)
+        self._image = self._scanner = None
+
+    def __del__(self):
+        if _pyzbar is not None:
+            self.close()
+
+
+_local = threading.local()
+
+
+def thread_engine(names: Optional[Tuple[str, ...]] = None) -> ZbarEngine:
+    """The calling thread's engine for ``names``, created on first use."""
+    engines: Dict[Optional[Tuple[str, ...]], ZbarEngine] = getattr(_local, "engines", None)
+    if engines is None:
+        engines = _local.engines = {}
+    engine = engines.get(names)
+    if engine is None:
+        engine = engines[names] = ZbarEngine(names)
+    return engine
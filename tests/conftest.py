@@ -0,0 +1,56 @@
+"""Shared fixtures: fake libdmtx/zbar engines, since the native libraries are optional."""
+
+from collections import namedtuple
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from datamatrix_decoder.core import decoder as decoder_module
+
+
+Rect = namedtuple("Rect", "left top width height")
+DmtxDecoded = namedtuple("Decoded", "data rect")
+ZbarDecoded = namedtuple("Decoded", "data type rect polygon quality orientation")
+
+
+class FakeEngine:
+    """Callable standing in for a native decode function.
+
+    ``responder(image, **kwargs)`` returns the decoded objects; every call is
+    recorded in ``calls`` as ``(image.size, kwargs)``.
+    """
+
+    def __init__(self, responder=None):
+        self.responder = responder or (lambda image, **kwargs: [])
+        self.calls = []
+
+    def __call__(self, image, **kwargs):
+        self.calls.append((image.size, kwargs))
+        return self.responder(image, **kwargs)
+
+
+@pytest.fixture
+def fake_dmtx(monkeypatch):
+    engine = FakeEngine()
+    monkeypatch.setattr(decoder_module, "dmtx_decode", engine)
+    return engine
+
+
+@pytest.fixture
+def fake_zbar(monkeypatch):
+    engine = FakeEngine()
+    monkeypatch.setattr(decoder_module, "pyzbar", SimpleNamespace(decode=engine))
+    return engine
+
+
+@pytest.fixture
+def make_image(tmp_path):
+    """Write a solid grayscale PNG and return its path."""
+
+    def _make(name, size=(64, 64), value=255):
+        path = tmp_path / name
+        Image.new("L", size, value).save(path)
+        return path
+
+    return _make
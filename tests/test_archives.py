@@ -0,0 +1,82 @@
+import io
+import tarfile
+import zipfile
+
+import pytest
+from PIL import Image
+
+from datamatrix_decoder import BatchStats, DataMatrixDecoder, DEFAULT_TIERS, ImageLoadError
+from datamatrix_decoder.core.archives import decode_archive, is_archive, iter_members
+from conftest import DmtxDecoded, Rect
+
+
+def png_bytes(size):
+    buffer = io.BytesIO()
+    Image.new("L", size, 255).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+MEMBERS = {
+    "lot1/a.png": png_bytes((64, 64)),
+    "lot1/b.png": png_bytes((80, 80)),
+    "lot2/blank.png": png_bytes((96, 96)),
+}
+
+
+def decode_by_size(image, shrink, **kwargs):
+    width = image.size[0]
+    if width == 64 or (width == 80 and shrink == 1):
+        return [DmtxDecoded(width.to_bytes(1, "big"), Rect(0, 0, 4, 4))]
+    return []
+
+
+@pytest.fixture
+def zip_path(tmp_path):
+    path = tmp_path / "batch.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, data in MEMBERS.items():
+            archive.writestr(name, data)
+        archive.writestr("manifest.txt", "not an image")
+    return path
+
+
+@pytest.fixture
+def tar_path(tmp_path):
+    path = tmp_path / "batch.tar.gz"
+    with tarfile.open(path, "w:gz") as archive:
+        for name, data in MEMBERS.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return path
+
+
+def test_is_archive():
+    assert is_archive("x.ZIP") and is_archive("x.tar.gz") and is_archive("x.tgz")
+    assert not is_archive("x.png")
+
+
+def test_iter_members_skips_non_images(zip_path):
+    assert [name for name, _ in iter_members(zip_path)] == list(MEMBERS)
+
+
+@pytest.mark.parametrize("archive", ["zip_path", "tar_path"])
+def test_members_decoded_in_memory_with_member_names(request, fake_dmtx, archive):
+    fake_dmtx.responder = decode_by_size
+    stats = BatchStats()
+
+    results = decode_archive(DataMatrixDecoder(), request.getfixturevalue(archive), max_workers=2,
+                             tiers=DEFAULT_TIERS, stats=stats)
+
+    assert sorted(r.filename for r in results) == ["lot1/a.png", "lot1/b.png"]
+    assert stats.tier_attempts == {"fast": 3, "thorough": 2}
+    assert stats.tier_successes == {"fast": 1, "thorough": 1}
+    assert (stats.total, stats.decoded, stats.failed) == (3, 2, 1)
+
+
+def test_corrupt_archive(fake_dmtx, tmp_path):
+    path = tmp_path / "broken.zip"
+    path.write_bytes(b"not a zip")
+
+    with pytest.raises(ImageLoadError):
+        decode_archive(DataMatrixDecoder(), path)
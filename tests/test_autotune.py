@@ -0,0 +1,89 @@
+import pytest
+
+from datamatrix_decoder import BatchStats, DataMatrixDecoder
+from datamatrix_decoder.core.autotune import AdaptiveConcurrency, fixed_workers, resolve_ceiling
+from datamatrix_decoder.core.config import parse_config
+from datamatrix_decoder.core.exceptions import ConfigurationError
+from conftest import DmtxDecoded, Rect
+
+
+def drive(controller, clock, rate, completions):
+    """Complete ``completions`` images, each taking 1 / rate(level) seconds."""
+    for _ in range(completions):
+        controller.acquire()
+        clock[0] += 1 / rate(controller.level)
+        controller.release()
+
+
+def peaked(level):
+    # Throughput rises up to 6 workers, then contention sets in
+    return level if level <= 6 else 6 - (level - 6) * 0.5
+
+
+def test_climbs_down_to_peak_and_settles():
+    clock = [0.0]
+    controller = AdaptiveConcurrency(16, window=10, clock=lambda: clock[0])
+    assert controller.level == 8
+
+    drive(controller, clock, peaked, 200)
+
+    assert controller.settled
+    assert controller.level == 6
+
+
+def test_climbs_up_to_peak():
+    clock = [0.0]
+    controller = AdaptiveConcurrency(16, start=2, window=10, clock=lambda: clock[0])
+
+    drive(controller, clock, peaked, 200)
+
+    assert controller.settled
+    assert controller.level == 6
+
+
+def test_throughput_drop_restarts_tuning():
+    clock = [0.0]
+    controller = AdaptiveConcurrency(16, window=10, clock=lambda: clock[0])
+    drive(controller, clock, peaked, 200)
+    assert controller.settled
+
+    drive(controller, clock, lambda level: peaked(level) / 3, 10)
+
+    assert not controller.settled
+
+
+def test_memory_caps_ceiling():
+    assert resolve_ceiling() >= 2
+    assert resolve_ceiling(mean_footprint=100, available=400) == 2
+    assert resolve_ceiling(mean_footprint=10**12, available=400) == 1
+
+
+def test_fixed_workers():
+    assert fixed_workers(3) == 3
+    assert fixed_workers("auto") >= 1
+
+
+def test_batch_auto_workers(fake_dmtx, make_image):
+    paths = [make_image(f"{i}.png", size=(40, 40)) for i in range(12)]
+    fake_dmtx.responder = lambda image, **kwargs: [DmtxDecoded(b"x", Rect(0, 0, 1, 1))]
+    stats = BatchStats()
+
+    results = DataMatrixDecoder().decode_batch(paths, max_workers="auto", stats=stats)
+
+    assert len(results) == 12
+    assert stats.decoded == 12
+    assert stats.workers >= 1
+    assert stats.to_dict()["workers"] == stats.workers
+
+
+def test_batch_rejects_bad_worker_count(fake_dmtx, make_image):
+    with pytest.raises(ConfigurationError):
+        DataMatrixDecoder().decode_batch([make_image("a.png")], max_workers="many")
+
+
+def test_profile_accepts_auto():
+    config = parse_config({"profiles": {"busy": {"max_workers": "auto"}}})
+    assert config.profile("busy").max_workers == "auto"
+
+    with pytest.raises(ConfigurationError):
+        parse_config({"profiles": {"busy": {"max_workers": "lots"}}})
@@ -0,0 +1,54 @@
+import threading
+import time
+
+import pytest
+
+from datamatrix_decoder import BatchStats, DataMatrixDecoder
+from datamatrix_decoder.core.budget import PixelBudget
+from datamatrix_decoder.core.exceptions import ConfigurationError
+
+
+def test_oversized_reservation_runs_alone():
+    budget = PixelBudget(100)
+    budget.acquire(40)
+    granted = threading.Event()
+    waiter = threading.Thread(target=lambda: (budget.acquire(500), granted.set()))
+    waiter.start()
+
+    assert not granted.wait(0.05)
+    budget.release(40)
+    assert granted.wait(1)
+    waiter.join()
+    assert budget.peak == 500
+
+
+def test_reservation_is_returned_when_decoding_raises():
+    budget = PixelBudget(100)
+
+    with pytest.raises(RuntimeError):
+        with budget.reserve(60):
+            assert budget.in_flight == 60
+            raise RuntimeError("corrupt")
+
+    assert (budget.in_flight, budget.peak) == (0, 60)
+
+
+def test_budget_must_be_positive():
+    with pytest.raises(ConfigurationError):
+        PixelBudget(0)
+
+
+def test_batch_respects_pixel_budget(fake_dmtx, make_image):
+    paths = [make_image(f"{i}.png", size=(100, 100)) for i in range(6)]
+
+    def responder(image, **kwargs):
+        time.sleep(0.01)
+        return []
+
+    fake_dmtx.responder = responder
+    stats = BatchStats()
+    # Each 100x100 L image reserves 20 000 bytes: at most two fit at once.
+    DataMatrixDecoder().decode_batch(paths, max_workers=6, stats=stats, pixel_budget=45_000)
+
+    assert stats.peak_pixel_bytes == 40_000
+    assert stats.failed == 6
@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from datamatrix_decoder import BarcodeDecoder, ConfigurationError, DataMatrixDecoder
+from datamatrix_decoder.core.config import ConfigWatcher, ReloadingDecoder, load_config, parse_config
+
+
+RAW = {
+    "decoder": {"timeout": 10, "max_workers": 3, "formats": ["qrcode"]},
+    "default_profile": "fast",
+    "profiles": {
+        "fast": {"timeout": 0.5, "tiers": [{"name": "quick", "scale": 0.5}]},
+        "audit": {"schedule": "largest-first", "tiers": [{"name": "full", "variants": ["original", "invert"]}]},
+    },
+}
+
+
+def test_profiles_inherit_from_decoder_section():
+    config = parse_config(RAW)
+
+    assert config.profile().name == "fast"
+    audit = config.profile("audit")
+    assert (audit.timeout, audit.max_workers, audit.formats) == (10.0, 3, ("qrcode",))
+    assert audit.decode_tiers()[0].timeout == 10.0
+    assert audit.decode_tiers(timeout=2)[0].timeout == 2
+    assert config.profile("default").tiers == ()
+
+
+@pytest.mark.parametrize("raw", [
+    {"profiles": {"x": {"threads": 2}}},
+    {"profiles": {"x": {"schedule": "random"}}},
+    {"profiles": {"x": {"tiers": [{"name": "t", "variants": ["blur"]}]}}},
+    {"profiles": {"x": {"formats": ["maxicode"]}}},
+    {"profiles": {"x": {"engine": "opencv"}}},
+    {"default_profile": "missing"},
+])
+def test_invalid_configuration_is_rejected(raw):
+    with pytest.raises(ConfigurationError):
+        parse_config(raw)
+
+
+def test_unknown_profile_name():
+    with pytest.raises(ConfigurationError, match="Unknown profile"):
+        parse_config(RAW).profile("nope")
+
+
+def test_watcher_reloads_on_change_and_keeps_last_good(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("decoder:\n  timeout: 5\n")
+    watcher = ConfigWatcher(path, interval=0)
+    assert watcher.profile().timeout == 5.0
+
+    path.write_text("decoder:\n  timeout: 7\n")
+    os.utime(path, ns=(1, 1))
+    assert watcher.profile().timeout == 7.0
+
+    path.write_text("decoder:\n  timeout: [\n")
+    os.utime(path, ns=(2, 2))
+    assert watcher.profile().timeout == 7.0
+
+
+def test_reloading_decoder_rebuilds_only_on_change(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("decoder:\n  timeout: 5\n")
+    source = ReloadingDecoder(ConfigWatcher(path, interval=0), lambda profile: [profile.timeout])
+
+    first = source()
+    assert source() is first and first == [5.0]
+
+    path.write_text("decoder:\n  timeout: 7\n")
+    os.utime(path, ns=(1, 1))
+    assert source() == [7.0]
+
+
+def test_load_config_without_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("DATAMATRIX_DECODER_CONFIG", raising=False)
+
+    assert load_config().profile().timeout == 30
+
+
+def test_decode_batch_uses_profile(fake_dmtx, make_image):
+    profile = parse_config(RAW).profile("fast")
+    path = make_image("a.png", size=(64, 64))
+
+    DataMatrixDecoder().decode_batch([path], profile=profile)
+
+    assert [(size, kwargs["timeout"]) for size, kwargs in fake_dmtx.calls] == [((64, 64), 500)]
+    assert fake_dmtx.calls[0][1]["shrink"] == 2
+
+
+def test_decoders_take_their_engine_from_the_profile(fake_dmtx, fake_zbar):
+    config = parse_config({"decoder": {"engine": "reusable"}, "profiles": {"per-call": {"engine": "pylibdmtx"}}})
+    reusable, per_call = config.profile(), config.profile("per-call")
+
+    assert DataMatrixDecoder(profile=reusable).engine == "reusable"
+    assert BarcodeDecoder(profile=reusable).engine == "reusable"
+    assert DataMatrixDecoder(profile=reusable, engine="pylibdmtx").engine == "pylibdmtx"
+    assert DataMatrixDecoder(profile=per_call).engine == "pylibdmtx"
+    assert BarcodeDecoder(profile=per_call).engine == "pyzbar"
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from datamatrix_decoder import BarcodeDecoder
+from datamatrix_decoder.core.dedupe import FrameDeduplicator, ahash, dhash, hamming, thumbnail
+from datamatrix_decoder.core.exceptions import ConfigurationError
+from datamatrix_decoder.core.frames import FrameStack, decode_frames
+from conftest import Rect, ZbarDecoded
+
+
+def scene(seed, shape=(64, 96)):
+    return np.random.default_rng(seed).integers(0, 256, size=shape, dtype=np.uint8)
+
+
+def test_thumbnail_is_area_average():
+    frame = np.array([[0, 0, 10, 10], [0, 0, 10, 10], [20, 20, 30, 30], [20, 20, 30, 30]], dtype=np.uint8)
+
+    assert np.array_equal(thumbnail(frame, 2, 2), [[0, 10], [20, 30]])
+
+
+def test_colour_and_pil_frames_hash_like_grayscale():
+    gray = scene(1)
+    rgb = np.repeat(gray[:, :, None], 3, axis=2)
+
+    assert dhash(rgb) == dhash(gray) == dhash(Image.fromarray(gray))
+    assert ahash(Image.fromarray(rgb)) == ahash(gray)
+
+
+def test_noise_stays_within_threshold():
+    frame = scene(1)
+    noisy = np.clip(frame.astype(int) + np.random.default_rng(2).integers(-3, 4, frame.shape), 0, 255)
+
+    assert hamming(dhash(frame), dhash(noisy.astype(np.uint8))) <= 4
+    assert hamming(dhash(frame), dhash(scene(3))) > 4
+
+
+def test_staleness_limits():
+    clock = [0.0]
+    dedupe = FrameDeduplicator(max_reuse=2, max_age=10, clock=lambda: clock[0])
+    frame = scene(1)
+
+    assert [dedupe.check(frame) for _ in range(4)] == [False, True, True, False]
+    clock[0] = 20
+    assert dedupe.check(frame) is False
+    assert dedupe.checked == 5
+    assert dedupe.reused == 2
+
+
+def test_invalid_settings():
+    with pytest.raises(ConfigurationError):
+        FrameDeduplicator(method="phash")
+
+
+def test_decode_reuses_results(fake_zbar):
+    fake_zbar.responder = lambda image, **kwargs: [ZbarDecoded(b"A1", "CODE128", Rect(1, 2, 3, 4), [], 1, None)]
+    decoder = BarcodeDecoder()
+    dedupe = FrameDeduplicator()
+
+    first = dedupe.decode(decoder, scene(1), page=0)
+    second = dedupe.decode(decoder, scene(1), page=1)
+
+    assert len(fake_zbar.calls) == 1
+    assert second[0].data == "A1" and second[0].page == 1
+    assert first[0].page == 0
+
+
+def test_decode_frames_skips_duplicates(fake_zbar, tmp_path):
+    stack = np.stack([scene(1)] * 4 + [scene(2)] * 3)
+    path = tmp_path / "burst.npy"
+    np.save(path, stack)
+    fake_zbar.responder = lambda image, **kwargs: [ZbarDecoded(b"A1", "CODE128", Rect(1, 2, 3, 4), [], 1, None)]
+    dedupe = FrameDeduplicator()
+
+    with FrameStack.npy(path) as frames:
+        results = decode_frames(BarcodeDecoder(), frames, max_workers=2, dedupe=dedupe)
+
+    assert len(fake_zbar.calls) == 2
+    assert sorted(result.page for result in results) == list(range(7))
+    assert dedupe.reused == 5
+
+
+def test_decode_frames_shares_deduplicator_across_stacks(fake_zbar, tmp_path):
+    path = tmp_path / "burst.npy"
+    np.save(path, np.stack([scene(1)] * 3))
+    fake_zbar.responder = lambda image, **kwargs: [ZbarDecoded(b"A1", "CODE128", Rect(1, 2, 3, 4), [], 1, None)]
+    dedupe = FrameDeduplicator()
+
+    with FrameStack.npy(path) as frames:
+        first = decode_frames(BarcodeDecoder(), frames, dedupe=dedupe)
+        second = decode_frames(BarcodeDecoder(), frames, dedupe=dedupe)
+
+    assert len(fake_zbar.calls) == 2
+    assert [result.page for result in first] == [result.page for result in second] == [0, 1, 2]
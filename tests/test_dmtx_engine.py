@@ -0,0 +1,58 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from datamatrix_decoder import ConfigurationError, DataMatrixDecoder
+from datamatrix_decoder.core import dmtx_engine
+from conftest import DmtxDecoded, FakeEngine, Rect
+
+
+def test_reusable_engine_replaces_per_call_decode(fake_dmtx, monkeypatch, make_image):
+    engine = FakeEngine(lambda image, **kwargs: [DmtxDecoded(b"x", Rect(0, 0, 1, 1))])
+    monkeypatch.setattr(dmtx_engine, "thread_engine", lambda: SimpleNamespace(decode=engine))
+
+    result = DataMatrixDecoder(engine="reusable").decode_image(make_image("a.png"))
+
+    assert result.data == "x"
+    assert len(engine.calls) == 1 and fake_dmtx.calls == []
+
+
+def test_unknown_engine(fake_dmtx):
+    with pytest.raises(ConfigurationError):
+        DataMatrixDecoder(engine="opencv")
+
+
+def test_thread_engine_is_per_thread(monkeypatch):
+    monkeypatch.setattr(dmtx_engine, "DmtxEngine", object)
+    monkeypatch.setattr(dmtx_engine, "_local", threading.local())
+    mine = dmtx_engine.thread_engine()
+    other = []
+    thread = threading.Thread(target=lambda: other.append(dmtx_engine.thread_engine()))
+    thread.start()
+    thread.join()
+
+    assert dmtx_engine.thread_engine() is mine
+    assert other[0] is not mine
+
+
+def test_native_engine_reuses_structures_across_frames():
+    if dmtx_engine._pylibdmtx is None:
+        pytest.skip("libdmtx not available")
+    encode = dmtx_engine._pylibdmtx.encode
+
+    def symbol(payload, size):
+        encoded = encode(payload)
+        image = Image.frombytes("RGB", (encoded.width, encoded.height), encoded.pixels).convert("L")
+        canvas = Image.new("L", size, 255)
+        canvas.paste(image, (10, 10))
+        return canvas
+
+    engine = dmtx_engine.DmtxEngine()
+    assert [d.data for d in engine.decode(symbol(b"first", (200, 200)), timeout=1000)] == [b"first"]
+    native = engine._image
+    assert [d.data for d in engine.decode(symbol(b"second", (200, 200)), timeout=1000)] == [b"second"]
+    assert engine._image is native
+    assert [d.data for d in engine.decode(symbol(b"third", (240, 200)), timeout=1000)] == [b"third"]
+    engine.close()
@@ -0,0 +1,65 @@
+import pytest
+from PIL import Image
+
+from datamatrix_decoder import BarcodeDecoder, ConfigurationError, DataMatrixDecoder, DecodeTier
+from datamatrix_decoder.core.config import parse_config
+from datamatrix_decoder.core.preprocessing import draft_jpeg
+from conftest import DmtxDecoded, Rect, ZbarDecoded
+
+
+@pytest.fixture
+def jpeg(tmp_path):
+    path = tmp_path / "photo.jpg"
+    Image.new("RGB", (800, 600), (200, 200, 200)).save(path, quality=90)
+    return path
+
+
+def test_draft_jpeg_reduces_in_grayscale(jpeg):
+    with Image.open(jpeg) as image:
+        assert draft_jpeg(image, 0.125) == 0.125
+        image.load()
+        assert (image.size, image.mode) == ((100, 75), "L")
+
+
+def test_draft_leaves_other_formats_alone(make_image):
+    with Image.open(make_image("a.png", size=(80, 80))) as image:
+        assert draft_jpeg(image, 0.5) == 1.0
+        assert image.size == (80, 80)
+
+
+def test_reduced_hit_is_mapped_back_to_full_resolution(fake_dmtx, jpeg):
+    fake_dmtx.responder = lambda image, **kwargs: [DmtxDecoded(b"x", Rect(10, 20, 30, 40))]
+
+    result = DataMatrixDecoder(draft_scale=0.25).decode_image(jpeg)
+
+    assert [size for size, _ in fake_dmtx.calls] == [(200, 150)]
+    assert result.rect == (40, 80, 120, 160)
+
+
+def test_reduced_miss_falls_back_to_full_resolution(fake_zbar, jpeg):
+    def full_size_only(image, **kwargs):
+        if image.size == (800, 600):
+            return [ZbarDecoded(b"1", "QRCODE", Rect(1, 2, 3, 4), [], 1, None)]
+        return []
+
+    fake_zbar.responder = full_size_only
+
+    results = BarcodeDecoder(draft_scale=0.5).decode_image(jpeg)
+
+    assert [size for size, _ in fake_zbar.calls] == [(400, 300), (800, 600)]
+    assert results[0].rect == (1, 2, 3, 4)
+
+
+def test_downsampling_tiers_skip_the_draft_pass(fake_dmtx, jpeg):
+    DataMatrixDecoder(draft_scale=0.5).decode_image(jpeg, tier=DecodeTier("fast", scale=0.5))
+
+    assert [size for size, _ in fake_dmtx.calls] == [(800, 600)]
+
+
+def test_draft_scale_validation(fake_dmtx):
+    with pytest.raises(ConfigurationError):
+        DataMatrixDecoder(draft_scale=0.3)
+    with pytest.raises(ConfigurationError):
+        parse_config({"decoder": {"draft_scale": 0.3}})
+    profile = parse_config({"decoder": {"draft_scale": 0.25}}).profile()
+    assert DataMatrixDecoder(profile=profile).draft_scale == 0.25
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+from datamatrix_decoder import BarcodeDecoder, DataMatrixDecoder
+from datamatrix_decoder.core.exceptions import ConfigurationError, ImageLoadError
+from datamatrix_decoder.core.frames import FrameStack, decode_frames, open_frames, preprocess_stack
+from conftest import DmtxDecoded, Rect, ZbarDecoded
+
+
+def test_raw_frames_with_stride_and_offset(tmp_path):
+    frames = np.arange(3 * 4 * 6, dtype=np.uint8).reshape(3, 4, 6)
+    padded = np.zeros((3, 4, 8), dtype=np.uint8)
+    padded[:, :, :6] = frames
+    path = tmp_path / "line.raw"
+    path.write_bytes(b"HDR!" + padded.tobytes())
+
+    with FrameStack.raw(path, width=6, height=4, stride=8, offset=4) as stack:
+        assert len(stack) == 3
+        assert all(np.array_equal(stack[i], frames[i]) for i in range(3))
+        assert not stack[1].flags.owndata
+
+
+def test_npy_stack_is_memory_mapped(tmp_path):
+    frames = np.random.randint(0, 255, size=(2, 5, 7, 3), dtype=np.uint8)
+    path = tmp_path / "burst.npy"
+    np.save(path, frames)
+
+    with open_frames(path) as stack:
+        assert [f.shape for f in stack] == [(5, 7, 3), (5, 7, 3)]
+        assert np.array_equal(stack[1], frames[1])
+
+
+def test_npy_must_be_uint8(tmp_path):
+    path = tmp_path / "float.npy"
+    np.save(path, np.zeros((1, 2, 2), dtype=np.float32))
+
+    with pytest.raises(ImageLoadError):
+        FrameStack.npy(path)
+
+
+def test_decode_frames_tags_pages(fake_zbar, tmp_path):
+    frames = np.zeros((5, 8, 10), dtype=np.uint8)
+    frames[3, 0, 0] = 200
+    path = tmp_path / "cap.raw"
+    path.write_bytes(frames[:, :, :].tobytes())
+    fake_zbar.responder = lambda image, **kwargs: (
+        [ZbarDecoded(b"hit", "QRCODE", Rect(0, 0, 1, 1), [], 1, None)] if image.getpixel((0, 0)) else []
+    )
+
+    with FrameStack.raw(path, width=10, height=8) as stack:
+        results = decode_frames(BarcodeDecoder(), stack, max_workers=2, window=2)
+
+    assert [(r.data, r.page, r.filename) for r in results] == [("hit", 3, str(path))]
+
+
+def test_preprocess_stack_converts_and_downscales():
+    stack = np.zeros((2, 4, 6, 3), dtype=np.uint8)
+    stack[0, :2, :2] = (255, 0, 0)
+    stack[1] = 200
+
+    frames = preprocess_stack(stack, scale=0.5)
+
+    assert frames.shape == (2, 2, 3)
+    assert frames.flags.c_contiguous
+    assert frames[0, 0, 0] == 76
+    assert (frames[1] == 200).all()
+
+
+def test_preprocess_stack_normalizes_each_frame():
+    stack = np.stack([np.full((2, 2), 100, dtype=np.uint8), np.array([[50, 60], [70, 80]], dtype=np.uint8)])
+
+    frames = preprocess_stack(stack, normalize=True)
+
+    assert (frames[0] == 0).all()
+    assert frames[1].tolist() == [[0, 85], [170, 255]]
+
+
+@pytest.mark.parametrize("stack, scale", [
+    (np.zeros((2, 4, 4), dtype=np.float32), 1.0),
+    (np.zeros((4, 4), dtype=np.uint8), 1.0),
+    (np.zeros((2, 4, 4), dtype=np.uint8), 0.4),
+])
+def test_preprocess_stack_rejects(stack, scale):
+    with pytest.raises(ConfigurationError):
+        preprocess_stack(stack, scale=scale)
+
+
+def test_decode_array_batch_tags_frame_index(fake_zbar):
+    def responder(image, **kwargs):
+        if not np.asarray(image).any():
+            return []
+        return [ZbarDecoded(b"A1", "CODE128", Rect(1, 2, 3, 4), [], 1, None)]
+
+    fake_zbar.responder = responder
+    stack = np.zeros((3, 8, 8, 3), dtype=np.uint8)
+    stack[1] = 255
+
+    results = BarcodeDecoder().decode_array_batch(stack, max_workers=2, scale=0.5, filename="burst")
+
+    assert [size for size, _ in fake_zbar.calls] == [(4, 4)] * 3
+    assert [(r.page, r.filename, r.rect) for r in results] == [(1, "burst", (2, 4, 6, 8))]
+
+
+def test_decode_array_batch_keeps_bottom_origin_rects_on_odd_heights(fake_dmtx, fake_zbar):
+    fake_dmtx.responder = lambda image, **kwargs: [DmtxDecoded(b"x", Rect(1, 2, 3, 4))]
+    fake_zbar.responder = lambda image, **kwargs: [ZbarDecoded(b"A1", "CODE128", Rect(1, 2, 3, 4), [], 1, None)]
+    stack = np.full((1, 9, 8), 255, dtype=np.uint8)
+
+    (datamatrix,) = DataMatrixDecoder().decode_array_batch(stack, scale=0.5)
+    (code128,) = BarcodeDecoder(formats=["code128"]).decode_array_batch(stack, scale=0.5)
+
+    # Row 8 is dropped before halving; a top measured from the bottom edge counts it back
+    assert datamatrix.rect == (2, 5, 6, 8)
+    assert code128.rect == (2, 4, 6, 8)
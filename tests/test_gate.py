@@ -0,0 +1,87 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from datamatrix_decoder import DataMatrixDecoder
+from datamatrix_decoder.core.exceptions import ConfigurationError
+from datamatrix_decoder.core.gate import BlankFrameGate, symbol_score
+from datamatrix_decoder.core.session import DecoderSession
+from conftest import DmtxDecoded, Rect
+
+
+def blank(shape=(480, 640)):
+    rng = np.random.default_rng(0)
+    return np.clip(180 + rng.integers(-4, 5, size=shape), 0, 255).astype(np.uint8)
+
+
+def with_symbol(shape=(480, 640), module=8):
+    frame = blank(shape)
+    rng = np.random.default_rng(1)
+    modules = rng.integers(0, 2, size=(16, 16)).astype(np.uint8) * 255
+    frame[100:100 + 16 * module, 200:200 + 16 * module] = np.kron(modules, np.ones((module, module), np.uint8))
+    return frame
+
+
+def test_score_separates_blank_and_symbol_frames():
+    assert symbol_score(blank()) < 0.05
+    assert symbol_score(with_symbol()) > 0.3
+    assert symbol_score(Image.fromarray(with_symbol()).convert("RGB")) > 0.3
+
+
+def test_tiny_frames_are_admitted():
+    assert symbol_score(np.zeros((4, 4), np.uint8)) == 1.0
+
+
+def test_gate_rejects_blank_frames_and_reports():
+    gate = BlankFrameGate()
+    decode = lambda frame: ["hit"]
+
+    assert gate.run(blank(), decode) == []
+    assert gate.run(with_symbol(), decode) == ["hit"]
+    assert gate.to_dict()["reject_rate"] == 0.5
+    assert gate.false_reject_rate is None
+
+
+def test_sensitivity_one_admits_everything():
+    assert BlankFrameGate(sensitivity=1).admits(blank())
+    with pytest.raises(ConfigurationError):
+        BlankFrameGate(sensitivity=2)
+
+
+def test_sampled_rejects_measure_false_rejects():
+    gate = BlankFrameGate(sample_rate=1.0, seed=0)
+
+    assert gate.run(blank(), lambda frame: ["faint"]) == ["faint"]
+    assert gate.run(blank(), lambda frame: []) == []
+    assert (gate.rejected, gate.sampled, gate.false_rejects) == (2, 2, 1)
+    assert gate.false_reject_rate == 0.5
+
+
+def test_decoder_skips_engine_for_blank_frames(fake_dmtx):
+    fake_dmtx.responder = lambda image, **kwargs: [DmtxDecoded(b"x", Rect(0, 0, 1, 1))]
+    gate = BlankFrameGate()
+    decoder = DataMatrixDecoder(gate=gate)
+
+    assert decoder.decode_frame(blank()) is None
+    assert decoder.decode_frame(with_symbol()).data == "x"
+    assert len(fake_dmtx.calls) == 1
+    assert gate.rejected == 1
+
+
+def test_gated_decoder_runs_in_a_process_session(fake_dmtx, tmp_path):
+    fake_dmtx.responder = lambda image, **kwargs: [DmtxDecoded(b"x", Rect(0, 0, 1, 1))]
+    paths = []
+    for name, frame in (("blank.png", blank()), ("symbol.png", with_symbol())):
+        Image.fromarray(frame).save(tmp_path / name)
+        paths.append(tmp_path / name)
+    gate = BlankFrameGate()
+    context = multiprocessing.get_context("fork")
+
+    with DecoderSession(DataMatrixDecoder(gate=gate), max_workers=1, kind="process", mp_context=context) as session:
+        assert session.decode_image(paths[0]) == []
+        assert session.decode_image(paths[1])[0].data == "x"
+
+    # Counters live in the worker processes
+    assert gate.checked == 0
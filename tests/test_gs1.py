@@ -0,0 +1,49 @@
+from datetime import date
+
+import pytest
+
+from datamatrix_decoder import DecodeResult, GS1Error, ResultSet, parse_gs1, parse_gs1_batch
+from datamatrix_decoder.core.gs1 import check_digit_ok, gs1_date
+
+
+PHARMA = b"\xe8" + b"0109506000134352" + b"17251231" + b"10ABC123\x1d" + b"21SN0001"
+
+
+def test_parse_fnc1_and_gs_separated_payload():
+    assert parse_gs1(PHARMA, validate=True) == {
+        "01": "09506000134352", "17": "251231", "10": "ABC123", "21": "SN0001",
+    }
+    assert parse_gs1(b"]d2" + PHARMA[1:])["21"] == "SN0001"
+
+
+def test_invalid_payloads_raise():
+    with pytest.raises(GS1Error):
+        parse_gs1(b"01123")
+    with pytest.raises(GS1Error):
+        parse_gs1(b"0109506000134353", validate=True)
+    with pytest.raises(GS1Error):
+        parse_gs1(b"hello")
+
+
+def test_binary_payload_keeps_raw_bytes():
+    result = DecodeResult(raw=PHARMA, format="datamatrix")
+
+    assert result.raw == PHARMA
+    assert result.data.startswith("è01")
+
+
+def test_batch_parse_over_result_set():
+    results = ResultSet([
+        DecodeResult(raw=PHARMA, format="datamatrix"),
+        DecodeResult("not gs1", format="qrcode"),
+    ])
+
+    columns = parse_gs1_batch(results.iter_raw(), ais=("01", "21"))
+
+    assert columns == {"01": ["09506000134352", None], "21": ["SN0001", None]}
+
+
+def test_helpers():
+    assert check_digit_ok("09506000134352")
+    assert gs1_date("250200", today=date(2026, 1, 1)) == date(2025, 2, 28)
+    assert gs1_date("990101", today=date(2026, 1, 1)) == date(1999, 1, 1)
@@ -0,0 +1,148 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+from click.testing import CliRunner
+
+from datamatrix_decoder import BarcodeDecoder, ConfigurationError, DecodeResult
+from datamatrix_decoder.cli.main import cli
+from datamatrix_decoder.core.jobqueue import JobQueue, run_worker
+from conftest import Rect, ZbarDecoded
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def queue_path(tmp_path):
+    return tmp_path / "jobs.db"
+
+
+def test_enqueue_ignores_known_paths(queue_path):
+    with JobQueue(queue_path) as queue:
+        assert queue.enqueue(["a.png", "b.png"]) == 2
+        assert queue.enqueue(["b.png", "c.png"]) == 1
+        assert queue.counts() == {"queued": 3, "leased": 0, "done": 0, "failed": 0}
+
+
+def test_competing_claims_are_disjoint(queue_path):
+    with JobQueue(queue_path) as queue:
+        queue.enqueue(f"{i}.png" for i in range(200))
+    claimed = []
+
+    def drain(name):
+        with JobQueue(queue_path) as queue:
+            while True:
+                jobs = queue.claim(name, 7)
+                if not jobs:
+                    return
+                claimed.extend(job.path for job in jobs)
+
+    threads = [threading.Thread(target=drain, args=(f"w{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == sorted(f"{i}.png" for i in range(200))
+
+
+def test_expired_lease_is_requeued_then_failed(queue_path):
+    clock = Clock()
+    with JobQueue(queue_path, lease=10, max_attempts=2, clock=clock) as queue:
+        queue.enqueue(["a.png"])
+        first = queue.claim("crashed")
+        clock.now += 5
+        assert queue.claim("other") == []
+
+        clock.now += 6
+        second = queue.claim("other")
+        assert [(job.path, job.attempts) for job in second] == [("a.png", 2)]
+        # The first worker's late outcome no longer counts
+        assert queue.complete("crashed", [(first[0], [DecodeResult(data="X")], None)]) == 0
+
+        clock.now += 11
+        assert queue.claim("third") == []
+        assert queue.failures() == [("a.png", "lease expired")]
+
+
+def test_complete_records_results_and_retries_errors(queue_path):
+    with JobQueue(queue_path, max_attempts=2) as queue:
+        queue.enqueue(["a.png", "b.png"])
+        a, b = queue.claim("w", 2)
+        result = DecodeResult(data="A1", format="code128", rect=(1, 2, 3, 4), elapsed=0.1)
+
+        assert queue.complete("w", [(a, [result], None), (b, [], "corrupt")]) == 2
+        assert queue.counts()["queued"] == 1
+
+        (b,) = queue.claim("w", 2)
+        queue.complete("w", [(b, [], "corrupt")])
+
+        assert queue.counts() == {"queued": 0, "leased": 0, "done": 1, "failed": 1}
+        assert [(r.data, r.rect, r.filename) for r in queue.results()] == [("A1", (1, 2, 3, 4), "a.png")]
+
+
+def test_reopening_without_wal_leaves_wal_mode(queue_path):
+    with JobQueue(queue_path) as queue:
+        queue.enqueue(["a.png"])
+        with pytest.raises(ConfigurationError):
+            JobQueue(queue_path, wal=False)
+
+    with JobQueue(queue_path, wal=False) as queue:
+        assert queue.counts()["queued"] == 1
+
+    db = sqlite3.connect(queue_path)
+    assert db.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    db.close()
+
+
+def test_run_worker_renews_leases_of_slow_batches(fake_zbar, make_image, queue_path):
+    stolen = []
+
+    def responder(image, **kwargs):
+        time.sleep(0.5)
+        with JobQueue(queue_path, lease=0.2) as other:
+            stolen.extend(other.claim("thief"))
+        return [ZbarDecoded(b"A1", "CODE128", Rect(0, 0, 4, 4), [], 1, None)]
+
+    fake_zbar.responder = responder
+    with JobQueue(queue_path, lease=0.2) as queue:
+        queue.enqueue([make_image("slow.png")])
+
+        run_worker(BarcodeDecoder(), queue, max_workers=1, exit_when_empty=True)
+
+        assert stolen == []
+        assert queue.counts()["done"] == 1
+
+
+def test_run_worker_drains_queue(fake_zbar, make_image, queue_path):
+    fake_zbar.responder = lambda image, **kwargs: [ZbarDecoded(b"A1", "CODE128", Rect(0, 0, 4, 4), [], 1, None)]
+    paths = [make_image(f"{i}.png") for i in range(5)]
+    with JobQueue(queue_path) as queue:
+        queue.enqueue(paths)
+
+        stats = run_worker(BarcodeDecoder(), queue, max_workers=2, batch_size=2, exit_when_empty=True)
+
+        assert (stats.total, stats.decoded) == (5, 5)
+        assert queue.counts()["done"] == 5
+        assert sorted(r.filename for r in queue.results()) == sorted(map(str, paths))
+
+
+def test_enqueue_and_worker_commands(fake_zbar, make_image, tmp_path, queue_path):
+    fake_zbar.responder = lambda image, **kwargs: [ZbarDecoded(b"A1", "CODE128", Rect(0, 0, 4, 4), [], 1, None)]
+    make_image("a.png")
+    make_image("b.png")
+    runner = CliRunner()
+
+    queued = runner.invoke(cli, ["enqueue", str(queue_path), str(tmp_path)])
+    worked = runner.invoke(cli, ["worker", str(queue_path), "--exit-when-empty", "-o", str(tmp_path / "out.csv")])
+
+    assert queued.exit_code == 0, queued.output
+    assert worked.exit_code == 0, worked.output
+    assert len((tmp_path / "out.csv").read_text().splitlines()) == 3
@@ -0,0 +1,138 @@
+import pytest
+from PIL import Image, ImageOps
+
+from datamatrix_decoder import BarcodeDecoder, DataMatrixDecoder, Zone, load_layout
+from datamatrix_decoder.core.exceptions import ConfigurationError
+from datamatrix_decoder.core.layout import parse_layout
+from conftest import DmtxDecoded, Rect, ZbarDecoded
+
+
+LAYOUT = {
+    "name": "form",
+    "zones": [
+        {"name": "tracking", "box": [0.5, 0.0, 1.0, 0.5], "formats": ["code128"]},
+        {"name": "lot", "box": [0.0, 0.5, 0.5, 1.0], "formats": ["code128"]},
+    ],
+}
+
+
+@pytest.fixture
+def form(tmp_path):
+    """200x200 page with one dark 'symbol' in the top-right quadrant."""
+    path = tmp_path / "form.png"
+    image = Image.new("L", (200, 200), 255)
+    image.paste(0, (140, 40, 160, 60))
+    image.save(path)
+    return path
+
+
+def zbar_responder(image, **kwargs):
+    box = ImageOps.invert(image.convert("L")).getbbox()
+    if box is None:
+        return []
+    rect = Rect(box[0], box[1], box[2] - box[0], box[3] - box[1])
+    return [ZbarDecoded(b"T1", "CODE128", rect, [], 1, None)]
+
+
+def test_load_layout(tmp_path):
+    path = tmp_path / "form.yaml"
+    path.write_text(
+        "zones:\n"
+        "  - name: label\n"
+        "    box: [0.1, 0.2, 0.3, 0.4]\n"
+        "    formats: [datamatrix]\n"
+        "    symbol_size: 0.1\n"
+    )
+
+    layout = load_layout(path)
+
+    assert layout.name == "form"
+    assert layout.zones == (Zone("label", (0.1, 0.2, 0.3, 0.4), ("datamatrix",), 0.1),)
+
+
+@pytest.mark.parametrize("zone", [
+    {"name": "a", "box": [0.5, 0.0, 0.4, 1.0]},
+    {"name": "a", "box": [0, 0, 1]},
+    {"name": "a", "box": [0, 0, 1, 1], "formats": ["maxicode"]},
+    {"name": "a", "box": [0, 0, 1, 1], "symbol_size": 2},
+    {"name": "a", "box": [0, 0, 1, 1], "colour": "red"},
+])
+def test_invalid_zones(zone):
+    with pytest.raises(ConfigurationError):
+        parse_layout({"zones": [zone]})
+
+
+def test_duplicate_zone_names():
+    zone = {"name": "a", "box": [0, 0, 1, 1]}
+    with pytest.raises(ConfigurationError):
+        parse_layout({"zones": [zone, zone]})
+
+
+def test_pixel_box_is_padded_and_clamped():
+    zone = Zone("a", (0.1, 0.0, 0.5, 0.5), symbol_size=0.2)
+
+    assert zone.pixel_box((200, 100)) == (10, 0, 110, 60)
+
+
+def test_only_zones_are_searched(fake_zbar, form):
+    fake_zbar.responder = zbar_responder
+
+    found = BarcodeDecoder().decode_layout(form, parse_layout(LAYOUT), fallback=False)
+
+    assert sorted(size for size, _ in fake_zbar.calls) == [(100, 100), (100, 100)]
+    assert [(r.data, r.rect) for r in found["tracking"]] == [("T1", (140, 40, 20, 20))]
+    assert found["lot"] == []
+
+
+def test_missed_zone_falls_back_to_page_search(fake_zbar, form):
+    fake_zbar.responder = zbar_responder
+    layout = parse_layout({"zones": [{"name": "lot", "box": [0.0, 0.5, 0.5, 1.0]}]})
+
+    found = BarcodeDecoder().decode_layout(form, layout)
+
+    assert [size for size, _ in fake_zbar.calls] == [(100, 100), (200, 200)]
+    assert [r.rect for r in found["lot"]] == [(140, 40, 20, 20)]
+
+
+def test_fallback_skips_formats_no_zone_expects(fake_zbar, form):
+    fake_zbar.responder = zbar_responder
+    layout = parse_layout({"zones": [{"name": "lot", "box": [0.0, 0.5, 0.5, 1.0], "formats": ["ean13"]}]})
+
+    assert BarcodeDecoder().decode_layout(form, layout) == {"lot": []}
+
+
+def test_datamatrix_zone_rects_use_bottom_origin(fake_dmtx, form):
+    def responder(image, **kwargs):
+        box = ImageOps.invert(image.convert("L")).getbbox()
+        if box is None:
+            return []
+        # libdmtx reports top from the bottom edge
+        return [DmtxDecoded(b"DM", Rect(box[0], image.height - box[3], 20, 20))]
+
+    fake_dmtx.responder = responder
+    layout = parse_layout({"zones": [{"name": "label", "box": [0.5, 0.0, 1.0, 0.5], "formats": ["datamatrix"]}]})
+
+    found = DataMatrixDecoder().decode_layout(form, layout)
+
+    assert [r.rect for r in found["label"]] == [(140, 140, 20, 20)]
+
+
+def test_mixed_layout_sends_each_zone_to_its_engine(fake_dmtx, fake_zbar, form):
+    # A second 'symbol' in the bottom-left quadrant for the Data Matrix zone
+    with Image.open(form) as image:
+        image.paste(0, (40, 140, 60, 160))
+        image.save(form)
+    fake_zbar.responder = zbar_responder
+    fake_dmtx.responder = lambda image, **kwargs: [DmtxDecoded(b"DM", Rect(40, 40, 20, 20))]
+    layout = parse_layout({"zones": [
+        {"name": "tracking", "box": [0.5, 0.0, 1.0, 0.5], "formats": ["code128"]},
+        {"name": "certificate", "box": [0.0, 0.5, 0.5, 1.0], "formats": ["datamatrix"]},
+    ]})
+
+    found = BarcodeDecoder().decode_layout(form, layout)
+
+    # One crop per engine and no full-page fallback
+    assert [size for size, _ in fake_zbar.calls] == [(100, 100)]
+    assert [size for size, _ in fake_dmtx.calls] == [(100, 100)]
+    assert [(r.data, r.rect) for r in found["tracking"]] == [("T1", (140, 40, 20, 20))]
+    assert [(r.data, r.format, r.rect) for r in found["certificate"]] == [("DM", "datamatrix", (40, 40, 20, 20))]
@@ -0,0 +1,82 @@
+import pytest
+
+from datamatrix_decoder import BatchStats, DataMatrixDecoder
+from datamatrix_decoder.core.exceptions import ConfigurationError
+from datamatrix_decoder.core.prefetch import Prefetcher, read_file
+from conftest import DmtxDecoded, Rect
+
+
+def write_files(tmp_path, sizes):
+    paths = []
+    for i, size in enumerate(sizes):
+        path = tmp_path / f"{i}.bin"
+        path.write_bytes(bytes([i % 256]) * size)
+        paths.append(path)
+    return paths
+
+
+def test_read_file_in_chunks(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(range(256)) * 40)
+
+    assert read_file(path, chunk_size=1000) == path.read_bytes()
+
+
+def test_prefetcher_returns_contents_in_order(tmp_path):
+    paths = write_files(tmp_path, [100] * 10)
+
+    with Prefetcher(paths, io_workers=3, max_bytes=250) as prefetcher:
+        for i, path in enumerate(paths):
+            assert prefetcher.take(path) == bytes([i]) * 100
+
+    assert prefetcher.peak_bytes <= 250
+
+
+def test_oversized_file_is_read_alone(tmp_path):
+    paths = write_files(tmp_path, [10, 1000, 10])
+
+    with Prefetcher(paths, max_bytes=100) as prefetcher:
+        assert [len(prefetcher.take(path)) for path in paths] == [10, 1000, 10]
+
+    assert prefetcher.peak_bytes == 1000
+
+
+def test_unlisted_and_missing_files(tmp_path):
+    paths = write_files(tmp_path, [10, 20])
+    missing = tmp_path / "missing.bin"
+
+    with Prefetcher([paths[0], missing]) as prefetcher:
+        assert len(prefetcher.take(paths[1])) == 20
+        with pytest.raises(OSError):
+            prefetcher.take(missing)
+
+
+def test_close_stops_blocked_feeder(tmp_path):
+    paths = write_files(tmp_path, [100] * 5)
+
+    prefetcher = Prefetcher(paths, max_bytes=100)
+    prefetcher.close()
+
+    assert prefetcher.peak_bytes <= 100
+
+
+def test_invalid_settings():
+    with pytest.raises(ConfigurationError):
+        Prefetcher([], io_workers=0)
+    with pytest.raises(ConfigurationError):
+        Prefetcher([], max_bytes=0)
+
+
+def test_batch_with_prefetch(fake_dmtx, make_image, tmp_path):
+    paths = [make_image(f"{i}.png", size=(40, 40)) for i in range(8)]
+    fake_dmtx.responder = lambda image, **kwargs: [DmtxDecoded(b"x", Rect(0, 0, 1, 1))]
+    stats = BatchStats()
+
+    results = DataMatrixDecoder().decode_batch(
+        paths + [tmp_path / "missing.png"], max_workers=2, prefetch=2, stats=stats
+    )
+
+    assert sorted(result.filename for result in results) == sorted(str(path) for path in paths)
+    assert stats.decoded == 8
+    assert stats.failed == 1
+    assert stats.io_wait >= 0
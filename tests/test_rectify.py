@@ -0,0 +1,134 @@
+import pickle
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from datamatrix_decoder import DataMatrixDecoder
+from datamatrix_decoder.core import rectify
+from datamatrix_decoder.core.exceptions import ConfigurationError
+from datamatrix_decoder.core.rectify import CameraCalibration, Rectifier, load_calibrations, parse_calibrations
+
+
+CAMERA = {
+    "size": [200, 100],
+    "camera_matrix": [[150, 0, 100], [0, 150, 50], [0, 0, 1]],
+    "dist_coeffs": [-0.2, 0.05, 0, 0, 0],
+    "homography": [[1, 0, 10], [0, 1, 20], [0, 0, 1]],
+    "output_size": [180, 90],
+}
+
+
+def test_load_calibrations(tmp_path):
+    path = tmp_path / "cameras.yaml"
+    path.write_text("cameras:\n  line-3:\n    size: [640, 480]\n    camera_matrix: [[500, 0, 320], [0, 500, 240], [0, 0, 1]]\n")
+
+    calibration = load_calibrations(path)["line-3"]
+
+    assert calibration.size == (640, 480)
+    assert calibration.camera_matrix[0] == (500.0, 0.0, 320.0)
+    assert calibration.homography is None
+
+
+@pytest.mark.parametrize("change", [
+    {"size": [200]},
+    {"camera_matrix": [[1, 0], [0, 1]]},
+    {"dist_coeffs": [0.1, 0.2, 0.3]},
+    {"lens": "wide"},
+])
+def test_invalid_calibrations(change):
+    with pytest.raises(ConfigurationError):
+        parse_calibrations({"cameras": {"cam": {**CAMERA, **change}}})
+
+
+def test_calibration_scales_to_other_resolutions():
+    calibration = parse_calibrations({"cameras": {"cam": CAMERA}})["cam"]
+
+    camera_matrix, dist_coeffs, homography, output_size = calibration.scaled((100, 50))
+
+    assert camera_matrix[0].tolist() == [75, 0, 50]
+    assert camera_matrix[1].tolist() == [0, 75, 25]
+    assert dist_coeffs.tolist() == CAMERA["dist_coeffs"]
+    assert homography[:2, 2].tolist() == [5, 10]
+    assert output_size == (90, 45)
+
+
+def test_rectifier_needs_opencv(monkeypatch):
+    monkeypatch.setattr(rectify, "cv2", None)
+    with pytest.raises(ImportError):
+        Rectifier(CameraCalibration("cam", (2, 2), ((1, 0, 1), (0, 1, 1), (0, 0, 1))))
+
+
+def test_remap_tables_are_cached():
+    pytest.importorskip("cv2")
+    calibration = CameraCalibration("cam", (64, 48), ((60, 0, 32), (0, 60, 24), (0, 0, 1)))
+    rectifier = Rectifier(calibration)
+    frame = np.random.default_rng(0).integers(0, 256, size=(48, 64), dtype=np.uint8)
+
+    corrected = rectifier.apply(frame)
+
+    # No distortion and no homography: the remap is the identity
+    assert np.abs(corrected.astype(int) - frame).max() <= 1
+    assert rectifier.maps((64, 48)) is rectifier.maps((64, 48))
+    assert rectifier.apply(frame, roi=(8, 4, 40, 20)).shape == (16, 32)
+
+
+class ShrinkingRectifier:
+    def __init__(self):
+        self.rois = []
+
+    def apply(self, image, roi=None):
+        self.rois.append(roi)
+        return np.full((10, 20), 255, dtype=np.uint8)
+
+
+def test_decoder_decodes_rectified_image(fake_dmtx, make_image):
+    decoder = DataMatrixDecoder(rectifier=ShrinkingRectifier())
+
+    decoder.decode_image(make_image("oblique.png", size=(64, 64)))
+    decoder.decode_frame(np.zeros((30, 30), dtype=np.uint8))
+
+    assert [size for size, _ in fake_dmtx.calls] == [(20, 10), (20, 10)]
+
+
+def test_decoder_passes_its_roi_to_the_rectifier(fake_dmtx, make_image):
+    rectifier = ShrinkingRectifier()
+    decoder = DataMatrixDecoder(rectifier=rectifier, roi=(4, 2, 24, 12))
+
+    decoder.decode_image(make_image("oblique.png", size=(64, 64)))
+    decoder.decode_frame(np.zeros((30, 30), dtype=np.uint8))
+
+    assert rectifier.rois == [(4, 2, 24, 12)] * 2
+    with pytest.raises(ConfigurationError):
+        DataMatrixDecoder(roi=(4, 2, 24, 12))
+    with pytest.raises(ConfigurationError):
+        DataMatrixDecoder(rectifier=rectifier, roi=(4, 2, 4, 12))
+
+
+def test_rectifier_pickles_without_its_tables(monkeypatch):
+    monkeypatch.setattr(rectify, "cv2", SimpleNamespace(INTER_LINEAR=1))
+    rectifier = Rectifier(CameraCalibration("cam", (64, 48), ((60, 0, 32), (0, 60, 24), (0, 0, 1))))
+    rectifier._maps[((64, 48), None)] = (np.zeros((48, 64, 2), np.int16), np.zeros((48, 64), np.uint16))
+
+    copy = pickle.loads(pickle.dumps(rectifier))
+
+    assert copy.calibration == rectifier.calibration
+    assert copy._maps == {}
+    assert copy._lock is not rectifier._lock
+
+
+@pytest.mark.parametrize("mode", ["P", "1"])
+def test_palette_and_bilevel_images_are_remapped_as_gray(monkeypatch, mode):
+    remapped = []
+    fake_cv2 = SimpleNamespace(
+        INTER_LINEAR=1, BORDER_CONSTANT=0, remap=lambda pixels, *args, **kwargs: remapped.append(pixels) or pixels
+    )
+    monkeypatch.setattr(rectify, "cv2", fake_cv2)
+    rectifier = Rectifier(CameraCalibration("cam", (32, 32), ((30, 0, 16), (0, 30, 16), (0, 0, 1))))
+    monkeypatch.setattr(rectifier, "maps", lambda size, roi=None: (None, None))
+
+    rectifier.apply(Image.new("L", (32, 32), 255).convert(mode))
+
+    assert remapped[0].dtype == np.uint8
+    assert remapped[0].min() == 255
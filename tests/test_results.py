@@ -0,0 +1,62 @@
+import csv
+import io
+import json
+
+from datamatrix_decoder import DecodeResult, ResultSet
+
+
+def _results():
+    return [
+        DecodeResult("ABC", "datamatrix", rect=(1, 2, 3, 4), filename="a.png", elapsed=0.5),
+        DecodeResult("ünïcode", "code128", filename="a.png", page=2),
+        DecodeResult("XYZ", "datamatrix", rect=(5, 6, -7, 8), filename="b.png"),
+    ]
+
+
+def test_decode_result_is_slotted():
+    result = DecodeResult("x", "qrcode")
+
+    assert not hasattr(result, "__dict__")
+    assert result.to_dict() == {
+        "data": "x", "format": "qrcode", "rect": None, "filename": None, "elapsed": None, "page": None,
+    }
+
+
+def test_round_trip_through_columns():
+    results = ResultSet(_results())
+
+    assert len(results) == 3
+    assert list(results) == _results()
+    assert results[-1].rect == (5, 6, -7, 8)
+    assert results.column("format") == ["datamatrix", "code128", "datamatrix"]
+
+
+def test_filter_by_codes_and_predicate():
+    results = ResultSet(_results())
+
+    assert results.filter(format="datamatrix").column("data") == ["ABC", "XYZ"]
+    assert results.filter(format="datamatrix", filename="a.png").column("data") == ["ABC"]
+    assert results.filter(predicate=lambda data: data.startswith("X")).column("data") == ["XYZ"]
+    assert len(results.filter(format="pdf417")) == 0
+
+
+def test_json_export_matches_to_dict():
+    out = io.StringIO()
+    ResultSet(_results()).to_json(out)
+
+    assert json.loads(out.getvalue()) == [r.to_dict() for r in _results()]
+
+    empty = io.StringIO()
+    ResultSet().to_json(empty)
+    assert json.loads(empty.getvalue()) == []
+
+
+def test_jsonl_and_csv_export():
+    lines = io.StringIO()
+    ResultSet(_results()).to_jsonl(lines)
+    assert [json.loads(line)["data"] for line in lines.getvalue().splitlines()] == ["ABC", "ünïcode", "XYZ"]
+
+    table = io.StringIO()
+    ResultSet(_results()).to_csv(table)
+    rows = list(csv.DictReader(io.StringIO(table.getvalue())))
+    assert rows[0]["left"] == "1" and rows[1]["left"] == "" and rows[1]["page"] == "2"
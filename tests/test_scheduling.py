@@ -0,0 +1,38 @@
+import pytest
+
+from datamatrix_decoder import BatchStats, DataMatrixDecoder
+from datamatrix_decoder.core.exceptions import ConfigurationError
+from datamatrix_decoder.core.scheduling import estimate_cost, order_by_cost, read_header
+
+
+def test_read_header_does_not_need_pixels(make_image):
+    header = read_header(make_image("a.png", size=(40, 30)))
+
+    assert (header.width, header.height, header.format, header.mode) == (40, 30, "PNG", "L")
+    assert estimate_cost(header) == pytest.approx(40 * 30 / 1e6)
+
+
+def test_unreadable_header_costs_nothing(tmp_path):
+    path = tmp_path / "broken.png"
+    path.write_bytes(b"not an image")
+
+    assert read_header(path) is None
+    assert estimate_cost(None) == 0.0
+
+
+def test_largest_first_submits_big_images_first(fake_dmtx, make_image):
+    small = make_image("small.png", size=(10, 10))
+    big = make_image("big.png", size=(200, 200))
+    medium = make_image("medium.png", size=(50, 50))
+    stats = BatchStats()
+
+    DataMatrixDecoder().decode_batch([small, big, medium], max_workers=1, stats=stats, schedule="largest-first")
+
+    assert [size for size, _ in fake_dmtx.calls] == [(200, 200), (50, 50), (10, 10)]
+    assert {c.filename: c.estimated for c in stats.costs}[str(big)] == pytest.approx(0.04)
+    assert all(c.actual > 0 for c in stats.costs)
+
+
+def test_unknown_schedule_is_rejected():
+    with pytest.raises(ConfigurationError):
+        order_by_cost([], {}, "random")
@@ -0,0 +1,98 @@
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from datamatrix_decoder import DataMatrixDecoder, DecoderError, DEFAULT_TIERS
+from datamatrix_decoder.core.session import WARM_UP_SIZE, DecoderSession
+from conftest import DmtxDecoded, Rect
+
+
+@pytest.fixture
+def threads_seen(fake_dmtx):
+    seen = []
+
+    def responder(image, **kwargs):
+        seen.append(threading.current_thread().name)
+        return [DmtxDecoded(b"ok", Rect(0, 0, 1, 1))] if image.size != WARM_UP_SIZE else []
+
+    fake_dmtx.responder = responder
+    return seen
+
+
+def test_warm_up_primes_every_worker(fake_dmtx, threads_seen):
+    with DecoderSession(DataMatrixDecoder(), max_workers=3):
+        pass
+
+    assert [size for size, _ in fake_dmtx.calls] == [WARM_UP_SIZE] * 3
+    assert len(set(threads_seen)) == 3
+
+
+def test_all_calls_share_the_session_executor(threads_seen, make_image):
+    paths = [make_image(f"{i}.png", size=(32 + i, 32)) for i in range(6)]
+    with DecoderSession(DataMatrixDecoder(), max_workers=2, warm_up=False) as session:
+        assert session.decode_image(paths[0])[0].data == "ok"
+        assert len(session.decode_batch(paths, tiers=DEFAULT_TIERS)) == 6
+        assert [path for path, _ in session.stream(iter(paths), window=2)] == paths
+
+    assert all(name.startswith("decoder") for name in threads_seen)
+    assert len(set(threads_seen)) <= 2
+
+
+def test_closed_session_rejects_work(fake_dmtx, make_image):
+    session = DecoderSession(DataMatrixDecoder(), max_workers=1, warm_up=False)
+    session.close()
+    session.close()
+
+    with pytest.raises(DecoderError):
+        session.decode_image(make_image("a.png"))
+
+
+def test_close_without_drain_cancels_queued_work(fake_dmtx, make_image):
+    release = threading.Event()
+    fake_dmtx.responder = lambda image, **kwargs: release.wait(5) and []
+    session = DecoderSession(DataMatrixDecoder(), max_workers=1, warm_up=False)
+    running = session.submit(make_image("a.png"))
+    queued = session.submit(make_image("b.png"))
+
+    closer = threading.Thread(target=session.close, kwargs={"drain": False})
+    closer.start()
+    deadline = time.monotonic() + 5
+    while not queued.cancelled() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    closer.join()
+
+    assert queued.cancelled()
+    assert running.result() == []
+
+
+def test_process_session(fake_dmtx, make_image):
+    fake_dmtx.responder = lambda image, **kwargs: [DmtxDecoded(b"p", Rect(0, 0, 1, 1))]
+    context = multiprocessing.get_context("fork")
+    with DecoderSession(DataMatrixDecoder(), max_workers=2, kind="process", mp_context=context) as session:
+        assert session.decode_image(make_image("a.png"))[0].data == "p"
+        assert len(session.decode_batch([make_image("b.png"), make_image("c.png")])) == 2
+
+
+class CountedDecoder(DataMatrixDecoder):
+    pickled = 0
+
+    def __getstate__(self):
+        CountedDecoder.pickled += 1
+        return self.__dict__.copy()
+
+
+def test_process_session_tasks_carry_only_paths(fake_dmtx, make_image):
+    fake_dmtx.responder = lambda image, **kwargs: [DmtxDecoded(b"p", Rect(0, 0, 1, 1))]
+    paths = [make_image(f"{i}.png") for i in range(4)]
+    context = multiprocessing.get_context("fork")
+    CountedDecoder.pickled = 0
+
+    with DecoderSession(CountedDecoder(), max_workers=2, kind="process", mp_context=context) as session:
+        assert len(session.decode_batch(paths, tiers=DEFAULT_TIERS)) == 4
+        assert session.decode_image(paths[0])[0].data == "p"
+
+    # Forked workers inherit the decoder from the initializer's arguments
+    assert CountedDecoder.pickled == 0
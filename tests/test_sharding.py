@@ -0,0 +1,101 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from datamatrix_decoder import DecodeResult, ResultSet, parse_gs1
+from datamatrix_decoder.cli.main import cli
+from datamatrix_decoder.core.exceptions import ConfigurationError
+from datamatrix_decoder.core.sharding import merge_stats, parse_shard, read_jsonl, select_shard, shard_of
+
+
+def test_parse_shard():
+    assert parse_shard("2/8") == (2, 8)
+
+
+@pytest.mark.parametrize("spec", ["0/4", "5/4", "2", "a/b", "1/2/3"])
+def test_invalid_shards(spec):
+    with pytest.raises(ConfigurationError):
+        parse_shard(spec)
+
+
+def test_shards_partition_paths_independent_of_mount_point():
+    names = [f"sub/img{i:04d}.png" for i in range(400)]
+    shards = [select_shard([f"/mnt/a/{name}" for name in names], index, 4, root="/mnt/a") for index in range(1, 5)]
+
+    assert sorted(p.relative_to("/mnt/a").as_posix() for shard in shards for p in shard) == names
+    assert all(60 < len(shard) < 140 for shard in shards)
+    assert select_shard([f"/data/{name}" for name in names], 3, 4, root="/data") == [
+        "/data" / p.relative_to("/mnt/a") for p in shards[2]
+    ]
+    assert shard_of("sub/img0000.png", 4) == shard_of("sub/img0000.png", 4)
+
+
+def test_read_jsonl_round_trip(tmp_path):
+    results = [
+        DecodeResult(data="A1", format="code128", rect=(1, 2, 3, 4), filename="a.png", elapsed=0.5),
+        DecodeResult(data="B2", format="datamatrix", filename="b.png", page=3),
+    ]
+    path = tmp_path / "out.jsonl"
+    with open(path, "w") as f:
+        ResultSet(results).to_jsonl(f)
+
+    with open(path) as f:
+        assert list(read_jsonl(f)) == results
+
+
+def test_read_jsonl_keeps_non_utf8_payload_bytes(tmp_path):
+    # FNC1 (0xE8) makes the payload invalid UTF-8
+    gs1 = DecodeResult(raw=b"\xe8010345312000001110LOT1", format="datamatrix", filename="a.png")
+    path = tmp_path / "out.jsonl"
+    with open(path, "w") as f:
+        ResultSet([gs1]).to_jsonl(f)
+
+    with open(path) as f:
+        (merged,) = read_jsonl(f)
+
+    assert merged.raw == gs1.raw
+    assert parse_gs1(merged.raw) == parse_gs1(gs1.raw)
+
+
+def test_merge_stats():
+    merged = merge_stats([
+        {"shard": "1/3", "total": 10, "decoded": 8, "failed": 2, "elapsed": 4.0,
+         "tier_successes": {"fast": 8}, "peak_rss": 100, "workers": 4},
+        {"shard": "3/3", "total": 12, "decoded": 12, "failed": 0, "elapsed": 5.5,
+         "tier_successes": {"fast": 11, "thorough": 1}, "peak_rss": 150, "workers": 4},
+    ])
+
+    assert (merged["shards"], merged["total"], merged["decoded"], merged["failed"]) == (2, 22, 20, 2)
+    assert merged["elapsed"] == 5.5
+    assert merged["tier_successes"] == {"fast": 19, "thorough": 1}
+    assert (merged["peak_rss"], merged["workers"]) == (150, 8)
+    assert merged["missing"] == [2]
+
+
+@pytest.mark.parametrize("reports", [
+    [{"shard": "1/2"}, {"shard": "1/2"}],
+    [{"shard": "1/2"}, {"shard": "2/3"}],
+])
+def test_merge_stats_rejects_inconsistent_shards(reports):
+    with pytest.raises(ConfigurationError):
+        merge_stats(reports)
+
+
+def test_merge_command(tmp_path):
+    for index in (1, 2):
+        with open(tmp_path / f"shard{index}.jsonl", "w") as f:
+            ResultSet([DecodeResult(data=f"D{index}", format="code128", filename=f"{index}.png")]).to_jsonl(f)
+        (tmp_path / f"stats{index}.json").write_text(json.dumps({"shard": f"{index}/2", "total": 1, "decoded": 1}))
+
+    result = CliRunner().invoke(cli, [
+        "merge", str(tmp_path / "shard1.jsonl"), str(tmp_path / "shard2.jsonl"),
+        "-o", str(tmp_path / "all.csv"),
+        "--stats", str(tmp_path / "stats1.json"), "--stats", str(tmp_path / "stats2.json"),
+        "--stats-output", str(tmp_path / "report.json"),
+    ])
+
+    assert result.exit_code == 0, result.output
+    assert [line.split(",")[0] for line in (tmp_path / "all.csv").read_text().splitlines()] == ["data", "D1", "D2"]
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert (report["total"], report["missing"]) == (2, [])
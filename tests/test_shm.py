@@ -0,0 +1,46 @@
+import multiprocessing
+import pickle
+
+import numpy as np
+import pytest
+
+from datamatrix_decoder import DataMatrixDecoder, DecodeResult
+from datamatrix_decoder.core.exceptions import ConfigurationError
+from datamatrix_decoder.core.shm import SharedFrameExecutor, SharedFramePool, view_frame
+from conftest import DmtxDecoded, Rect
+
+
+def test_pool_round_trips_frames_through_reused_slots():
+    frame = np.arange(12, dtype=np.uint8).reshape(3, 4)
+    with SharedFramePool(slot_size=16, slots=1) as pool:
+        ref = pool.put(frame, filename="cam0", page=7)
+        assert np.array_equal(view_frame(ref), frame)
+        pool.release(ref)
+
+        again = pool.put(frame[::-1])
+        assert again.offset == ref.offset
+        assert np.array_equal(view_frame(again), frame[::-1])
+
+        with pytest.raises(ConfigurationError):
+            pool.put(np.zeros((5, 5), dtype=np.uint8))
+
+
+def test_results_are_small_and_picklable():
+    result = DecodeResult(raw=b"\xe8010", format="datamatrix", rect=(1, 2, 3, 4), page=3)
+
+    assert pickle.loads(pickle.dumps(result)) == result
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="fake engine needs fork")
+def test_workers_decode_from_shared_memory(fake_dmtx):
+    fake_dmtx.responder = lambda image, **kwargs: (
+        [DmtxDecoded(str(image.getpixel((0, 0))).encode(), Rect(0, 0, 1, 1))] if image.getpixel((0, 0)) else []
+    )
+    frames = [np.full((8, 8), value, dtype=np.uint8) for value in (5, 0, 9)]
+
+    with SharedFrameExecutor(
+        DataMatrixDecoder, slot_size=64, slots=2, max_workers=2, mp_context=multiprocessing.get_context("fork")
+    ) as executor:
+        results = executor.decode_frames(frames, filename="stream")
+
+    assert [(r.data, r.page, r.filename) for r in results] == [("5", 0, "stream"), ("9", 2, "stream")]
@@ -0,0 +1,52 @@
+from datamatrix_decoder import BatchStats, DataMatrixDecoder, DecodeTier, DEFAULT_TIERS, Profile
+from conftest import DmtxDecoded, Rect
+
+
+def test_misses_are_retried_by_next_tier(fake_dmtx, make_image):
+    easy = make_image("easy.png", size=(64, 64))
+    hard = make_image("hard.png", size=(80, 80))
+    blank = make_image("blank.png", size=(96, 96))
+
+    def responder(image, shrink, **kwargs):
+        width = image.size[0]
+        if width == 64 or (width == 80 and shrink == 1):
+            return [DmtxDecoded(b"ok", Rect(0, 0, 10, 10))]
+        return []
+
+    fake_dmtx.responder = responder
+    stats = BatchStats()
+    results = DataMatrixDecoder().decode_batch([easy, hard, blank], max_workers=2, tiers=DEFAULT_TIERS, stats=stats)
+
+    assert sorted(r.filename for r in results) == sorted([str(easy), str(hard)])
+    assert stats.tier_attempts == {"fast": 3, "thorough": 2}
+    assert stats.tier_successes == {"fast": 1, "thorough": 1}
+    assert (stats.total, stats.decoded, stats.failed) == (3, 2, 1)
+
+
+def test_tier_timeout_and_variants_are_applied(fake_dmtx, make_image):
+    path = make_image("a.png")
+    tier = DecodeTier("slow", timeout=2, variants=("original", "invert"))
+
+    DataMatrixDecoder(timeout=30).decode_batch([path], tiers=[tier])
+
+    assert [kwargs["timeout"] for _, kwargs in fake_dmtx.calls] == [2000, 2000]
+
+
+def test_explicit_timeout_wins_over_profile_in_batches(fake_dmtx, make_image):
+    path = make_image("a.png")
+    decoder = DataMatrixDecoder(timeout=5, profile=Profile(timeout=30))
+
+    decoder.decode_image(path)
+    decoder.decode_batch([path])
+
+    assert [kwargs["timeout"] for _, kwargs in fake_dmtx.calls] == [5000, 5000]
+
+
+def test_untiered_batch_counts_default_pass(fake_dmtx, make_image):
+    fake_dmtx.responder = lambda image, **kwargs: [DmtxDecoded(b"x", Rect(0, 0, 1, 1))]
+    stats = BatchStats()
+
+    results = DataMatrixDecoder().decode_batch([make_image("a.png")], stats=stats)
+
+    assert len(results) == 1
+    assert stats.tier_successes == {"default": 1}
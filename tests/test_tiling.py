@@ -0,0 +1,65 @@
+import pytest
+from PIL import Image, ImageOps
+
+from datamatrix_decoder import BarcodeDecoder, DataMatrixDecoder
+from datamatrix_decoder.core.exceptions import ConfigurationError
+from datamatrix_decoder.core.tiling import plan_tiles
+from conftest import DmtxDecoded, Rect, ZbarDecoded
+
+
+def _dark_square(image):
+    """Bounding box of dark pixels, or None if absent or cut by the tile edge."""
+    box = ImageOps.invert(image.convert("L")).getbbox()
+    if box is None or box[0] == 0 or box[1] == 0 or box[2] == image.width or box[3] == image.height:
+        return None
+    return box
+
+
+@pytest.fixture
+def big_image(tmp_path):
+    path = tmp_path / "pallet.png"
+    image = Image.new("L", (300, 300), 255)
+    image.paste(0, (140, 150, 160, 170))
+    image.save(path)
+    return path
+
+
+def test_plan_tiles_covers_image_with_overlap():
+    boxes = plan_tiles((300, 200), tile_size=160, max_symbol_size=40)
+
+    assert boxes[0] == (0, 0, 160, 160)
+    assert boxes[-1] == (140, 40, 300, 200)
+    assert {left for left, *_ in boxes} == {0, 120, 140}
+    with pytest.raises(ConfigurationError):
+        plan_tiles((300, 200), tile_size=40, max_symbol_size=40)
+
+
+def test_zbar_tiles_are_merged_in_global_coordinates(fake_zbar, big_image):
+    def responder(image, **kwargs):
+        box = _dark_square(image)
+        if box is None:
+            return []
+        rect = Rect(box[0], box[1], box[2] - box[0], box[3] - box[1])
+        return [ZbarDecoded(b"PALLET", "CODE128", rect, [], 1, None)]
+
+    fake_zbar.responder = responder
+
+    results = BarcodeDecoder().decode_tiled(big_image, tile_size=160, max_symbol_size=40, max_workers=4)
+
+    assert len(fake_zbar.calls) == 9
+    assert [(r.data, r.rect) for r in results] == [("PALLET", (140, 150, 20, 20))]
+
+
+def test_dmtx_rects_use_bottom_origin(fake_dmtx, big_image):
+    def responder(image, **kwargs):
+        box = _dark_square(image)
+        if box is None:
+            return []
+        return [DmtxDecoded(b"DM", Rect(box[0], image.height - box[3], box[2] - box[0], box[3] - box[1]))]
+
+    fake_dmtx.responder = responder
+
+    results = DataMatrixDecoder().decode_tiled(big_image, tile_size=160, max_symbol_size=40)
+
+    assert [(r.data, r.rect) for r in results] == [("DM", (140, 130, 20, 20))]
+    assert all(kwargs["max_count"] is None for _, kwargs in fake_dmtx.calls)
@@ -0,0 +1,102 @@
+import os
+import threading
+import time
+
+import pytest
+from PIL import Image
+
+from datamatrix_decoder import DataMatrixDecoder
+from datamatrix_decoder.core.watch import FolderWatcher, watch_folder
+from conftest import DmtxDecoded, Rect
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_files_are_reported_once_stable(tmp_path, use_inotify):
+    (tmp_path / "old.png").write_bytes(b"old")
+    with FolderWatcher(tmp_path, settle=0.05, poll_interval=0.05, use_inotify=use_inotify) as watcher:
+        ready = []
+        (tmp_path / "notes.txt").write_text("ignored")
+        (tmp_path / "new.png").write_bytes(b"png")
+        assert wait_for(lambda: ready.extend(watcher.poll()) or len(ready) >= 2)
+        assert sorted(p.name for p in ready) == ["new.png", "old.png"]
+        assert watcher.poll(0.1) == []
+
+
+def test_growing_file_waits_until_size_settles(tmp_path):
+    with FolderWatcher(tmp_path, settle=0.3, poll_interval=0.05, use_inotify=False) as watcher:
+        path = tmp_path / "scan.png"
+        with open(path, "wb") as f:
+            f.write(b"part")
+            f.flush()
+            assert watcher.poll() == []
+            time.sleep(0.1)
+            f.write(b"more")
+        assert watcher.poll() == []
+        assert wait_for(lambda: watcher.poll() == [path])
+
+
+def test_skip_existing(tmp_path):
+    (tmp_path / "old.png").write_bytes(b"old")
+    with FolderWatcher(tmp_path, settle=0.01, existing=False, use_inotify=False, poll_interval=0.05) as watcher:
+        assert watcher.poll() == [] and watcher.poll() == []
+
+
+def test_watch_folder_decodes_moves_and_streams(fake_dmtx, tmp_path):
+    fake_dmtx.responder = lambda image, **kwargs: [DmtxDecoded(b"hot", Rect(0, 0, 4, 4))]
+    inbox, done = tmp_path / "inbox", tmp_path / "done"
+    inbox.mkdir()
+    received = []
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=watch_folder,
+        args=(DataMatrixDecoder(), inbox, lambda path, results: received.append((path.name, results))),
+        kwargs={"move_to": done, "stop": stop, "settle": 0.05, "poll_interval": 0.05},
+    )
+    thread.start()
+    try:
+        # Written under a temporary name and renamed in, as scanners do
+        Image.new("L", (32, 32), 255).save(tmp_path / "drop.tmp", format="PNG")
+        os.replace(tmp_path / "drop.tmp", inbox / "label.png")
+        assert wait_for(lambda: (done / "label.png").exists())
+    finally:
+        stop.set()
+        thread.join()
+
+    assert [(name, [r.data for r in results]) for name, results in received] == [("label.png", ["hot"])]
+    assert not (inbox / "label.png").exists()
+
+
+def test_moved_out_files_are_forgotten(tmp_path):
+    with FolderWatcher(tmp_path, settle=0.05, poll_interval=0.05) as watcher:
+        if watcher.backend != "inotify":
+            pytest.skip("inotify unavailable")
+        (tmp_path / "a.png").write_bytes(b"png")
+        assert wait_for(lambda: watcher.poll() != [])
+        os.replace(tmp_path / "a.png", tmp_path / "a.done")
+        watcher.poll(0.1)
+        assert watcher._reported == set()
+
+
+def test_watch_folder_takes_decoder_source(fake_dmtx, tmp_path):
+    fake_dmtx.responder = lambda image, **kwargs: [DmtxDecoded(b"hot", Rect(0, 0, 4, 4))]
+    Image.new("L", (32, 32), 255).save(tmp_path / "label.png")
+    decoder = DataMatrixDecoder()
+    received = []
+    stop = threading.Event()
+
+    def sink(path, results):
+        received.append(results)
+        stop.set()
+
+    watch_folder(lambda: decoder, tmp_path, sink, stop=stop, settle=0.01, poll_interval=0.05)
+
+    assert [[r.data for r in results] for results in received] == [["hot"]]
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+from datamatrix_decoder import BatchStats, ConfigurationError, DataMatrixDecoder, DEFAULT_TIERS
+from datamatrix_decoder.core.watchdog import Quarantine
+from conftest import DmtxDecoded, Rect
+
+
+def hang_on_wide_images(image, **kwargs):
+    if image.size[0] == 96:
+        time.sleep(30)
+    return [DmtxDecoded(b"ok", Rect(0, 0, 1, 1))]
+
+
+def test_runaway_decode_is_killed_and_reported(fake_dmtx, make_image):
+    fake_dmtx.responder = hang_on_wide_images
+    good = [make_image(f"good{i}.png") for i in range(3)]
+    poisoned = make_image("poisoned.png", size=(96, 96))
+    stats = BatchStats()
+
+    started = time.monotonic()
+    results = DataMatrixDecoder().decode_batch(good + [poisoned], max_workers=2, stats=stats, hard_timeout=0.5)
+
+    assert time.monotonic() - started < 10
+    assert sorted(r.filename for r in results) == sorted(map(str, good))
+    assert stats.timed_out == [str(poisoned)]
+    assert (stats.total, stats.decoded, stats.failed) == (4, 3, 1)
+
+
+def test_timed_out_images_are_not_retried_by_later_tiers(fake_dmtx, make_image):
+    fake_dmtx.responder = hang_on_wide_images
+    stats = BatchStats()
+
+    DataMatrixDecoder().decode_batch([make_image("p.png", size=(96, 96))], tiers=DEFAULT_TIERS, stats=stats, hard_timeout=0.3)
+
+    assert stats.tier_attempts == {"fast": 1}
+    assert stats.failed == 1
+
+
+def test_repeat_offenders_are_quarantined(fake_dmtx, make_image):
+    fake_dmtx.responder = hang_on_wide_images
+    poisoned = make_image("poisoned.png", size=(96, 96))
+    decoder = DataMatrixDecoder()
+
+    for _ in range(2):
+        decoder.decode_batch([poisoned], hard_timeout=0.3)
+    assert poisoned in decoder.quarantine
+
+    stats = BatchStats()
+    started = time.monotonic()
+    decoder.decode_batch([poisoned], stats=stats, hard_timeout=0.3)
+
+    assert time.monotonic() - started < 0.3
+    assert stats.quarantined == [str(poisoned)]
+    assert stats.timed_out == []
+
+    decoder.quarantine.release(poisoned)
+    assert poisoned not in decoder.quarantine
+
+
+def test_supervised_mode_rejects_pixel_budget(fake_dmtx, make_image):
+    with pytest.raises(ConfigurationError):
+        DataMatrixDecoder().decode_batch([make_image("a.png")], pixel_budget=1 << 20, hard_timeout=1)
+
+
+def test_quarantine_threshold():
+    quarantine = Quarantine(max_strikes=3)
+
+    assert not quarantine.strike("a.png")
+    assert not quarantine.strike("a.png")
+    assert quarantine.strike("a.png")
+    assert quarantine.paths == ["a.png"]
@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from datamatrix_decoder import BarcodeDecoder
+from datamatrix_decoder.core import zbar_engine
+from conftest import FakeEngine, Rect, ZbarDecoded
+
+
+def test_symbologies_cover_only_requested_formats():
+    assert zbar_engine.symbologies(["qrcode", "itf", "datamatrix"]) == ("I25", "QRCODE")
+    assert zbar_engine.symbologies(BarcodeDecoder.SUPPORTED_FORMATS) is None
+    assert zbar_engine.format_name("I25") == "itf"
+    assert zbar_engine.format_name("CODE128") == "code128"
+
+
+def test_reusable_engine_is_keyed_by_symbologies(fake_zbar, monkeypatch, make_image):
+    engine = FakeEngine(lambda image: [ZbarDecoded(b"12", "I25", Rect(0, 0, 5, 5), [], 1, None)])
+    requested = []
+    monkeypatch.setattr(zbar_engine, "thread_engine", lambda names: requested.append(names) or SimpleNamespace(decode=engine))
+
+    results = BarcodeDecoder(formats=["itf", "code128"], engine="reusable").decode_image(make_image("a.png"))
+
+    assert [(r.format, r.data) for r in results] == [("itf", "12")]
+    assert requested == [("CODE128", "I25")]
+    assert fake_zbar.calls == []
+
+
+def test_gray_buffer_scans_packed_frames_in_place():
+    frame = np.zeros((4, 6), dtype=np.uint8)
+    buffer, address, nbytes, width, height = zbar_engine._gray_buffer(frame)
+
+    assert buffer is frame and address.value == frame.ctypes.data
+    assert (nbytes, width, height) == (24, 6, 4)
+
+    rgb = Image.new("RGB", (6, 4))
+    assert zbar_engine._gray_buffer(rgb)[2:] == (24, 6, 4)
+
+
+def test_gray_buffer_weights_rgb_frames_like_pil():
+    rgb = np.zeros((4, 6, 3), dtype=np.uint8)
+    rgb[..., 0], rgb[..., 1], rgb[..., 2] = 20, 200, 250
+
+    buffer = zbar_engine._gray_buffer(rgb)[0]
+
+    expected = np.asarray(Image.fromarray(rgb).convert("L"))
+    assert buffer.shape == (4, 6)
+    assert np.abs(buffer.astype(int) - expected).max() <= 1
+
+
+@pytest.mark.skipif(zbar_engine._pyzbar is None, reason="zbar not available")
+def test_native_engine_reuses_scanner():
+    engine = zbar_engine.ZbarEngine(("QRCODE",))
+    blank = Image.new("L", (64, 64), 255)
+    assert engine.decode(blank) == []
+    assert engine.decode(np.full((32, 48), 255, dtype=np.uint8)) == []
+    engine.close()